@@ -0,0 +1,47 @@
+import pytest
+
+from avahiplatform.helpers.connectors.retry_policy import RetryPolicy
+
+
+@pytest.fixture
+def metrics_file(tmp_path, monkeypatch):
+    """Writes the metrics of tracked feature calls to a temporary file instead of ./metrics.jsonl."""
+    from avahiplatform.src.Observability import observability
+
+    path = tmp_path / "metrics.jsonl"
+    monkeypatch.setattr(observability, "metrics_file", str(path))
+    return path
+
+
+class FakeBotoHelper:
+    """The parts of BotoHelper used by the chats and embeddings, without AWS calls.
+
+    runtime_clients maps a region name (None for the default region) to the client returned
+    for "bedrock-runtime"; every other client is a placeholder. The regions model details
+    are requested for are recorded in details_regions.
+    """
+
+    def __init__(self, runtime_clients=None, retry_policy=None, admission_scheduler=None,
+                 model_name="Claude 3 Sonnet", provider_name="Anthropic"):
+        self.runtime_clients = runtime_clients or {}
+        self.retry_policy = retry_policy or RetryPolicy(base_delay=0.0, max_delay=0.0)
+        self.admission_scheduler = admission_scheduler
+        self.model_name = model_name
+        self.provider_name = provider_name
+        self.details_regions = []
+
+    def create_client(self, service_name, region_name=None):
+        if service_name == "bedrock-runtime" and region_name in self.runtime_clients:
+            return self.runtime_clients[region_name]
+        return object()
+
+    def get_model_details(self, model_id, region_name=None):
+        self.details_regions.append(region_name)
+        return {"modelId": model_id, "modelName": self.model_name, "providerName": self.provider_name,
+                "region_name": region_name}
+
+
+@pytest.fixture
+def fake_boto_helper():
+    """Builds FakeBotoHelper instances: fake_boto_helper(runtime_clients=..., retry_policy=...)."""
+    return FakeBotoHelper
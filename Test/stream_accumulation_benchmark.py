@@ -0,0 +1,111 @@
+"""
+Micro-benchmark of BedrockChat's streaming accumulation paths.
+
+Feeds a synthetic ConverseStream of DELTAS text deltas (no network) through:
+  - the previous accumulation: iterating invoke_stream and growing a str with +=
+  - invoke_stream_parsed: the stream consumed directly into a list joined once
+  - invoke_stream_parsed with an on_text callback sink
+and prints the best wall time of each over ROUNDS runs.
+
+Usage:
+    python Test/stream_accumulation_benchmark.py
+"""
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from avahiplatform.helpers.chats.bedrock_chat import BedrockChat  # noqa: E402
+
+MODEL_ID = "anthropic.claude-3-sonnet-20240229-v1:0"
+DELTAS = 10_000
+ROUNDS = 20
+
+
+class FakeRuntimeClient:
+    """A bedrock-runtime client whose converse_stream replays a synthetic stream."""
+
+    class meta:
+        region_name = "us-east-1"
+
+    def __init__(self, deltas):
+        self.events = [{"contentBlockDelta": {"delta": {"text": f"token{i} "}, "contentBlockIndex": 0}}
+                       for i in range(deltas)]
+        self.events.append({"contentBlockStop": {"contentBlockIndex": 0}})
+        self.events.append({"metadata": {"usage": {"inputTokens": 12, "outputTokens": deltas}}})
+
+    def converse_stream(self, **kwargs):
+        return {"stream": iter(self.events)}
+
+
+class FakeRetryPolicy:
+    def execute(self, fn, retry_stats=None):
+        return fn()
+
+
+class FakeBotoHelper:
+    """The parts of BotoHelper used by BedrockChat, without AWS calls."""
+
+    retry_policy = FakeRetryPolicy()
+
+    def __init__(self, deltas):
+        self.runtime = FakeRuntimeClient(deltas)
+
+    def create_client(self, service_name, region_name=None):
+        return self.runtime if service_name == "bedrock-runtime" else object()
+
+    def get_model_details(self, model_id):
+        return {"modelId": model_id, "modelName": "Claude 3 Sonnet", "providerName": "Anthropic"}
+
+
+def previous_accumulation(chat, prompts):
+    """The accumulation invoke_stream_parsed used before: += over invoke_stream chunks."""
+    response_text = ""
+    metadata = {}
+    for chunk in chat.invoke_stream(prompts):
+        if "text" in chunk:
+            response_text += chunk.get("text", "")
+        elif "metadata" in chunk:
+            metadata = chunk["metadata"]
+    return {"response_text": response_text, **metadata}
+
+
+def best_time(fn):
+    best = float("inf")
+    result = None
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    chat = BedrockChat(model_id=MODEL_ID, boto_helper=FakeBotoHelper(DELTAS))
+    prompts = [{"text": "Write a long story."}]
+    received = []
+
+    cases = {
+        "invoke_stream + str +=": lambda: previous_accumulation(chat, prompts),
+        "invoke_stream_parsed": lambda: chat.invoke_stream_parsed(prompts),
+        "invoke_stream_parsed(on_text=...)": lambda: chat.invoke_stream_parsed(prompts, on_text=received.append),
+    }
+
+    print(f"{DELTAS} deltas, best of {ROUNDS} runs")
+    expected = None
+    baseline = None
+    for name, fn in cases.items():
+        received.clear()
+        elapsed, result = best_time(fn)
+        expected = expected or result["response_text"]
+        if result["response_text"] != expected:
+            print(f"  {name}: response text differs from the other paths")
+            sys.exit(1)
+        baseline = baseline or elapsed
+        print(f"  {name:36s} {elapsed * 1000:8.2f} ms  ({baseline / elapsed:4.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
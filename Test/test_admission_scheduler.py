@@ -0,0 +1,129 @@
+import pytest
+
+from avahiplatform.helpers.chats.bedrock_chat import BedrockChat
+from avahiplatform.helpers.connectors.admission_scheduler import AdmissionScheduler
+
+MODEL_ID = "anthropic.claude-3-sonnet-20240229-v1:0"
+KEY = (MODEL_ID, "us-east-1")
+
+
+def token_level(scheduler):
+    _, token_bucket = scheduler._buckets[KEY]
+    return token_bucket.level
+
+
+def make_scheduler(tpm=10_000, rpm=100, **kwargs):
+    scheduler = AdmissionScheduler(**kwargs)
+    scheduler.set_limits(MODEL_ID, requests_per_minute=rpm, tokens_per_minute=tpm)
+    return scheduler
+
+
+def test_acquire_reserves_the_estimate():
+    scheduler = make_scheduler()
+
+    reservation = scheduler.acquire(MODEL_ID, "us-east-1", 3_000)
+
+    assert reservation.estimated_tokens == 3_000
+    assert token_level(scheduler) == pytest.approx(7_000, abs=5)
+
+
+def test_reconcile_returns_unused_tokens():
+    scheduler = make_scheduler()
+    reservation = scheduler.acquire(MODEL_ID, "us-east-1", 3_000)
+
+    scheduler.reconcile(reservation, 800, 200)
+
+    assert reservation.settled
+    assert token_level(scheduler) == pytest.approx(9_000, abs=5)
+
+
+def test_reconcile_charges_an_underestimate():
+    scheduler = make_scheduler()
+    reservation = scheduler.acquire(MODEL_ID, "us-east-1", 1_000)
+
+    scheduler.reconcile(reservation, 1_500, 500)
+
+    assert token_level(scheduler) == pytest.approx(8_000, abs=5)
+
+
+def test_output_tokens_are_weighted():
+    scheduler = make_scheduler(output_token_weight=5.0)
+    reservation = scheduler.acquire(MODEL_ID, "us-east-1", scheduler.estimate_tokens(100, 200))
+
+    assert reservation.estimated_tokens == 1_100
+    scheduler.reconcile(reservation, 100, 100)
+    assert token_level(scheduler) == pytest.approx(9_400, abs=5)
+
+
+def test_release_returns_the_whole_reservation_once():
+    scheduler = make_scheduler()
+    reservation = scheduler.acquire(MODEL_ID, "us-east-1", 3_000)
+
+    scheduler.release(reservation)
+    scheduler.release(reservation)
+    scheduler.reconcile(reservation, 5_000, 5_000)
+
+    assert token_level(scheduler) == pytest.approx(10_000, abs=5)
+
+
+def test_request_larger_than_the_bucket_is_capped():
+    scheduler = make_scheduler(tpm=1_000)
+
+    reservation = scheduler.acquire(MODEL_ID, "us-east-1", 5_000)
+
+    assert reservation.estimated_tokens == 1_000
+
+
+def test_times_out_when_no_capacity():
+    scheduler = make_scheduler(rpm=1, max_wait=0.1)
+    scheduler.acquire(MODEL_ID, "us-east-1", 10)
+
+    with pytest.raises(TimeoutError):
+        scheduler.acquire(MODEL_ID, "us-east-1", 10)
+
+
+def test_models_without_limits_are_not_queued():
+    scheduler = AdmissionScheduler()
+
+    reservation = scheduler.acquire("some-model", "us-east-1", 1_000_000)
+
+    assert reservation.wait_time == 0.0
+    assert reservation.estimated_tokens == 0.0
+
+
+class FakeRuntimeClient:
+    class meta:
+        region_name = "us-east-1"
+
+    def converse_stream(self, **kwargs):
+        def events():
+            for i in range(10):
+                yield {"contentBlockDelta": {"delta": {"text": f"t{i} "}, "contentBlockIndex": 0}}
+            yield {"contentBlockStop": {"contentBlockIndex": 0}}
+            yield {"metadata": {"usage": {"inputTokens": 50, "outputTokens": 10}}}
+        return {"stream": events()}
+
+
+def test_abandoned_stream_does_not_hold_its_reservation(fake_boto_helper):
+    scheduler = make_scheduler()
+    chat = BedrockChat(model_id=MODEL_ID, boto_helper=fake_boto_helper({None: FakeRuntimeClient()}), admission_scheduler=scheduler,
+                       max_tokens=4_000)
+
+    stream = chat.invoke_stream([{"text": "Write a story."}])
+    next(stream)
+    assert token_level(scheduler) < 6_000
+    stream.close()
+
+    # Only the estimated input tokens stay charged
+    assert 9_900 < token_level(scheduler) < 10_000
+
+
+def test_consumed_stream_is_reconciled_with_its_usage(fake_boto_helper):
+    scheduler = make_scheduler()
+    chat = BedrockChat(model_id=MODEL_ID, boto_helper=fake_boto_helper({None: FakeRuntimeClient()}), admission_scheduler=scheduler,
+                       max_tokens=4_000)
+
+    result = chat.invoke_stream_parsed([{"text": "Write a story."}])
+
+    assert result["output_tokens"] == 10
+    assert token_level(scheduler) == pytest.approx(9_940, abs=5)
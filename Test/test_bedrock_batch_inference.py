@@ -0,0 +1,176 @@
+import json
+
+import pytest
+
+from avahiplatform.helpers.chats.bedrock_batch_inference import BedrockBatchInference
+from avahiplatform.helpers.connectors.s3_helper import S3Helper
+
+JOB_ARN = "arn:aws:bedrock:us-east-1:123456789012:model-invocation-job/job123"
+
+
+class FakeBody:
+    def __init__(self, data):
+        self.data = data
+
+    def iter_lines(self):
+        return iter(self.data.split(b"\n"))
+
+
+class FakeS3Client:
+    """Keeps uploaded objects in memory."""
+
+    def __init__(self):
+        self.objects = {}
+        self.content_types = {}
+
+    def upload_fileobj(self, Fileobj, Bucket, Key, ExtraArgs=None):
+        self.objects[(Bucket, Key)] = Fileobj.read()
+        self.content_types[(Bucket, Key)] = (ExtraArgs or {}).get("ContentType")
+
+    def get_object(self, Bucket, Key):
+        return {"Body": FakeBody(self.objects[(Bucket, Key)])}
+
+
+class FakeBedrockClient:
+    """Runs a job when it is polled: answers every record in reverse order, failing the ones marked "fail"."""
+
+    def __init__(self, s3_client, polls_before_completion=2):
+        self.s3_client = s3_client
+        self.polls_before_completion = polls_before_completion
+        self.job_request = None
+        self.polls = 0
+
+    def create_model_invocation_job(self, **kwargs):
+        self.job_request = kwargs
+        return {"jobArn": JOB_ARN}
+
+    def get_model_invocation_job(self, jobIdentifier):
+        self.polls += 1
+        job = {
+            "jobArn": jobIdentifier,
+            "status": "InProgress",
+            "inputDataConfig": self.job_request["inputDataConfig"],
+            "outputDataConfig": self.job_request["outputDataConfig"],
+        }
+        if self.polls > self.polls_before_completion:
+            self._write_output()
+            job["status"] = "PartiallyCompleted"
+        return job
+
+    def _write_output(self):
+        input_uri = self.job_request["inputDataConfig"]["s3InputDataConfig"]["s3Uri"]
+        bucket, key = input_uri[5:].split("/", 1)
+        records = [json.loads(line) for line in self.s3_client.objects[(bucket, key)].splitlines()]
+
+        lines = []
+        for record in reversed(records):
+            text = record["modelInput"]["messages"][0]["content"][0]["text"]
+            if text == "fail":
+                lines.append({"recordId": record["recordId"], "modelInput": record["modelInput"],
+                              "error": {"errorCode": 400, "errorMessage": "Malformed input"}})
+            else:
+                lines.append({"recordId": record["recordId"], "modelInput": record["modelInput"], "modelOutput": {
+                    "content": [{"type": "text", "text": f"answer to {text}"}],
+                    "usage": {"input_tokens": 100, "output_tokens": 20},
+                }})
+        output_prefix = self.job_request["outputDataConfig"]["s3OutputDataConfig"]["s3Uri"].rstrip("/")
+        output_uri = f"{output_prefix}/job123/{key.split('/')[-1]}.out"
+        self.s3_client.objects[tuple(output_uri[5:].split("/", 1))] = "\n".join(json.dumps(line) for line in lines).encode() + b"\n"
+
+
+class FakeChat:
+    """The parts of BedrockChat used by BedrockBatchInference."""
+
+    model_id = "anthropic.claude-3-haiku-20240307-v1:0"
+    max_tokens = 512
+    temperature = 0.5
+    p = 0.9
+    input_tokens_price = 0.00025
+    output_tokens_price = 0.00125
+
+    def __init__(self, boto_helper):
+        self.boto_helper = boto_helper
+
+    def get_provider(self, region_name=None):
+        return "Bedrock:us-east-1:Anthropic"
+
+
+@pytest.fixture
+def batch(fake_boto_helper):
+    s3_client = FakeS3Client()
+    bedrock = FakeBedrockClient(s3_client)
+    runner = BedrockBatchInference(
+        FakeChat(fake_boto_helper()), role_arn="arn:aws:iam::123456789012:role/batch", s3_input_uri="s3://bucket/input/",
+        s3_output_uri="s3://bucket/output", poll_interval=0, bedrock_client=bedrock,
+        s3_helper=S3Helper(s3_client=s3_client)
+    )
+    return runner, bedrock, s3_client
+
+
+def prompt_lists(texts):
+    return [[{"system": "Be brief."}, {"text": text}] for text in texts]
+
+
+def test_submit_uploads_the_records_as_jsonl(batch):
+    runner, bedrock, s3_client = batch
+
+    job_arn = runner.submit(prompt_lists(["a", "b"]), record_ids=["first", "second"], job_name="job")
+
+    assert job_arn == JOB_ARN
+    assert bedrock.job_request["inputDataConfig"]["s3InputDataConfig"]["s3Uri"] == "s3://bucket/input/job.jsonl"
+    assert s3_client.content_types[("bucket", "input/job.jsonl")] == "application/jsonl"
+    records = [json.loads(line) for line in s3_client.objects[("bucket", "input/job.jsonl")].splitlines()]
+    assert [record["recordId"] for record in records] == ["first", "second"]
+    assert records[0]["modelInput"]["system"] == "Be brief."
+    assert records[0]["modelInput"]["max_tokens"] == 512
+
+
+def test_results_are_matched_to_their_record_ids(batch):
+    runner, bedrock, _ = batch
+
+    response = runner.invoke_batch_parsed(prompt_lists(["a", "fail", "c"]), record_ids=["r1", "r2", "r3"])
+
+    assert bedrock.polls == 3
+    # Output order follows the job output, not the input
+    assert [item["recordId"] for item in response["results"]] == ["r3", "r2", "r1"]
+    by_id = {item["recordId"]: item for item in response["results"]}
+    assert by_id["r1"]["result"]["response_text"] == "answer to a"
+    assert by_id["r3"]["result"]["response_text"] == "answer to c"
+    assert by_id["r2"]["result"] is None
+    assert by_id["r2"]["error"] == "Malformed input"
+
+
+def test_totals_are_priced_at_the_batch_rate(batch):
+    runner, _, _ = batch
+
+    response = runner.invoke_batch_parsed(prompt_lists(["a", "fail", "c"]))
+
+    assert (response["requests"], response["succeeded"], response["failed"]) == (3, 2, 1)
+    assert response["inputTokens"] == 200
+    assert response["outputTokens"] == 40
+    expected = (0.00025 * 200 + 0.00125 * 40) / 1000 * 0.5
+    assert response["total_cost"] == pytest.approx(expected)
+    assert response["status"] == "PartiallyCompleted"
+
+
+def test_default_record_ids_keep_the_input_order(batch):
+    runner, _, _ = batch
+
+    response = runner.invoke_batch_parsed(prompt_lists(["a", "b"]))
+
+    assert sorted(item["recordId"] for item in response["results"]) == ["00000000000", "00000000001"]
+
+
+def test_failed_job_raises(batch):
+    runner, bedrock, _ = batch
+    bedrock.get_model_invocation_job = lambda jobIdentifier: {"status": "Failed", "message": "Access denied"}
+
+    with pytest.raises(RuntimeError, match="Access denied"):
+        runner.wait(JOB_ARN)
+
+
+def test_non_text_prompts_are_rejected(batch):
+    runner, _, _ = batch
+
+    with pytest.raises(ValueError):
+        runner.submit([[{"image": "photo.png"}]])
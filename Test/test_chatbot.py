@@ -0,0 +1,145 @@
+import threading
+
+import pytest
+
+from avahiplatform.src.chatbot import BedrockChatbot
+
+
+class FakeTokenEstimator:
+    def estimate_text(self, model_id, text):
+        return len(text)
+
+
+class FakeChat:
+    """The parts of BedrockChat used by BedrockChatbot. Summary calls block until released."""
+
+    model_id = "amazon.nova-pro-v1:0"
+    token_estimator = FakeTokenEstimator()
+
+    def __init__(self):
+        self.replies = 0
+        self.summary_requests = []
+        self.summary_started = threading.Event()
+        self.release_summary = threading.Event()
+        self.release_summary.set()
+        self.fail_summary = False
+        self.fail_reply = False
+
+    def invoke(self, prompts):
+        if prompts[0]["system"].startswith("You maintain a running summary"):
+            self.summary_requests.append(prompts[1]["text"])
+            self.summary_started.set()
+            self.release_summary.wait(5)
+            if self.fail_summary:
+                raise RuntimeError("summary failed")
+            return {"response_text": f"summary {len(self.summary_requests)}"}
+        if self.fail_reply:
+            raise RuntimeError("reply failed")
+        self.replies += 1
+        return {"response_text": f"reply {self.replies}"}
+
+
+def make_chatbot(**kwargs):
+    chat = FakeChat()
+    chatbot = BedrockChatbot(chat, max_conversation_turns=2, max_history_tokens=10_000, **kwargs)
+    chatbot.initialize_system("Be helpful.")
+    return chatbot, chat
+
+
+def turns(chatbot):
+    return [(turn["role"], turn["content"]) for turn in chatbot.conversation_history[1:]]
+
+
+def test_old_turns_are_folded_into_the_summary(metrics_file):
+    chatbot, chat = make_chatbot()
+
+    for question in ("q1", "q2", "q3"):
+        chatbot.chat(question)
+    chatbot.wait_for_summary(5)
+
+    assert chat.summary_requests == ["New turns:\nUser: q1\nAssistant: reply 1\nUser: q2\nAssistant: reply 2"]
+    assert chatbot.summary == "summary 1"
+    assert turns(chatbot) == [("user", "q3"), ("assistant", "reply 3")]
+    assert chatbot._folding == 0
+    system = chatbot._create_prompt_list()[0]["system"]
+    assert system.endswith("Summary of the earlier conversation:\nsummary 1")
+
+
+def test_turns_are_sent_until_the_summary_is_ready(metrics_file):
+    chatbot, chat = make_chatbot()
+    chat.release_summary.clear()
+
+    for question in ("q1", "q2", "q3"):
+        chatbot.chat(question)
+    assert chat.summary_started.wait(5)
+    chatbot.chat("q4")
+
+    assert chatbot._folding == 4
+    assert len(chatbot._create_prompt_list()) == 1 + 8
+    chat.release_summary.set()
+    chatbot.wait_for_summary(5)
+    assert turns(chatbot) == [("user", "q3"), ("assistant", "reply 3"), ("user", "q4"), ("assistant", "reply 4")]
+
+
+def test_reset_discards_the_summary_in_flight(metrics_file):
+    chatbot, chat = make_chatbot()
+    chat.release_summary.clear()
+    for question in ("q1", "q2", "q3"):
+        chatbot.chat(question)
+    assert chat.summary_started.wait(5)
+
+    chatbot.clear_conversation_history()
+    chatbot.chat("fresh")
+    chat.release_summary.set()
+    chatbot.wait_for_summary(5)
+
+    assert chatbot.summary is None
+    assert chatbot._folding == 0
+    assert turns(chatbot) == [("user", "fresh"), ("assistant", "reply 4")]
+
+
+def test_failed_summary_keeps_the_turns(metrics_file):
+    chatbot, chat = make_chatbot()
+    chat.fail_summary = True
+
+    for question in ("q1", "q2", "q3"):
+        chatbot.chat(question)
+    chatbot.wait_for_summary(5)
+
+    assert chatbot.summary is None
+    assert chatbot._folding == 0
+    assert len(turns(chatbot)) == 6
+
+
+def test_turns_are_dropped_without_summarization(metrics_file):
+    chatbot, chat = make_chatbot(summarize_history=False)
+
+    for question in ("q1", "q2", "q3"):
+        chatbot.chat(question)
+
+    assert chat.summary_requests == []
+    assert chatbot.summary is None
+    assert turns(chatbot) == [("user", "q3"), ("assistant", "reply 3")]
+
+
+def test_token_budget_triggers_a_fold(metrics_file):
+    chat = FakeChat()
+    chatbot = BedrockChatbot(chat, max_conversation_turns=100, max_history_tokens=40, summarize_history=False)
+    chatbot.initialize_system("Be helpful.")
+
+    for question in ("a" * 10, "b" * 10, "c" * 10):
+        chatbot.chat(question)
+
+    # Folded down to half of the token budget
+    assert turns(chatbot) == [("user", "c" * 10), ("assistant", "reply 3")]
+
+
+def test_failed_reply_removes_the_user_turn(metrics_file):
+    chatbot, chat = make_chatbot()
+    chatbot.chat("q1")
+    chat.fail_reply = True
+
+    with pytest.raises(RuntimeError):
+        chatbot.chat("q2")
+
+    assert turns(chatbot) == [("user", "q1"), ("assistant", "reply 1")]
@@ -0,0 +1,133 @@
+import threading
+import time
+
+import pytest
+
+from avahiplatform.helpers.chats.hedging_policy import HedgingPolicy
+
+
+def make_policy(**kwargs):
+    options = {"initial_delay": 0.05, "min_delay": 0.01, "max_hedge_rate": 1.0, "max_burst": 1}
+    options.update(kwargs)
+    return HedgingPolicy(**options)
+
+
+def test_fast_primary_is_not_hedged():
+    policy = make_policy()
+    hedge_calls = []
+
+    result, hedged, hedge_won = policy.run(lambda: "primary", lambda: hedge_calls.append(1), kind="invoke")
+
+    assert (result, hedged, hedge_won) == ("primary", False, False)
+    assert hedge_calls == []
+    assert policy.get_stats()["hedges"] == 0
+
+
+def test_hedge_wins_and_loser_is_disposed():
+    policy = make_policy()
+    losers = []
+    loser_done = threading.Event()
+
+    def primary():
+        time.sleep(0.3)
+        return "primary"
+
+    def on_loser(result):
+        losers.append(result)
+        loser_done.set()
+
+    result, hedged, hedge_won = policy.run(primary, lambda: "hedge", kind="invoke", on_loser=on_loser)
+
+    assert (result, hedged, hedge_won) == ("hedge", True, True)
+    assert loser_done.wait(2)
+    assert losers == ["primary"]
+    stats = policy.get_stats()
+    assert stats["hedges"] == 1 and stats["hedge_wins"] == 1
+
+
+def test_primary_wins_after_hedge_is_sent():
+    policy = make_policy()
+    losers = []
+    loser_done = threading.Event()
+
+    def primary():
+        time.sleep(0.1)
+        return "primary"
+
+    def hedge():
+        time.sleep(0.5)
+        return "hedge"
+
+    def on_loser(result):
+        losers.append(result)
+        loser_done.set()
+
+    result, hedged, hedge_won = policy.run(primary, hedge, kind="invoke", on_loser=on_loser)
+
+    assert (result, hedged, hedge_won) == ("primary", True, False)
+    assert loser_done.wait(2)
+    assert losers == ["hedge"]
+
+
+def test_failed_primary_falls_back_to_hedge():
+    policy = make_policy()
+
+    def primary():
+        time.sleep(0.1)
+        raise RuntimeError("primary failed")
+
+    result, hedged, hedge_won = policy.run(primary, lambda: "hedge", kind="invoke")
+
+    assert (result, hedged, hedge_won) == ("hedge", True, True)
+
+
+def test_both_failing_raises_primary_error():
+    policy = make_policy()
+
+    def primary():
+        time.sleep(0.1)
+        raise RuntimeError("primary failed")
+
+    def hedge():
+        raise ValueError("hedge failed")
+
+    with pytest.raises(RuntimeError, match="primary failed"):
+        policy.run(primary, hedge, kind="invoke")
+
+
+def test_hedge_rate_is_capped_by_credit():
+    policy = make_policy(max_hedge_rate=0.5, max_burst=1)
+
+    def primary():
+        time.sleep(0.1)
+        return "primary"
+
+    hedged = [policy.run(primary, lambda: "hedge", kind="invoke")[1] for _ in range(4)]
+
+    # Half a credit per call: only every second call can afford a hedge
+    assert hedged == [False, True, False, True]
+
+
+def test_primary_does_not_queue_behind_the_hedge_pool():
+    policy = make_policy(max_workers=1)
+    release = threading.Event()
+    # Occupy the only hedge worker
+    policy._get_executor().submit(release.wait)
+    try:
+        start = time.perf_counter()
+        result, _, _ = policy.run(lambda: "primary", lambda: "hedge", kind="invoke")
+        assert result == "primary"
+        assert time.perf_counter() - start < 0.5
+    finally:
+        release.set()
+
+
+def test_record_waste_is_reported():
+    policy = make_policy()
+
+    policy.record_waste(120, 0.002)
+    policy.record_waste(30, 0.001)
+
+    stats = policy.get_stats()
+    assert stats["wasted_tokens"] == 150
+    assert stats["wasted_cost"] == pytest.approx(0.003)
@@ -0,0 +1,137 @@
+import io
+
+import pytest
+from PIL import Image
+
+from avahiplatform.helpers.image_helper.image_optimizer import ImageOptimizer
+from avahiplatform.src.imageSimilarity import BedrockImageSimilarity
+
+ORIENTATION = 0x0112
+MAKE = 0x010F
+
+
+def make_image(size=(800, 400), image_format="JPEG", exif=None, noise=False):
+    image = Image.new("RGB", size, (200, 30, 30))
+    if noise:
+        image = Image.effect_noise(size, 80).convert("RGB")
+    buffer = io.BytesIO()
+    options = {"quality": 95} if image_format == "JPEG" else {"optimize": True}
+    if exif is not None:
+        options["exif"] = exif
+    image.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+
+def open_image(data):
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    return image
+
+
+def test_large_image_is_downscaled():
+    optimizer = ImageOptimizer(max_edge=200)
+    data = make_image(noise=True)
+
+    optimized, image_format, saved = optimizer.optimize(data)
+
+    assert image_format == "jpeg"
+    assert open_image(optimized).size == (200, 100)
+    assert saved == len(data) - len(optimized) > 0
+
+
+def test_exif_is_stripped_after_applying_the_orientation():
+    exif = Image.Exif()
+    exif[ORIENTATION] = 6  # Rotated 90 degrees clockwise
+    exif[MAKE] = "Camera"
+    data = make_image(size=(300, 100), exif=exif.tobytes(), noise=True)
+
+    optimized, _, _ = ImageOptimizer(max_edge=200).optimize(data)
+
+    image = open_image(optimized)
+    assert image.size == (67, 200)
+    assert not image.getexif()
+
+
+def test_exif_is_kept_when_not_stripped():
+    exif = Image.Exif()
+    exif[MAKE] = "Camera"
+    data = make_image(exif=exif.tobytes(), noise=True)
+
+    optimized, _, _ = ImageOptimizer(max_edge=200, strip_exif=False).optimize(data)
+
+    assert open_image(optimized).getexif()[MAKE] == "Camera"
+
+
+def test_output_is_brought_under_the_byte_budget():
+    data = make_image(size=(600, 600), noise=True)
+    optimizer = ImageOptimizer(max_edge=600, max_bytes=len(data) // 10)
+
+    optimized, _, _ = optimizer.optimize(data)
+
+    assert len(optimized) <= len(data) // 10
+
+
+def test_small_image_is_sent_unchanged():
+    data = make_image(size=(32, 32), image_format="PNG")
+
+    assert ImageOptimizer().optimize(data) == (data, "png", 0)
+
+
+def test_results_are_cached_by_content_hash(monkeypatch):
+    optimizer = ImageOptimizer(max_edge=200)
+    data = make_image(noise=True)
+    calls = []
+    original = optimizer._optimize
+    monkeypatch.setattr(optimizer, "_optimize", lambda image: calls.append(1) or original(image))
+
+    first = optimizer.optimize(data)
+    second = optimizer.optimize(bytes(data))
+
+    assert first == second
+    assert len(calls) == 1
+    stats = optimizer.get_stats()
+    assert stats["images"] == 2
+    assert stats["bytes_saved"] == 2 * first[2]
+
+
+def test_optimize_many_keeps_the_input_order():
+    optimizer = ImageOptimizer(max_edge=100)
+    images = [make_image(size=(400, 200), noise=True), make_image(size=(200, 400), noise=True)]
+
+    results = optimizer.optimize_many(images)
+
+    assert [open_image(optimized).size for optimized, _, _ in results] == [(100, 50), (50, 100)]
+
+
+class FakeEmbeddings:
+    def generate_embeddings(self, image, dimension):
+        return {"embeddings": [1.0] * dimension}
+
+
+@pytest.fixture
+def similarity(fake_boto_helper):
+    def build(image_optimizer=None):
+        helper = fake_boto_helper(model_name="Titan Multimodal Embeddings", provider_name="Amazon")
+        similarity = BedrockImageSimilarity(helper, s3_helper=None,
+                                            default_model_id="amazon.titan-embed-image-v1",
+                                            image_optimizer=image_optimizer)
+        similarity.bedrock_embeddings = FakeEmbeddings()
+        return similarity
+    return build
+
+
+def test_image_similarity_reports_the_bytes_saved(similarity):
+    data = make_image(noise=True)
+    optimizer = ImageOptimizer(max_edge=200)
+    saved = optimizer.optimize(data)[2]
+
+    result = similarity(optimizer).image_to_image_similarity(data, data, output_embedding_length=4)
+
+    assert result["similarity"] == pytest.approx(1.0)
+    assert result["image_bytes_saved"] == 2 * saved
+
+
+def test_image_similarity_without_optimizer_returns_the_score(similarity):
+    data = make_image()
+
+    assert similarity().image_to_image_similarity(data, data, output_embedding_length=4) == pytest.approx(1.0)
@@ -0,0 +1,79 @@
+"""
+Import-time regression tests for avahiplatform.
+
+Each import target runs in a fresh interpreter under ``python -X importtime``; a
+test fails if its target pulls in a dependency it does not need or exceeds its
+time budget, and reports the slowest modules it loaded.
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = [
+    "gradio", "pandas", "pymupdf", "docx", "sqlalchemy",
+    "prometheus_client", "anthropic", "PIL", "magic", "numpy"
+]
+
+# statement -> (modules that must NOT be imported, cumulative budget in ms)
+TARGETS = {
+    "import avahiplatform": (HEAVY_MODULES, 1500),
+    "from avahiplatform.src import BedrockSummarizer": (HEAVY_MODULES, 1500),
+    "from avahiplatform.helpers import BedrockChat": (HEAVY_MODULES, 1500),
+    "from avahiplatform.src import QueryCSV": (
+        [m for m in HEAVY_MODULES if m not in ("pandas", "numpy")], 2500
+    ),
+}
+
+TOP_N = 10
+
+
+def run_importtime(statement):
+    """
+    Executes an import statement with -X importtime in a fresh interpreter.
+
+    Returns:
+        tuple: (records, total_us) where records is a list of
+               (cumulative_us, self_us, module_name) tuples, one per imported module,
+               and total_us is the summed cumulative time of top-level imports.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    records = []
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Top-level imports are indented by exactly one space
+        if not name[1:].startswith(" "):
+            total_us += int(cumulative_us)
+        records.append((int(cumulative_us), int(self_us), name.strip()))
+    return records, total_us
+
+
+def slowest(records):
+    return "\n".join(
+        f"    {cumulative / 1000:9.1f} ms cumulative  {self_us / 1000:8.1f} ms self  {name}"
+        for cumulative, self_us, name in sorted(records, reverse=True)[:TOP_N]
+    )
+
+
+@pytest.mark.parametrize("statement", list(TARGETS))
+def test_import_stays_light(statement):
+    forbidden, budget_ms = TARGETS[statement]
+    records, total_us = run_importtime(statement)
+    imported = {name for _, _, name in records}
+    total_ms = total_us / 1000
+
+    leaked = [m for m in forbidden if m in imported]
+    assert not leaked, f"{statement!r} imported {', '.join(leaked)}\n{slowest(records)}"
+    assert total_ms <= budget_ms, f"{statement!r} took {total_ms:.1f} ms (budget {budget_ms} ms)\n{slowest(records)}"
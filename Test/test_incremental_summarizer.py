@@ -0,0 +1,119 @@
+import pytest
+
+from avahiplatform.helpers.chats.token_estimator import TokenEstimator
+from avahiplatform.src.incremental_summarizer import IncrementalSummarizer, IncrementalSummaryStore
+
+DOCUMENT_ID = "logs/app.log"
+
+
+class FakeChat:
+    """The parts of BedrockChat used by IncrementalSummarizer, summarizing text by its line count."""
+
+    model_id = "amazon.nova-pro-v1:0"
+    token_estimator = TokenEstimator()
+
+    def __init__(self):
+        self.requests = []
+
+    def invoke(self, prompts):
+        text = prompts[-1]["text"]
+        self.requests.append(text)
+        return {"response_text": f"summary of {len(text.splitlines())} lines", "inputTokens": 10,
+                "outputTokens": 2, "input_token_cost": 0.001, "output_token_cost": 0.0005, "total_cost": 0.0015}
+
+    def invoke_many_parsed(self, prompt_lists, max_concurrency=8):
+        results = [{"result": self.invoke(prompts), "error": None} for prompts in prompt_lists]
+        return {"results": results, "requests": len(results), "wall_time": 0.0,
+                **{key: sum(item["result"][key] for item in results)
+                   for key in ("inputTokens", "outputTokens", "input_token_cost", "output_token_cost", "total_cost")}}
+
+    def get_provider(self, region_name=None):
+        return "Bedrock:us-east-1:Amazon"
+
+
+@pytest.fixture
+def summarizer(tmp_path):
+    return IncrementalSummarizer(FakeChat(), store=IncrementalSummaryStore(str(tmp_path / "state.sqlite3")))
+
+
+def lines(start, stop):
+    return "".join(f"line {index}\n" for index in range(start, stop))
+
+
+def test_first_call_summarizes_the_whole_document(summarizer):
+    response = summarizer.summarize(DOCUMENT_ID, lines(0, 3))
+
+    assert summarizer.bedrockchat.requests == [lines(0, 3)]
+    assert response["response_text"] == "summary of 3 lines"
+    assert (response["new_chars"], response["resumed_from"]) == (len(lines(0, 3)), 0)
+    assert response["total_cost"] == pytest.approx(0.0015)
+    assert len(summarizer.store.load(DOCUMENT_ID)) == 1
+
+
+def test_append_only_sends_the_delta(summarizer):
+    summarizer.summarize(DOCUMENT_ID, lines(0, 3))
+
+    response = summarizer.summarize(DOCUMENT_ID, lines(0, 5))
+
+    request = summarizer.bedrockchat.requests[-1]
+    assert request == f"Current summary:\nsummary of 3 lines\n\nNew content:\n{lines(3, 5)}"
+    assert (response["new_chars"], response["resumed_from"]) == (len(lines(3, 5)), len(lines(0, 3)))
+    assert [segment[:2] for segment in summarizer.store.load(DOCUMENT_ID)] == [
+        (0, len(lines(0, 3))), (len(lines(0, 3)), len(lines(0, 5)))
+    ]
+
+
+def test_unchanged_document_makes_no_call(summarizer):
+    first = summarizer.summarize(DOCUMENT_ID, lines(0, 3))
+
+    response = summarizer.summarize(DOCUMENT_ID, lines(0, 3))
+
+    assert len(summarizer.bedrockchat.requests) == 1
+    assert response["response_text"] == first["response_text"]
+    assert response["new_chars"] == 0
+    assert response["total_cost"] == 0.0
+
+
+def test_edit_resumes_from_the_last_unchanged_segment(summarizer):
+    summarizer.summarize(DOCUMENT_ID, lines(0, 3))
+    summarizer.summarize(DOCUMENT_ID, lines(0, 5))
+    summarizer.summarize(DOCUMENT_ID, lines(0, 7))
+    edited = lines(0, 4) + "edited line\n" + lines(5, 8)
+
+    response = summarizer.summarize(DOCUMENT_ID, edited)
+
+    # The first segment (lines 0-2) is intact; the edit falls in the second one
+    assert response["resumed_from"] == len(lines(0, 3))
+    request = summarizer.bedrockchat.requests[-1]
+    assert request.startswith("Current summary:\nsummary of 3 lines\n\nNew content:\n")
+    assert request.endswith(edited[len(lines(0, 3)):])
+    segments = summarizer.store.load(DOCUMENT_ID)
+    assert [segment[:2] for segment in segments] == [(0, len(lines(0, 3))), (len(lines(0, 3)), len(edited))]
+
+
+def test_truncated_document_is_summarized_from_scratch(summarizer):
+    summarizer.summarize(DOCUMENT_ID, lines(0, 5))
+
+    response = summarizer.summarize(DOCUMENT_ID, lines(0, 2))
+
+    assert response["resumed_from"] == 0
+    assert summarizer.bedrockchat.requests[-1] == lines(0, 2)
+
+
+def test_reset_forgets_the_document(summarizer):
+    summarizer.summarize(DOCUMENT_ID, lines(0, 3))
+    summarizer.summarize("other", lines(0, 2))
+
+    summarizer.reset(DOCUMENT_ID)
+    response = summarizer.summarize(DOCUMENT_ID, lines(0, 3))
+
+    assert response["resumed_from"] == 0
+    assert len(summarizer.bedrockchat.requests) == 3
+    assert summarizer.store.load("other")
+
+
+def test_store_persists_across_instances(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+    IncrementalSummaryStore(path).append(DOCUMENT_ID, 0, 0, 10, "hash", "summary")
+
+    assert IncrementalSummaryStore(path).load(DOCUMENT_ID) == [(0, 10, "hash", "summary")]
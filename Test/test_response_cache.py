@@ -0,0 +1,138 @@
+import time
+
+import pytest
+
+from avahiplatform.helpers.chats.bedrock_chat import BedrockChat
+from avahiplatform.helpers.chats.response_cache import InMemoryResponseCache, ResponseCache, SQLiteResponseCache
+
+MODEL_ID = "amazon.nova-pro-v1:0"
+CONFIG = {"maxTokens": 512, "temperature": 0.6, "topP": 0.5}
+
+
+def messages(text="Summarize this.", image=b"\x89PNG-one"):
+    return [{"role": "user", "content": [
+        {"text": text},
+        {"image": {"format": "png", "source": {"bytes": image}}},
+    ]}]
+
+
+def test_key_is_stable():
+    assert ResponseCache.make_key(MODEL_ID, messages(), dict(CONFIG)) == \
+        ResponseCache.make_key(MODEL_ID, messages(), dict(reversed(list(CONFIG.items()))))
+
+
+@pytest.mark.parametrize("changed", [
+    lambda: ResponseCache.make_key("amazon.nova-lite-v1:0", messages(), CONFIG),
+    lambda: ResponseCache.make_key(MODEL_ID, messages(text="Describe this."), CONFIG),
+    lambda: ResponseCache.make_key(MODEL_ID, messages(image=b"\x89PNG-two"), CONFIG),
+    lambda: ResponseCache.make_key(MODEL_ID, messages(), {**CONFIG, "temperature": 0.0}),
+    lambda: ResponseCache.make_key(MODEL_ID, messages(), CONFIG, system=[{"text": "Be brief."}]),
+])
+def test_key_changes_with_the_request(changed):
+    assert changed() != ResponseCache.make_key(MODEL_ID, messages(), CONFIG)
+
+
+def test_none_extras_do_not_change_the_key():
+    assert ResponseCache.make_key(MODEL_ID, messages(), CONFIG, system=None) == \
+        ResponseCache.make_key(MODEL_ID, messages(), CONFIG)
+
+
+def test_in_memory_cache_evicts_least_recently_used():
+    response = {"response_text": "x" * 100}
+    cache = InMemoryResponseCache(max_bytes=400)
+    cache.set("a", response)
+    cache.set("b", response)
+    cache.set("c", response)
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") is not None
+
+    cache.set("d", response)
+
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in ("a", "c", "d"))
+
+
+def test_in_memory_cache_skips_oversized_responses():
+    cache = InMemoryResponseCache(max_bytes=50)
+
+    cache.set("a", {"response_text": "x" * 100})
+
+    assert cache.get("a") is None
+
+
+def test_in_memory_cache_expires_entries():
+    cache = InMemoryResponseCache(ttl_seconds=0.05)
+    cache.set("a", {"response_text": "hello"})
+
+    assert cache.get("a") == {"response_text": "hello"}
+    time.sleep(0.1)
+    assert cache.get("a") is None
+
+
+def test_sqlite_cache_evicts_least_recently_used(tmp_path):
+    cache = SQLiteResponseCache(path=str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.set("a", {"response_text": "a"})
+    time.sleep(0.01)
+    cache.set("b", {"response_text": "b"})
+    time.sleep(0.01)
+    assert cache.get("a") == {"response_text": "a"}
+    time.sleep(0.01)
+
+    cache.set("c", {"response_text": "c"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"response_text": "a"}
+    assert cache.get("c") == {"response_text": "c"}
+
+
+class FakeS3Helper:
+    def __init__(self):
+        self.versions = {"s3://bucket/photo.png": "etag-1"}
+
+    def get_s3_object_version(self, uri):
+        if uri not in self.versions:
+            raise ValueError(f"{uri} does not exist")
+        return self.versions[uri]
+
+
+@pytest.fixture
+def chat(fake_boto_helper):
+    helper = fake_boto_helper(model_name="Nova Pro", provider_name="Amazon")
+    chat = BedrockChat(model_id=MODEL_ID, boto_helper=helper, response_cache=InMemoryResponseCache())
+    chat.s3_helper = FakeS3Helper()
+    return chat
+
+
+def s3_messages(uri="s3://bucket/photo.png"):
+    return [{"role": "user", "content": [
+        {"text": "Describe this."},
+        {"image": {"format": "png", "source": {"s3Location": {"uri": uri}}}},
+    ]}]
+
+
+def test_s3_location_media_is_keyed_by_object_version(chat):
+    first = chat._cache_key(s3_messages(), None)
+    assert chat._cache_key(s3_messages(), None) == first
+
+    chat.s3_helper.versions["s3://bucket/photo.png"] = "etag-2"
+
+    assert chat._cache_key(s3_messages(), None) != first
+
+
+def test_requests_with_unknown_s3_versions_are_not_cached(chat):
+    assert chat._cache_key(s3_messages("s3://bucket/missing.png"), None) is None
+
+
+def test_base_cache_cannot_be_instantiated():
+    with pytest.raises(TypeError):
+        ResponseCache()
+
+
+def test_sqlite_cache_defaults_to_the_user_cache_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    cache = SQLiteResponseCache()
+
+    assert cache.path == str(tmp_path / "avahiplatform" / "response_cache.sqlite3")
+    cache.set("a", {"response_text": "a"})
+    assert (tmp_path / "avahiplatform" / "response_cache.sqlite3").exists()
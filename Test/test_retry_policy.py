@@ -0,0 +1,119 @@
+import botocore.exceptions
+import pytest
+
+from avahiplatform.helpers.connectors.boto_helper import BotoHelper
+from avahiplatform.helpers.connectors.retry_policy import RetryPolicy
+
+
+def client_error(code):
+    return botocore.exceptions.ClientError({"Error": {"Code": code, "Message": code}}, "Converse")
+
+
+@pytest.mark.parametrize("code", ["ThrottlingException", "TooManyRequestsException", "throttlingException"])
+def test_throttling_errors(code):
+    assert RetryPolicy().classify(client_error(code)) == "throttling"
+
+
+@pytest.mark.parametrize("code", ["ServiceUnavailableException", "ModelTimeoutException", "internalServerException"])
+def test_transient_errors(code):
+    assert RetryPolicy().classify(client_error(code)) == "transient"
+
+
+@pytest.mark.parametrize("code", ["ValidationException", "AccessDeniedException", "ResourceNotFoundException"])
+def test_client_errors_are_fatal(code):
+    assert RetryPolicy().classify(client_error(code)) == "fatal"
+
+
+def test_timeouts_are_transient_unless_disabled():
+    error = botocore.exceptions.ReadTimeoutError(endpoint_url="https://bedrock")
+
+    assert RetryPolicy().classify(error) == "transient"
+    assert RetryPolicy(retry_on_timeouts=False).classify(error) == "fatal"
+    assert RetryPolicy().classify(ValueError("boom")) == "fatal"
+
+
+def test_backoff_delay_is_bounded():
+    policy = RetryPolicy(base_delay=0.5, max_delay=4.0)
+
+    for retry in range(10):
+        bound = min(4.0, 0.5 * 2 ** retry)
+        delays = [policy.backoff_delay(retry) for _ in range(200)]
+        assert all(0 <= delay <= bound for delay in delays)
+    # Full jitter: the delays are spread over the whole range
+    assert max(policy.backoff_delay(10) for _ in range(200)) > 2.0
+
+
+def test_retries_until_success(monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    policy = RetryPolicy(max_attempts=5)
+    errors = [client_error("ThrottlingException"), client_error("ServiceUnavailableException")]
+
+    def call():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    stats = {}
+    assert policy.execute(call, stats) == "ok"
+    assert stats["retries"] == 2
+    assert stats["retry_backoff_time"] >= 0
+
+
+def test_stops_after_max_attempts(monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    policy = RetryPolicy(max_attempts=3)
+    calls = []
+
+    def call():
+        calls.append(1)
+        raise client_error("ThrottlingException")
+
+    with pytest.raises(botocore.exceptions.ClientError):
+        policy.execute(call)
+    assert len(calls) == 3
+
+
+def test_fatal_errors_are_not_retried():
+    calls = []
+
+    def call():
+        calls.append(1)
+        raise client_error("ValidationException")
+
+    with pytest.raises(botocore.exceptions.ClientError):
+        RetryPolicy().execute(call)
+    assert len(calls) == 1
+
+
+def test_stops_when_the_time_budget_is_spent(monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    policy = RetryPolicy(max_attempts=10, base_delay=10.0, max_delay=10.0, max_elapsed=0.0)
+    monkeypatch.setattr(policy, "backoff_delay", lambda retry: 1.0)
+    calls = []
+
+    def call():
+        calls.append(1)
+        raise client_error("ThrottlingException")
+
+    with pytest.raises(botocore.exceptions.ClientError):
+        policy.execute(call)
+    assert len(calls) == 1
+
+
+def test_bedrock_clients_leave_retries_to_the_policy():
+    helper = BotoHelper(region_name="us-east-1")
+
+    runtime = helper.create_client("bedrock-runtime")
+    s3 = helper.create_client("s3")
+
+    assert runtime.meta.config.retries == {"mode": "standard", "total_max_attempts": 1}
+    assert "total_max_attempts" not in (s3.meta.config.retries or {})
+
+
+def test_explicit_botocore_retries_apply_to_bedrock_clients():
+    helper = BotoHelper(region_name="us-east-1", retry_mode="adaptive", max_attempts=4)
+
+    runtime = helper.create_client("bedrock-runtime")
+
+    # botocore counts the first call in total_max_attempts
+    assert runtime.meta.config.retries == {"mode": "adaptive", "total_max_attempts": 5}
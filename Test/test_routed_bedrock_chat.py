@@ -0,0 +1,119 @@
+import botocore.exceptions
+import pytest
+
+from avahiplatform.helpers.chats.routed_bedrock_chat import RoutedBedrockChat
+from avahiplatform.helpers.connectors.retry_policy import RetryPolicy
+
+MODEL_ID = "anthropic.claude-3-sonnet-20240229-v1:0"
+
+
+def client_error(code):
+    return botocore.exceptions.ClientError({"Error": {"Code": code, "Message": code}}, "Converse")
+
+
+class FakeRuntimeClient:
+    """A bedrock-runtime client of one region, failing with the queued errors first."""
+
+    def __init__(self, region_name, calls):
+        self.region_name = region_name
+        self.calls = calls
+        self.errors = []
+
+    def converse(self, **kwargs):
+        self.calls.append(self.region_name)
+        if self.errors:
+            raise self.errors.pop(0)
+        return {
+            "output": {"message": {"content": [{"text": f"from {self.region_name}"}]}},
+            "usage": {"inputTokens": 10, "outputTokens": 5},
+        }
+
+
+REGIONS = ["us-east-1", "us-west-2", "eu-west-1"]
+
+
+def make_chat(fake_boto_helper, retry_policy=None):
+    calls = []
+    helper = fake_boto_helper({region: FakeRuntimeClient(region, calls) for region in REGIONS}, retry_policy)
+    chat = RoutedBedrockChat(model_id=MODEL_ID, boto_helper=helper, regions=REGIONS)
+    return chat, helper, calls
+
+
+def invoke(chat, region_name=None):
+    retry_stats = {}
+    response = chat._invoke_model([{"role": "user", "content": [{"text": "hi"}]}], None, retry_stats, region_name)
+    return response["output"]["message"]["content"][0]["text"], retry_stats
+
+
+def test_model_details_come_from_the_first_region(fake_boto_helper):
+    chat, helper, _ = make_chat(fake_boto_helper)
+
+    assert helper.details_regions == ["us-east-1"]
+    assert chat.model_details["region_name"] == "us-east-1"
+
+
+def test_regions_are_ranked_by_mean_latency(fake_boto_helper):
+    chat, _, _ = make_chat(fake_boto_helper)
+    chat._record("us-east-1", latency=0.9)
+    chat._record("us-west-2", latency=0.2)
+    chat._record("eu-west-1", latency=0.5)
+
+    assert chat._ranked_regions() == ["us-west-2", "eu-west-1", "us-east-1"]
+    assert chat._select_region() == "us-west-2"
+
+
+def test_unhealthy_regions_are_ranked_last(fake_boto_helper):
+    chat, _, _ = make_chat(fake_boto_helper)
+    chat._record("us-east-1", latency=0.1)
+    chat._record("us-west-2", latency=0.5)
+    chat._record("us-east-1", error=True)
+
+    assert chat._ranked_regions()[-1] == "us-east-1"
+
+
+def test_fails_over_on_the_first_throttle(fake_boto_helper):
+    chat, helper, calls = make_chat(fake_boto_helper)
+    chat._record("us-west-2", latency=0.5)
+    chat._record("eu-west-1", latency=0.9)
+    helper.runtime_clients["us-east-1"].errors.append(client_error("ThrottlingException"))
+
+    text, retry_stats = invoke(chat, "us-east-1")
+
+    # Not retried in us-east-1: the next best region is called at once
+    assert calls == ["us-east-1", "us-west-2"]
+    assert text == "from us-west-2"
+    assert retry_stats["region_name"] == "us-west-2"
+    assert retry_stats["failovers"] == 1
+    assert retry_stats["retry_backoff_time"] == 0.0
+
+
+def test_backs_off_once_every_region_failed(fake_boto_helper):
+    chat, helper, calls = make_chat(fake_boto_helper)
+    for region in REGIONS:
+        helper.runtime_clients[region].errors.append(client_error("ServiceUnavailableException"))
+
+    text, retry_stats = invoke(chat, "us-east-1")
+
+    assert calls[:3] == ["us-east-1", "us-west-2", "eu-west-1"]
+    assert len(calls) == 4
+    assert retry_stats["retries"] == 3
+    assert text == f"from {calls[-1]}"
+
+
+def test_retry_budget_applies_across_regions(fake_boto_helper):
+    chat, helper, calls = make_chat(fake_boto_helper, RetryPolicy(max_attempts=2, base_delay=0.0, max_delay=0.0))
+    for region in REGIONS:
+        helper.runtime_clients[region].errors.append(client_error("ThrottlingException"))
+
+    with pytest.raises(botocore.exceptions.ClientError):
+        invoke(chat, "us-east-1")
+    assert calls == ["us-east-1", "us-west-2"]
+
+
+def test_fatal_errors_do_not_fail_over(fake_boto_helper):
+    chat, helper, calls = make_chat(fake_boto_helper)
+    helper.runtime_clients["us-east-1"].errors.append(client_error("ValidationException"))
+
+    with pytest.raises(botocore.exceptions.ClientError):
+        invoke(chat, "us-east-1")
+    assert calls == ["us-east-1"]
@@ -0,0 +1,118 @@
+import time
+
+from avahiplatform.helpers.chats.semantic_cache import SemanticResponseCache
+from avahiplatform.src.chatbot import BedrockChatbot
+
+VECTORS = {
+    "What is the capital of France?": [1.0, 0.0, 0.0],
+    "What's France's capital?": [0.99, 0.1, 0.0],
+    "How do I bake bread?": [0.0, 1.0, 0.0],
+    "Why?": [0.0, 0.0, 1.0],
+}
+
+
+class FakeEmbedder:
+    """Embeds the queries of VECTORS without calling Bedrock."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_embeddings(self, text, **kwargs):
+        self.calls += 1
+        return {"embeddings": VECTORS[text]}
+
+
+def make_cache(**kwargs):
+    return SemanticResponseCache(FakeEmbedder(), similarity_threshold=0.9, **kwargs)
+
+
+def test_similar_query_is_served_from_the_cache():
+    cache = make_cache()
+    cache.store("ns", "What is the capital of France?", {"response_text": "Paris"})
+
+    response, similarity, _ = cache.lookup("ns", "What's France's capital?")
+
+    assert response == {"response_text": "Paris"}
+    assert similarity > 0.9
+
+
+def test_unrelated_query_and_other_namespace_miss():
+    cache = make_cache()
+    cache.store("ns", "What is the capital of France?", {"response_text": "Paris"})
+
+    assert cache.lookup("ns", "How do I bake bread?")[0] is None
+    assert cache.lookup("other", "What is the capital of France?")[0] is None
+
+
+def test_lookup_embedding_is_reused_by_store():
+    cache = make_cache()
+
+    _, _, embedding = cache.lookup("ns", "What is the capital of France?")
+    cache.store("ns", "What is the capital of France?", {"response_text": "Paris"}, embedding)
+
+    assert cache.embedder.calls == 1
+
+
+def test_expired_entry_is_replaced_by_a_fresh_one():
+    cache = make_cache(ttl_seconds=0.05)
+    cache.store("ns", "What is the capital of France?", {"response_text": "old"})
+    time.sleep(0.1)
+
+    assert cache.lookup("ns", "What is the capital of France?")[0] is None
+    cache.store("ns", "What is the capital of France?", {"response_text": "new"})
+
+    assert cache.lookup("ns", "What is the capital of France?")[0] == {"response_text": "new"}
+    # The expired row was overwritten rather than kept next to the new one
+    assert cache._namespaces["ns"].size == 1
+
+
+def test_full_namespace_evicts_least_recently_used():
+    cache = make_cache(max_entries=2)
+    cache.store("ns", "What is the capital of France?", {"response_text": "Paris"})
+    cache.store("ns", "How do I bake bread?", {"response_text": "Knead"})
+    assert cache.lookup("ns", "What is the capital of France?")[0] is not None
+
+    cache.store("ns", "Why?", {"response_text": "Because"})
+
+    assert cache.lookup("ns", "How do I bake bread?")[0] is None
+    assert cache.lookup("ns", "What is the capital of France?")[0] is not None
+
+
+class FakeTokenEstimator:
+    def estimate_text(self, model_id, text):
+        return len(text) // 4
+
+
+class FakeChat:
+    """The parts of BedrockChat used by BedrockChatbot."""
+
+    model_id = "amazon.nova-pro-v1:0"
+    token_estimator = FakeTokenEstimator()
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompts):
+        self.calls += 1
+        return {"response_text": f"answer {self.calls}", "total_cost": 0.01}
+
+    def _cached_response(self, cached, time_to_last_token):
+        return {**cached, "cache_hit": True, "total_cost": 0.0}
+
+
+def test_chatbot_only_caches_the_opening_turn(metrics_file):
+    chat = FakeChat()
+    chatbot = BedrockChatbot(chat, semantic_cache=make_cache())
+
+    chatbot.initialize_system("You are a geography tutor.")
+    chatbot.chat("What is the capital of France?")
+    chatbot.chat("Why?")
+    chatbot.initialize_system("You are a geography tutor.")
+    opening = chatbot.chat("What's France's capital?")
+    follow_up = chatbot.chat("Why?")
+
+    assert opening["cache_hit"] is True
+    assert opening["response_text"] == "answer 1"
+    # "Why?" depends on the conversation, so it is never answered from the cache
+    assert follow_up["response_text"] == "answer 3"
+    assert chat.calls == 3
@@ -1,3 +1,4 @@
+import threading
 from .platform_core import AvahiPlatform
 
 # Initialize with default settings
@@ -15,11 +16,47 @@ def configure(
     p=0.5,
     input_bucket_name_for_medical_scribing="",
     iam_arn_for_medical_scribing="",
-    default_model_name='anthropic.claude-3-sonnet-20240229-v1:0'
+    default_model_name='anthropic.claude-3-sonnet-20240229-v1:0',
+    boto_client_config=None,
+    retry_policy=None,
+    admission_scheduler=None,
+    model_details_cache_file=None,
+    response_cache=None,
+    prompt_caching=False,
+    bedrock_regions=None,
+    hedging_policy=None,
+    semantic_cache_threshold=None,
+    semantic_cache_embedding_model="amazon.titan-embed-text-v2:0",
+    incremental_summary_db=None,
+    image_optimizer=None
 ):
     """
     Configure the AvahiPlatform with custom settings.
     Must be called before using any platform functionalities.
+
+    boto_client_config is an optional dict of connection settings shared by all
+    AWS clients (max_pool_connections, connect_timeout, read_timeout,
+    tcp_keepalive, retry_mode, max_attempts). retry_policy is an optional
+    RetryPolicy (from avahiplatform.helpers) controlling the backoff applied to
+    throttled Bedrock calls. admission_scheduler is an optional AdmissionScheduler
+    queueing Bedrock chat calls to stay within per-model RPM/TPM quotas.
+    model_details_cache_file is an
+    optional JSON file used to persist Bedrock model details across processes.
+    response_cache is an optional ResponseCache (e.g. InMemoryResponseCache or
+    SQLiteResponseCache from avahiplatform.helpers) serving repeated identical requests.
+    prompt_caching adds Bedrock cache points after system prompts and large
+    attachments; only enable it for models that support prompt caching.
+    bedrock_regions (e.g. ["us-east-1", "us-west-2"]) routes chat requests to the
+    fastest healthy region and fails over between them.
+    hedging_policy is an optional HedgingPolicy duplicating chat requests that run
+    past a percentile of recent latencies, to cut tail latency at a capped extra cost.
+    Setting semantic_cache_threshold (e.g. 0.92) enables a semantic cache for nl2sql
+    and the opening query of chatbot conversations, matching queries by embedding similarity.
+    incremental_summary_db is the SQLite file where summarize_incremental keeps the
+    state of growing documents between calls (by default in ~/.cache/avahiplatform/).
+    image_optimizer is an optional ImageOptimizer downscaling and recompressing
+    images before they are sent to chat models or embedded for image similarity;
+    the bytes saved are reported as image_bytes_saved.
     """
     global _platform_instance
     _platform_instance = AvahiPlatform(
@@ -34,15 +71,29 @@ def configure(
         p=p,
         input_bucket_name_for_medical_scribing=input_bucket_name_for_medical_scribing,
         iam_arn_for_medical_scribing=iam_arn_for_medical_scribing,
-        default_model_name=default_model_name
+        default_model_name=default_model_name,
+        boto_client_config=boto_client_config,
+        retry_policy=retry_policy,
+        admission_scheduler=admission_scheduler,
+        model_details_cache_file=model_details_cache_file,
+        response_cache=response_cache,
+        prompt_caching=prompt_caching,
+        bedrock_regions=bedrock_regions,
+        hedging_policy=hedging_policy,
+        semantic_cache_threshold=semantic_cache_threshold,
+        semantic_cache_embedding_model=semantic_cache_embedding_model,
+        incremental_summary_db=incremental_summary_db,
+        image_optimizer=image_optimizer
     )
     _init_platform_exports()
 
 def _init_platform_exports():
     """Initialize all platform exports with the configured instance."""
-    global summarize_text, summarize_document, summarize_image, summarize_s3_document, summarize_video
-    global structuredExtraction, mask_data, grammar_assistant, product_description_assistant, generate_image, get_similar_images
-    global nl2sql, query_csv, medicalscribing, generate_icdcode, chatbot, initialize_observability
+    global summarize_text, summarize_document, summarize_image, summarize_s3_document, summarize_video, summarize_batch
+    global summarize_incremental
+    global extract_structures_batch, mask_data_batch, grammar_assistant_batch
+    global structuredExtraction, mask_data, grammar_assistant, product_description_assistant, generate_image, generate_images, get_similar_images
+    global nl2sql, query_csv, medicalscribing, generate_icdcode, initialize_observability
     global _platform_instance  
 
     if _platform_instance is None:
@@ -54,6 +105,8 @@ def _init_platform_exports():
     summarize_image = _platform_instance.summarize_image
     summarize_s3_document = _platform_instance.summarize_s3_document
     summarize_video = _platform_instance.summarize_video
+    summarize_batch = _platform_instance.summarize_batch
+    summarize_incremental = _platform_instance.summarize_incremental
 
     # Core functionalities
     structuredExtraction = _platform_instance.extract_structures
@@ -61,9 +114,15 @@ def _init_platform_exports():
     grammar_assistant = _platform_instance.grammar_assistant
     product_description_assistant = _platform_instance.product_description_assistant
 
+    # Batched variants, run concurrently through BedrockChat.invoke_many
+    extract_structures_batch = _platform_instance.extract_structures_batch
+    mask_data_batch = _platform_instance.mask_data_batch
+    grammar_assistant_batch = _platform_instance.grammar_assistant_batch
+
     # AI Services
     nl2sql = _platform_instance.nl2sql
     generate_image = _platform_instance.image_generation
+    generate_images = _platform_instance.images_generation
     get_similar_images = _platform_instance.get_similar_images
 
     # imageGeneration = _platform_instance.imageGeneration
@@ -77,8 +136,30 @@ def _init_platform_exports():
     generate_icdcode = _platform_instance.generate_icdcode
 
     # Chat and Observability
-    chatbot = _platform_instance.chatbot
+    # `chatbot` is resolved through __getattr__ so the BedrockChatbot is only built when used
     initialize_observability = _platform_instance.initialize_observability
 
-# Initialize with default settings
-_init_platform_exports()
\ No newline at end of file
+# Platform exports resolved on first access (PEP 562) so that importing the
+# package does not build an AvahiPlatform or create any AWS clients.
+_PLATFORM_EXPORTS = frozenset({
+    "summarize_text", "summarize_document", "summarize_image", "summarize_s3_document", "summarize_video",
+    "summarize_batch", "summarize_incremental", "extract_structures_batch", "mask_data_batch", "grammar_assistant_batch",
+    "structuredExtraction", "mask_data", "grammar_assistant", "product_description_assistant",
+    "generate_image", "generate_images", "get_similar_images", "nl2sql", "query_csv", "medicalscribing",
+    "generate_icdcode", "initialize_observability"
+})
+_exports_lock = threading.Lock()
+
+
+def __getattr__(name):
+    if name == "chatbot":
+        with _exports_lock:
+            if _platform_instance is None:
+                _init_platform_exports()
+        return _platform_instance.chatbot
+    if name in _PLATFORM_EXPORTS:
+        with _exports_lock:
+            if name not in globals():
+                _init_platform_exports()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -1,4 +1,50 @@
-from .chats import *
-from .image_helper import *
-from .connectors import *
-from .embedding_helper import *
\ No newline at end of file
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .chats import AnthropicChat, BedrockChat, RoutedBedrockChat, BedrockBatchInference
+    from .chats import ResponseCache, InMemoryResponseCache, SQLiteResponseCache, SemanticResponseCache
+    from .chats import HedgingPolicy, TokenEstimator, ContextWindowExceededError
+    from .image_helper import BedrockImageGeneration, ImageOptimizer
+    from .connectors import BotoHelper, S3Helper, Utils, RetryPolicy, AdmissionScheduler
+    from .embedding_helper import BaseEmbeddings, BedrockEmbeddings
+
+# Helpers are resolved on first attribute access (PEP 562) so that importing one
+# helper does not import the dependencies of all the others.
+_LAZY_IMPORTS = {
+    "AnthropicChat": ".chats",
+    "BedrockChat": ".chats",
+    "RoutedBedrockChat": ".chats",
+    "BedrockBatchInference": ".chats",
+    "ResponseCache": ".chats",
+    "InMemoryResponseCache": ".chats",
+    "SQLiteResponseCache": ".chats",
+    "SemanticResponseCache": ".chats",
+    "HedgingPolicy": ".chats",
+    "TokenEstimator": ".chats",
+    "ContextWindowExceededError": ".chats",
+    "BedrockImageGeneration": ".image_helper",
+    "ImageOptimizer": ".image_helper",
+    "BotoHelper": ".connectors",
+    "S3Helper": ".connectors",
+    "Utils": ".connectors",
+    "RetryPolicy": ".connectors",
+    "AdmissionScheduler": ".connectors",
+    "BaseEmbeddings": ".embedding_helper",
+    "BedrockEmbeddings": ".embedding_helper",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
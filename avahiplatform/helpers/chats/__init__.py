@@ -1,8 +1,57 @@
-from .base_chat import BaseChat
-from .anthropic_chat import AnthropicChat
-from .bedrock_chat import BedrockChat
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .base_chat import BaseChat
+    from .anthropic_chat import AnthropicChat
+    from .bedrock_chat import BedrockChat
+    from .routed_bedrock_chat import RoutedBedrockChat
+    from .bedrock_batch_inference import BedrockBatchInference
+    from .response_cache import ResponseCache, InMemoryResponseCache, SQLiteResponseCache
+    from .semantic_cache import SemanticResponseCache
+    from .hedging_policy import HedgingPolicy
+    from .token_estimator import TokenEstimator, ContextWindowExceededError
+
+# Submodules are imported on first attribute access (PEP 562), so e.g. using
+# BedrockChat never pulls in the anthropic SDK.
+_LAZY_IMPORTS = {
+    "BaseChat": ".base_chat",
+    "AnthropicChat": ".anthropic_chat",
+    "BedrockChat": ".bedrock_chat",
+    "RoutedBedrockChat": ".routed_bedrock_chat",
+    "BedrockBatchInference": ".bedrock_batch_inference",
+    "ResponseCache": ".response_cache",
+    "InMemoryResponseCache": ".response_cache",
+    "SQLiteResponseCache": ".response_cache",
+    "SemanticResponseCache": ".semantic_cache",
+    "HedgingPolicy": ".hedging_policy",
+    "TokenEstimator": ".token_estimator",
+    "ContextWindowExceededError": ".token_estimator",
+}
 
 __all__ = [
     "AnthropicChat",
-    "BedrockChat"
-]
\ No newline at end of file
+    "BedrockChat",
+    "RoutedBedrockChat",
+    "BedrockBatchInference",
+    "ResponseCache",
+    "InMemoryResponseCache",
+    "SQLiteResponseCache",
+    "SemanticResponseCache",
+    "HedgingPolicy",
+    "TokenEstimator",
+    "ContextWindowExceededError"
+]
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -15,6 +15,10 @@ class AnthropicChat(BaseChat):
         temperature (float): The temperature parameter for controlling randomness in generation.
         p (float): The p parameter for nucleus (top-p) sampling.
         anthropic_client (anthropic.Anthropic): The Anthropic client object used for model invocation.
+        async_anthropic_client (anthropic.AsyncAnthropic): The async client used by the ainvoke methods,
+            created on first use.
+        image_optimizer (ImageOptimizer): Optional downscaling and recompression of image prompts
+            before they are sent; the bytes saved are reported as "image_bytes_saved".
     """
 
     def __init__(self, 
@@ -22,7 +26,8 @@ class AnthropicChat(BaseChat):
                  max_tokens=512, 
                  temperature=0.6, 
                  p=0.5,
-                 api_key=None):
+                 api_key=None,
+                 image_optimizer=None):
         """
         Initializes the AnthropicChat with the specified model ID and parameters.
         """
@@ -34,7 +39,9 @@ class AnthropicChat(BaseChat):
         self.temperature = temperature
         self.p = p
         self.api_key = api_key
+        self.image_optimizer = image_optimizer
         self.anthropic_client = self._create_client()
+        self._async_anthropic_client = None
 
     def _create_client(self):
         """
@@ -45,10 +52,25 @@ class AnthropicChat(BaseChat):
         """
         return anthropic.Anthropic(api_key=self.api_key)
 
+    @property
+    def async_anthropic_client(self):
+        """
+        The AsyncAnthropic client used by the coroutine methods, created on first use.
+
+        Returns:
+            anthropic.AsyncAnthropic: The async Anthropic client object.
+        """
+        if self._async_anthropic_client is None:
+            self._async_anthropic_client = anthropic.AsyncAnthropic(api_key=self.api_key)
+        return self._async_anthropic_client
+
     def _prepare_request(self, prompts):
         """
         Prepares the request payload for the Anthropic model invocation based on the given prompts.
 
+        "system" prompts are skipped here (see _prepare_system) and {"cache_point": True}
+        marks the preceding block as the end of a cacheable prefix.
+
         Parameters:
             prompts (list): A list of prompt dictionaries.
 
@@ -56,7 +78,17 @@ class AnthropicChat(BaseChat):
             list: A list representing the conversation for the Anthropic API.
         """
         messages = []
+        in_system = False
         for prompt in prompts:
+            if "system" in prompt:
+                in_system = True
+                continue
+            if "cache_point" in prompt:
+                if prompt["cache_point"] and not in_system and messages:
+                    messages[-1]["cache_control"] = {"type": "ephemeral"}
+                continue
+            in_system = False
+
             if "text" in prompt:
                 # Text prompt
                 message = {
@@ -91,30 +123,56 @@ class AnthropicChat(BaseChat):
         ]
         return conversation
 
-    def _invoke_model(self, messages):
+    def _prepare_system(self, prompts):
+        """
+        Collects the {"system": str} prompts into the Anthropic system blocks.
+
+        Parameters:
+            prompts (list): A list of prompt dictionaries.
+
+        Returns:
+            list or None: The system text blocks, or None if there is no system prompt.
+        """
+        system = []
+        in_system = False
+        for prompt in prompts:
+            if "system" in prompt:
+                system.append({"type": "text", "text": prompt["system"]})
+                in_system = True
+            elif "cache_point" in prompt:
+                if prompt["cache_point"] and in_system and system:
+                    system[-1]["cache_control"] = {"type": "ephemeral"}
+            else:
+                in_system = False
+        return system or None
+
+    def _messages_kwargs(self, messages, system=None):
+        """
+        Builds the arguments shared by the messages.create and messages.stream calls.
+        """
+        kwargs = {
+            "model": self.model_id,
+            "max_tokens": self.max_tokens,
+            "messages": messages,
+            "temperature": self.temperature,
+            "top_p": self.p
+        }
+        if system:
+            kwargs["system"] = system
+        return kwargs
+
+    def _invoke_model(self, messages, system=None):
         """
         Invokes the Anthropic model with the given request in non-streaming mode.
         """
-        response = self.anthropic_client.messages.create(
-            model=self.model_id,
-            max_tokens=self.max_tokens,
-            messages=messages,
-            temperature=self.temperature,
-            top_p=self.p
-        )
+        response = self.anthropic_client.messages.create(**self._messages_kwargs(messages, system))
         return response
 
-    def _invoke_model_streaming(self, messages):
+    def _invoke_model_streaming(self, messages, system=None):
         """
         Invokes the Anthropic model with the given request and returns a streaming response object.
         """
-        streaming_response = self.anthropic_client.messages.stream(
-            model=self.model_id,
-            max_tokens=self.max_tokens,
-            temperature=self.temperature,
-            top_p=self.p,
-            messages=messages
-        )
+        streaming_response = self.anthropic_client.messages.stream(**self._messages_kwargs(messages, system))
         return streaming_response
 
     def invoke(self, prompts):
@@ -125,28 +183,60 @@ class AnthropicChat(BaseChat):
             raise ValueError('prompts must be a list')
 
         # Prepare the request
+        prompts, image_bytes_saved = self._optimize_prompt_images(prompts)
+        messages = self._prepare_request(prompts)
+        system = self._prepare_system(prompts)
+
+        # Invoke the model and get the response
+        start_t = time.perf_counter()
+        response = self._invoke_model(messages, system)
+        time_to_last_token = time.perf_counter() - start_t
+
+        return self._build_response(response, time_to_last_token, image_bytes_saved)
+
+    async def ainvoke(self, prompts):
+        """
+        Coroutine counterpart of invoke, using the AsyncAnthropic client.
+        """
+        if not isinstance(prompts, list):
+            raise ValueError('prompts must be a list')
+
+        # Prepare the request
+        prompts, image_bytes_saved = await self._aoptimize_prompt_images(prompts)
         messages = self._prepare_request(prompts)
+        system = self._prepare_system(prompts)
 
         # Invoke the model and get the response
         start_t = time.perf_counter()
-        response = self._invoke_model(messages)
+        response = await self.async_anthropic_client.messages.create(**self._messages_kwargs(messages, system))
         time_to_last_token = time.perf_counter() - start_t
 
+        return self._build_response(response, time_to_last_token, image_bytes_saved)
+
+    def _build_response(self, response, time_to_last_token, image_bytes_saved=0):
+        """
+        Builds the structured response returned by invoke and ainvoke.
+        """
         # Extracting content and usage according to Anthropic response format
         response_text = response.content[0].text
         input_tokens = response.usage.input_tokens
         output_tokens = response.usage.output_tokens
 
-        return {
+        result = {
             "response_text": response_text,
             "input_tokens": input_tokens,
             "output_tokens": output_tokens,
+            "cache_read_input_tokens": getattr(response.usage, "cache_read_input_tokens", None) or 0,
+            "cache_write_input_tokens": getattr(response.usage, "cache_creation_input_tokens", None) or 0,
             "time_to_first_token": None,
             "time_to_last_token": time_to_last_token,
             "time_per_output_token": None,
             "model_id": self.model_id,
             "provider": self.get_provider()
         }
+        if self.image_optimizer is not None:
+            result["image_bytes_saved"] = image_bytes_saved
+        return result
 
     def invoke_stream(self, prompts):
         """
@@ -156,16 +246,17 @@ class AnthropicChat(BaseChat):
             raise ValueError('prompts must be a list')
         
         # Prepare the request
+        prompts, image_bytes_saved = self._optimize_prompt_images(prompts)
         messages = self._prepare_request(prompts)
+        system = self._prepare_system(prompts)
         # Record the start time for measuring streaming performance
         start_t = time.perf_counter()
         # Invoke the model and get the response
-        streaming_response = self._invoke_model_streaming(messages)
+        streaming_response = self._invoke_model_streaming(messages, system)
         # Initialize a flag to capture the time to first token (TTFT)
         flag_ttft = True
         time_to_first_token = None
         time_to_last_token = None
-        time_per_output_token = None
 
         with streaming_response as stream:
             for text in stream.text_stream:
@@ -179,38 +270,106 @@ class AnthropicChat(BaseChat):
             # After streaming ends, extract token usage
             input_tokens = stream._MessageStream__final_message_snapshot.usage.input_tokens
             output_tokens = stream._MessageStream__final_message_snapshot.usage.output_tokens
-            if output_tokens and time_to_last_token and time_to_first_token:
-                generation_time = time_to_last_token - time_to_first_token
-                time_per_output_token = generation_time / max(output_tokens - 1, 1)
 
-            yield {"metadata": {
-                "input_tokens": input_tokens,
-                "output_tokens": output_tokens,
-                "time_to_first_token": time_to_first_token,
-                "time_to_last_token": time_to_last_token,
-                "time_per_output_token": time_per_output_token,
-                "model_id": self.model_id,
-                "provider": self.get_provider()
-            }}
+            yield self._build_stream_metadata(
+                input_tokens, output_tokens, time_to_first_token, time_to_last_token, image_bytes_saved
+            )
 
-    def invoke_stream_parsed(self, prompts):
+    async def ainvoke_stream(self, prompts):
         """
-        Wraps the invoke_stream method to measure timing and token usage.
+        Async-iterator counterpart of invoke_stream, using the AsyncAnthropic client.
         """
         if not isinstance(prompts, list):
             raise ValueError('prompts must be a list')
-            
-        response_stream = self.invoke_stream(prompts)
-        
-        response_text = ""
-        metadata = {}
-        for chunk in response_stream:
-            if "text" in chunk:
-                response_text += chunk.get("text", "")
-            elif "metadata" in chunk:
-                metadata = chunk["metadata"]
-
-        return {"response_text": response_text, **metadata}
+
+        # Prepare the request
+        prompts, image_bytes_saved = await self._aoptimize_prompt_images(prompts)
+        messages = self._prepare_request(prompts)
+        system = self._prepare_system(prompts)
+        # Record the start time for measuring streaming performance
+        start_t = time.perf_counter()
+        time_to_first_token = None
+
+        async with self.async_anthropic_client.messages.stream(**self._messages_kwargs(messages, system)) as stream:
+            async for text in stream.text_stream:
+                if time_to_first_token is None:
+                    # On receiving the first content, record the time to first token
+                    time_to_first_token = time.perf_counter() - start_t
+                yield {"text": text}
+
+            time_to_last_token = time.perf_counter() - start_t
+            # After streaming ends, extract token usage
+            final_message = await stream.get_final_message()
+
+        yield self._build_stream_metadata(
+            final_message.usage.input_tokens,
+            final_message.usage.output_tokens,
+            time_to_first_token,
+            time_to_last_token,
+            image_bytes_saved
+        )
+
+    def _build_stream_metadata(self, input_tokens, output_tokens, time_to_first_token, time_to_last_token,
+                               image_bytes_saved=0):
+        """
+        Builds the final metadata chunk yielded by invoke_stream and ainvoke_stream.
+        """
+        time_per_output_token = None
+        if output_tokens and time_to_last_token and time_to_first_token:
+            generation_time = time_to_last_token - time_to_first_token
+            time_per_output_token = generation_time / max(output_tokens - 1, 1)
+
+        metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "time_to_first_token": time_to_first_token,
+            "time_to_last_token": time_to_last_token,
+            "time_per_output_token": time_per_output_token,
+            "model_id": self.model_id,
+            "provider": self.get_provider()
+        }
+        if self.image_optimizer is not None:
+            metadata["image_bytes_saved"] = image_bytes_saved
+        return {"metadata": metadata}
+
+    def invoke_stream_parsed(self, prompts, on_text=None):
+        """
+        Streams the response and accumulates the full text and final metadata.
+
+        The text stream is consumed directly rather than through invoke_stream, and the text is
+        collected in a list joined once at the end. on_text, if given, is called with each text
+        delta as it arrives.
+        """
+        if not isinstance(prompts, list):
+            raise ValueError('prompts must be a list')
+
+        # Prepare the request
+        prompts, image_bytes_saved = self._optimize_prompt_images(prompts)
+        messages = self._prepare_request(prompts)
+        system = self._prepare_system(prompts)
+        # Record the start time for measuring streaming performance
+        start_t = time.perf_counter()
+        time_to_first_token = None
+        parts = []
+        append = parts.append
+
+        with self._invoke_model_streaming(messages, system) as stream:
+            for text in stream.text_stream:
+                if time_to_first_token is None:
+                    # On receiving the first content, record the time to first token
+                    time_to_first_token = time.perf_counter() - start_t
+                append(text)
+                if on_text is not None:
+                    on_text(text)
+
+            time_to_last_token = time.perf_counter() - start_t
+            # After streaming ends, extract token usage
+            usage = stream.get_final_message().usage
+
+        metadata = self._build_stream_metadata(
+            usage.input_tokens, usage.output_tokens, time_to_first_token, time_to_last_token, image_bytes_saved
+        )["metadata"]
+        return {"response_text": "".join(parts), **metadata}
 
     def get_provider(self):
         """
@@ -1,6 +1,11 @@
-import magic
+import asyncio
 import base64
+import hashlib
+import os
+import threading
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 class BaseChat(ABC):
     """
@@ -15,12 +20,52 @@ class BaseChat(ABC):
     - invoke_stream_parsed(prompts)
     - get_provider()
 
-    This class also provides standard helper methods for reading image files.
+    This class also provides standard helper methods for reading attachments and
+    detecting their format (memoized per file and shared by all instances), and
+    asyncio counterparts of the invoke methods (ainvoke, ainvoke_stream,
+    ainvoke_stream_parsed). By default these run the blocking methods on a bounded
+    thread pool shared by the instance; subclasses with a native async client
+    should override them.
     """
 
     ANTHROPIC_PROVIDER = "Anthropic"
     BEDROCK_PROVIDER = "Bedrock"
 
+    # Upper bound on blocking calls run concurrently on behalf of the async API
+    max_async_workers = 32
+
+    _async_executor_lock = threading.Lock()
+
+    # Leading bytes of common attachment formats, checked before falling back to libmagic.
+    # Only formats whose libmagic MIME subtype is the format name itself are listed.
+    MAGIC_NUMBERS = (
+        (0, b"\x89PNG\r\n\x1a\n", "png"),
+        (0, b"\xff\xd8\xff", "jpeg"),
+        (0, b"GIF87a", "gif"),
+        (0, b"GIF89a", "gif"),
+        (8, b"WEBP", "webp"),
+        (0, b"%PDF-", "pdf"),
+        (4, b"ftypisom", "mp4"),
+        (4, b"ftypiso2", "mp4"),
+        (4, b"ftypmp41", "mp4"),
+        (4, b"ftypmp42", "mp4"),
+    )
+    # Bytes hashed to identify an in-memory attachment in the format cache
+    FORMAT_KEY_PREFIX_BYTES = 64 * 1024
+
+    # Detected formats, keyed by (path, size, mtime) or (length, hash of the first bytes)
+    format_cache_size = 1024
+    # Recently read attachment files, so a file sent over and over is read once
+    attachment_cache_bytes = 64 * 1024 * 1024
+
+    # Optional ImageOptimizer applied to image prompts (see _optimize_prompt_images)
+    image_optimizer = None
+
+    _file_cache_lock = threading.Lock()
+    _format_cache = OrderedDict()
+    _attachment_cache = OrderedDict()
+    _attachment_cache_size = 0
+
     @abstractmethod
     def _create_client(self, *args, **kwargs):
         """
@@ -96,12 +141,13 @@ class BaseChat(ABC):
         pass
 
     @abstractmethod
-    def invoke_stream_parsed(self, prompts):
+    def invoke_stream_parsed(self, prompts, on_text=None):
         """
         Wraps the invoke_stream method to accumulate the full response and final metadata.
 
         Parameters:
             prompts (list): A list of prompt dictionaries.
+            on_text (callable): Optional sink called with each text delta as it arrives.
 
         Returns:
             dict: A dictionary with the full response text and metadata.
@@ -118,6 +164,121 @@ class BaseChat(ABC):
         """
         pass
 
+    def _get_async_executor(self):
+        """
+        Returns the thread pool used to bridge blocking calls into the async API,
+        creating it on first use.
+
+        Returns:
+            ThreadPoolExecutor: The executor, bounded by max_async_workers.
+        """
+        executor = getattr(self, "_async_executor", None)
+        if executor is None:
+            with self._async_executor_lock:
+                executor = getattr(self, "_async_executor", None)
+                if executor is None:
+                    executor = ThreadPoolExecutor(
+                        max_workers=self.max_async_workers,
+                        thread_name_prefix=f"{type(self).__name__}-async"
+                    )
+                    self._async_executor = executor
+        return executor
+
+    async def ainvoke(self, prompts):
+        """
+        Coroutine counterpart of invoke.
+
+        Parameters:
+            prompts (list): A list of prompt dictionaries.
+
+        Returns:
+            dict: The same structured response as invoke.
+        """
+        if not isinstance(prompts, list):
+            raise ValueError('prompts must be a list')
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_async_executor(), self.invoke, prompts)
+
+    async def ainvoke_stream(self, prompts):
+        """
+        Async-iterator counterpart of invoke_stream.
+
+        The blocking stream is consumed on the executor and its chunks are handed
+        to the event loop as they arrive. Closing the iterator early stops the
+        underlying stream after its current chunk.
+
+        Parameters:
+            prompts (list): A list of prompt dictionaries.
+
+        Yields:
+            dict: The same text and metadata chunks as invoke_stream.
+        """
+        if not isinstance(prompts, list):
+            raise ValueError('prompts must be a list')
+
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def put(item):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # The event loop was closed while the stream was still running
+                stop.set()
+
+        def produce():
+            try:
+                stream = self.invoke_stream(prompts)
+                try:
+                    for chunk in stream:
+                        if stop.is_set():
+                            break
+                        put(chunk)
+                finally:
+                    stream.close()
+            except BaseException as e:
+                put(e)
+            finally:
+                put(done)
+
+        loop.run_in_executor(self._get_async_executor(), produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+
+    async def ainvoke_stream_parsed(self, prompts):
+        """
+        Coroutine counterpart of invoke_stream_parsed.
+
+        Parameters:
+            prompts (list): A list of prompt dictionaries.
+
+        Returns:
+            dict: A dictionary with the full response text and metadata.
+        """
+        if not isinstance(prompts, list):
+            raise ValueError('prompts must be a list')
+
+        response_text = []
+        metadata = {}
+        async for chunk in self.ainvoke_stream(prompts):
+            if "text" in chunk:
+                response_text.append(chunk.get("text", ""))
+            elif "metadata" in chunk:
+                metadata = chunk["metadata"]
+
+        return {"response_text": "".join(response_text), **metadata}
+
     def _read_image_base64(self, image_path):
         """
         Reads an image file and returns its base64-encoded string.
@@ -128,53 +289,152 @@ class BaseChat(ABC):
         Returns:
             str: Base64-encoded image data.
         """
-        try:
-            with open(image_path, 'rb') as image_file:
-                encoded_image = base64.b64encode(image_file.read()).decode('utf-8')
-            return encoded_image
-        except Exception:
-            raise
+        return base64.b64encode(self._read_file(image_path)).decode('utf-8')
+
+    def _optimize_prompt_images(self, prompts):
+        """
+        Runs the image prompts through image_optimizer, if one is set, on its worker pool.
+
+        Parameters:
+            prompts (list): A list of prompt dictionaries.
+
+        Returns:
+            tuple: (prompts, bytes saved). The prompts are a new list in which image prompts
+                hold the optimized bytes; they are returned as is without an optimizer.
+        """
+        if self.image_optimizer is None:
+            return prompts, 0
+        # Images referenced by S3 URI are left to the chat (see BedrockChat.s3_location)
+        indices = [
+            i for i, prompt in enumerate(prompts)
+            if "image" in prompt and not (isinstance(prompt["image"], str) and prompt["image"].startswith("s3://"))
+        ]
+        if not indices:
+            return prompts, 0
+
+        images = []
+        for i in indices:
+            image = prompts[i]["image"]
+            images.append(image if isinstance(image, bytes) else self._read_file(image))
+
+        prompts = list(prompts)
+        bytes_saved = 0
+        for i, (image, _, saved) in zip(indices, self.image_optimizer.optimize_many(images)):
+            prompts[i] = {**prompts[i], "image": image}
+            bytes_saved += saved
+        return prompts, bytes_saved
+
+    async def _aoptimize_prompt_images(self, prompts):
+        """
+        Coroutine counterpart of _optimize_prompt_images, run on the async executor.
+        """
+        if self.image_optimizer is None:
+            return prompts, 0
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_async_executor(), self._optimize_prompt_images, prompts)
+
+    @staticmethod
+    def _file_key(file_path):
+        """
+        Returns a key identifying a file's current content: its path, size and modification time.
+        """
+        stat = os.stat(file_path)
+        return ("path", os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
 
     def _read_file(self, file_path):
         """
         Reads file bytes given a file path.
 
+        Files up to a quarter of attachment_cache_bytes are kept in a shared LRU cache keyed
+        by path, size and modification time, so an unchanged file is only read once.
+
         Parameters:
             file_path (str): The path to the file to read.
 
         Returns:
             bytes: The file content in bytes.
         """
-        try:
-            with open(file_path, "rb") as f:
-                file_bytes = f.read()
-            return file_bytes
-        except Exception:
-            raise
+        key = self._file_key(file_path)
+        cache = BaseChat._attachment_cache
+        with BaseChat._file_cache_lock:
+            file_bytes = cache.get(key)
+            if file_bytes is not None:
+                cache.move_to_end(key)
+                return file_bytes
+
+        with open(file_path, "rb") as f:
+            file_bytes = f.read()
+
+        if len(file_bytes) <= self.attachment_cache_bytes // 4:
+            with BaseChat._file_cache_lock:
+                if key not in cache:
+                    cache[key] = file_bytes
+                    BaseChat._attachment_cache_size += len(file_bytes)
+                while BaseChat._attachment_cache_size > self.attachment_cache_bytes:
+                    _, evicted = cache.popitem(last=False)
+                    BaseChat._attachment_cache_size -= len(evicted)
+        return file_bytes
+
+    @classmethod
+    def _sniff_format(cls, header):
+        """
+        Returns the format of a file from its leading bytes, or None if it is not in MAGIC_NUMBERS.
+        """
+        for offset, signature, file_format in cls.MAGIC_NUMBERS:
+            if header[offset:offset + len(signature)] == signature:
+                return file_format
+        return None
+
+    @staticmethod
+    def _mime_to_format(mime_type):
+        file_format = mime_type.split("/")[-1]
+        return "txt" if "plain" == file_format else file_format
 
     def _get_file_format(self, file):
         """
         Return format of file.
 
+        The leading bytes are matched against MAGIC_NUMBERS first and libmagic is only used
+        for other formats. Results are memoized: files by path, size and modification time,
+        buffers by length and a hash of their first FORMAT_KEY_PREFIX_BYTES bytes.
+
         Parameters:
             file (str or bytes): Path of a file or file as bytes.
 
         Returns:
             str: The file format.
         """
-        try:
-            if isinstance(file, str):
-                file_format = magic.from_file(file, mime=True)
-                file_format = file_format.split("/")[-1]
-                file_format = "txt" if "plain" == file_format else file_format
-                return file_format
-            elif isinstance(file, bytes):
-                file_format = magic.from_buffer(file, mime=True)
-                file_format = file_format.split("/")[-1]
-                file_format = "txt" if "plain" == file_format else file_format
+        if isinstance(file, str):
+            key = self._file_key(file)
+        elif isinstance(file, bytes):
+            prefix = memoryview(file)[:self.FORMAT_KEY_PREFIX_BYTES]
+            key = ("bytes", len(file), hashlib.blake2b(prefix, digest_size=16).digest())
+        else:
+            raise ValueError("Invalid file format: expected a file path or bytes")
+
+        cache = BaseChat._format_cache
+        with BaseChat._file_cache_lock:
+            file_format = cache.get(key)
+            if file_format is not None:
+                cache.move_to_end(key)
                 return file_format
+
+        if isinstance(file, str):
+            with open(file, "rb") as f:
+                header = f.read(16)
+        else:
+            header = file[:16]
+        file_format = self._sniff_format(header)
+        if file_format is None:
+            import magic
+
+            if isinstance(file, str):
+                file_format = self._mime_to_format(magic.from_file(file, mime=True))
             else:
-                print("Invalid file format")
-                raise
-        except Exception:
-            raise
\ No newline at end of file
+                file_format = self._mime_to_format(magic.from_buffer(file, mime=True))
+
+        with BaseChat._file_cache_lock:
+            cache[key] = file_format
+            while len(cache) > self.format_cache_size:
+                cache.popitem(last=False)
+        return file_format
@@ -0,0 +1,320 @@
+import json
+import time
+import tempfile
+from datetime import datetime
+from loguru import logger
+
+
+class BedrockBatchInference:
+    """
+    Runs prompt lists through a Bedrock batch inference (model invocation) job instead of
+    on-demand Converse calls. Intended for large offline workloads: the prompts are written
+    to a JSONL file in S3, one job processes them, and the outputs are read back from S3
+    and matched to their record ids.
+
+    Only text prompts are supported, since batch records use the model's native request
+    body rather than the Converse format. Anthropic Claude and Amazon Nova models are supported.
+
+    Note: Bedrock enforces a minimum number of records per job (see the Bedrock quotas).
+
+    Attributes:
+        bedrockchat (BedrockChat): Supplies the model id, inference parameters and prices.
+        role_arn (str): IAM service role Bedrock assumes to read the input and write the output.
+        s3_input_uri (str): S3 prefix the JSONL input files are written to.
+        s3_output_uri (str): S3 prefix Bedrock writes the job outputs to.
+        price_multiplier (float): Batch price relative to on-demand prices (Bedrock batch is 50% off).
+    """
+    RUNNING_STATUSES = ("Submitted", "Validating", "Scheduled", "InProgress", "Stopping")
+    COMPLETED_STATUSES = ("Completed", "PartiallyCompleted")
+    ANTHROPIC_VERSION = "bedrock-2023-05-31"
+
+    def __init__(self,
+                 bedrockchat,
+                 role_arn,
+                 s3_input_uri,
+                 s3_output_uri,
+                 price_multiplier=0.5,
+                 poll_interval=30,
+                 max_poll_interval=300,
+                 timeout=None,
+                 bedrock_client=None,
+                 s3_helper=None):
+        """
+        Initializes the batch runner. bedrock_client and s3_helper default to the clients of
+        bedrockchat and can be replaced, e.g. by local stubs.
+        """
+        self.bedrockchat = bedrockchat
+        self.role_arn = role_arn
+        self.s3_input_uri = s3_input_uri.rstrip("/")
+        self.s3_output_uri = s3_output_uri.rstrip("/")
+        self.price_multiplier = price_multiplier
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.timeout = timeout
+
+        self.bedrock = bedrock_client or bedrockchat.boto_helper.create_client(service_name="bedrock")
+        self.s3_helper = s3_helper or bedrockchat.s3_helper
+
+        model_id = bedrockchat.model_id
+        if "anthropic." in model_id:
+            self.model_family = "anthropic"
+        elif "amazon.nova" in model_id:
+            self.model_family = "nova"
+        else:
+            raise ValueError(f"Batch inference is not supported for model '{model_id}'. "
+                             "Supported models: Anthropic Claude and Amazon Nova.")
+
+    def _model_input(self, prompts):
+        """
+        Converts a prompt list (as built by the features' _create_prompt_list) into the
+        model-native request body used in batch records.
+        """
+        if not isinstance(prompts, list):
+            raise ValueError('prompts must be a list')
+
+        texts = []
+        system = []
+        for prompt in prompts:
+            if "system" in prompt:
+                system.append(prompt["system"])
+            elif "cache_point" in prompt:
+                # Prompt caching does not apply to batch jobs
+                continue
+            elif "text" in prompt:
+                texts.append(prompt["text"])
+            else:
+                raise ValueError("Batch inference only supports 'text' prompts.")
+
+        chat = self.bedrockchat
+        if self.model_family == "anthropic":
+            model_input = {
+                "anthropic_version": self.ANTHROPIC_VERSION,
+                "max_tokens": chat.max_tokens,
+                "temperature": chat.temperature,
+                "top_p": chat.p,
+                "messages": [{
+                    "role": "user",
+                    "content": [{"type": "text", "text": text} for text in texts]
+                }]
+            }
+            if system:
+                model_input["system"] = "\n".join(system)
+            return model_input
+
+        model_input = {
+            "schemaVersion": "messages-v1",
+            "messages": [{
+                "role": "user",
+                "content": [{"text": text} for text in texts]
+            }],
+            "inferenceConfig": {
+                "maxTokens": chat.max_tokens,
+                "temperature": chat.temperature,
+                "topP": chat.p
+            }
+        }
+        if system:
+            model_input["system"] = [{"text": text} for text in system]
+        return model_input
+
+    def _parse_model_output(self, model_output):
+        """
+        Returns (response_text, input_tokens, output_tokens) from a model-native response body.
+        """
+        if self.model_family == "anthropic":
+            text = "".join(block.get("text", "") for block in model_output.get("content", []))
+            usage = model_output.get("usage", {})
+            return text, usage.get("input_tokens"), usage.get("output_tokens")
+
+        content = model_output.get("output", {}).get("message", {}).get("content", [])
+        text = "".join(block.get("text", "") for block in content)
+        usage = model_output.get("usage", {})
+        return text, usage.get("inputTokens"), usage.get("outputTokens")
+
+    def _build_result(self, model_output):
+        """
+        Builds a response dict with the same fields as BedrockChat.invoke, priced at the batch rate.
+        """
+        chat = self.bedrockchat
+        response_text, inputTokens, outputTokens = self._parse_model_output(model_output)
+
+        # Note: Because prices are per 1,000 tokens, we divide by 1,000
+        input_token_cost = (chat.input_tokens_price * inputTokens * self.price_multiplier) / 1000 if inputTokens else 0
+        output_token_cost = (chat.output_tokens_price * outputTokens * self.price_multiplier) / 1000 if outputTokens else 0
+
+        return {
+            "response_text": response_text,
+            "inputTokens": inputTokens,
+            "outputTokens": outputTokens,
+            "time_to_first_token": None,  # Not available for batch jobs
+            "time_to_last_token": None,
+            "time_per_output_token": None,
+            "input_token_cost": input_token_cost,
+            "output_token_cost": output_token_cost,
+            "total_cost": input_token_cost + output_token_cost,
+            "model_id": chat.model_id,
+            "provider": chat.get_provider()
+        }
+
+    def submit(self, prompt_lists, record_ids=None, job_name=None):
+        """
+        Writes the prompt lists to a JSONL file in S3 and submits a model invocation job.
+
+        Parameters:
+            prompt_lists (iterable): Prompt lists, each one what BedrockChat.invoke() accepts.
+            record_ids (iterable): Optional ids for the records. Defaults to the input position.
+            job_name (str): Optional job name. Defaults to a timestamped name.
+
+        Returns:
+            str: The ARN of the submitted job.
+        """
+        job_name = job_name or f"avahi-batch-{datetime.utcnow().strftime('%Y%m%d%H%M%S%f')}"
+        input_uri = f"{self.s3_input_uri}/{job_name}.jsonl"
+
+        ids = iter(record_ids) if record_ids is not None else None
+        count = 0
+        # Spill to disk past 64MB so very large jobs are not held in memory
+        with tempfile.SpooledTemporaryFile(max_size=64 * 1024 * 1024) as jsonl:
+            for index, prompts in enumerate(prompt_lists):
+                record_id = str(next(ids)) if ids is not None else f"{index:011d}"
+                record = {"recordId": record_id, "modelInput": self._model_input(prompts)}
+                jsonl.write(json.dumps(record).encode("utf-8") + b"\n")
+                count += 1
+            jsonl.seek(0)
+            self.s3_helper.upload_fileobj(jsonl, input_uri, content_type="application/jsonl")
+
+        response = self.bedrockchat.boto_helper.retry_policy.execute(
+            lambda: self.bedrock.create_model_invocation_job(
+                jobName=job_name,
+                roleArn=self.role_arn,
+                modelId=self.bedrockchat.model_id,
+                inputDataConfig={
+                    "s3InputDataConfig": {"s3Uri": input_uri, "s3InputFormat": "JSONL"}
+                },
+                outputDataConfig={
+                    "s3OutputDataConfig": {"s3Uri": f"{self.s3_output_uri}/"}
+                },
+            )
+        )
+        job_arn = response["jobArn"]
+        logger.info(f"Submitted batch inference job {job_arn} with {count} records")
+        return job_arn
+
+    def wait(self, job_arn):
+        """
+        Polls the job with exponential backoff until it finishes.
+
+        Returns:
+            dict: The final get_model_invocation_job response.
+
+        Raises:
+            RuntimeError: If the job fails, is stopped or expires.
+            TimeoutError: If the job does not finish within the timeout.
+        """
+        start_t = time.monotonic()
+        interval = self.poll_interval
+        while True:
+            job = self.bedrockchat.boto_helper.retry_policy.execute(
+                lambda: self.bedrock.get_model_invocation_job(jobIdentifier=job_arn)
+            )
+            status = job["status"]
+            if status in self.COMPLETED_STATUSES:
+                logger.info(f"Batch inference job {job_arn} finished with status {status}")
+                return job
+            if status not in self.RUNNING_STATUSES:
+                raise RuntimeError(f"Batch inference job {job_arn} ended with status {status}: {job.get('message', '')}")
+            if self.timeout is not None and time.monotonic() - start_t + interval > self.timeout:
+                raise TimeoutError(f"Batch inference job {job_arn} did not finish within {self.timeout} seconds")
+
+            logger.debug(f"Batch inference job {job_arn} is {status}, polling again in {interval}s")
+            time.sleep(interval)
+            interval = min(interval * 2, self.max_poll_interval)
+
+    def iter_results(self, job):
+        """
+        Streams the parsed outputs of a finished job.
+
+        Parameters:
+            job (dict): The get_model_invocation_job response returned by wait().
+
+        Yields:
+            dict: {"recordId", "result", "error"} per record, where "result" has the same fields
+                  as BedrockChat.invoke and "error" is the record's error message (or None).
+        """
+        job_id = job["jobArn"].split("/")[-1]
+        input_uri = job["inputDataConfig"]["s3InputDataConfig"]["s3Uri"]
+        output_prefix = job["outputDataConfig"]["s3OutputDataConfig"]["s3Uri"].rstrip("/")
+        output_uri = f"{output_prefix}/{job_id}/{input_uri.split('/')[-1]}.out"
+
+        for line in self.s3_helper.iter_s3_lines(output_uri):
+            record = json.loads(line)
+            if "modelOutput" in record:
+                yield {"recordId": record["recordId"], "result": self._build_result(record["modelOutput"]), "error": None}
+            else:
+                error = record.get("error", {})
+                message = error.get("errorMessage", str(error)) if isinstance(error, dict) else str(error)
+                yield {"recordId": record["recordId"], "result": None, "error": message}
+
+    def invoke_batch(self, prompt_lists, record_ids=None, job_name=None):
+        """
+        Submits the prompt lists as one job, waits for it and streams the results back.
+
+        Yields:
+            dict: One {"recordId", "result", "error"} chunk per record, followed by a final
+                  {"metadata": {...}} chunk with the job details and aggregate token and cost totals.
+        """
+        start_t = time.perf_counter()
+        job_arn = self.submit(prompt_lists, record_ids=record_ids, job_name=job_name)
+        job = self.wait(job_arn)
+
+        stats = {
+            "requests": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "inputTokens": 0,
+            "outputTokens": 0,
+            "input_token_cost": 0.0,
+            "output_token_cost": 0.0,
+            "total_cost": 0.0,
+        }
+        for item in self.iter_results(job):
+            stats["requests"] += 1
+            result = item["result"]
+            if result is None:
+                stats["failed"] += 1
+            else:
+                stats["succeeded"] += 1
+                stats["inputTokens"] += result["inputTokens"] or 0
+                stats["outputTokens"] += result["outputTokens"] or 0
+                stats["input_token_cost"] += result["input_token_cost"]
+                stats["output_token_cost"] += result["output_token_cost"]
+                stats["total_cost"] += result["total_cost"]
+            yield item
+
+        yield {
+            "metadata": {
+                **stats,
+                "job_arn": job_arn,
+                "status": job["status"],
+                "wall_time": time.perf_counter() - start_t,
+                "model_id": self.bedrockchat.model_id,
+                "provider": self.bedrockchat.get_provider(),
+            }
+        }
+
+    def invoke_batch_parsed(self, prompt_lists, record_ids=None, job_name=None):
+        """
+        Wraps the invoke_batch method to collect every result and the aggregate stats.
+
+        Returns:
+            dict: {"results": [{"recordId", "result", "error"}, ...], **job details and totals}.
+        """
+        results = []
+        metadata = {}
+        for chunk in self.invoke_batch(prompt_lists, record_ids=record_ids, job_name=job_name):
+            if "metadata" in chunk:
+                metadata = chunk["metadata"]
+            else:
+                results.append(chunk)
+
+        return {"results": results, **metadata}
@@ -1,7 +1,11 @@
 import time
 import json
 import os
+import itertools
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from loguru import logger
 from .base_chat import BaseChat
+from .token_estimator import TokenEstimator, ContextWindowExceededError
 from avahiplatform.helpers.connectors.s3_helper import S3Helper
 
 
@@ -9,6 +13,10 @@ class BedrockChat(BaseChat):
     """
     A class to handle text and image queries using an LLM with support for streaming responses.
 
+    The async methods (ainvoke, ainvoke_stream, ainvoke_stream_parsed) are inherited from
+    BaseChat: boto3 has no async transport, so Converse calls run on a thread pool bounded
+    by max_async_workers.
+
     Attributes:
         model_id (str): The ID of the LLM model to be used for responses.
         max_tokens (int): The maximum number of tokens to generate.
@@ -20,7 +28,50 @@ class BedrockChat(BaseChat):
         region_name (str): AWS region name.
         input_tokens_price (float): Price per 1,000 input tokens
         output_tokens_price (float): Price per 1,000 output tokens
+        response_cache (ResponseCache): Optional cache of invoke() responses, keyed on the request content
+            (and, for media passed as s3Location, on the version of the S3 object)
+        prompt_caching (bool): Add Bedrock cache points after the system prompt, the last large
+            attachment and the earlier turns of a multi-turn conversation, so a static prefix is
+            served from the prompt cache on later calls.
+            Only enable it for models that support prompt caching.
+        cache_read_price_multiplier (float): Price of cache read tokens relative to input tokens
+        cache_write_price_multiplier (float): Price of cache write tokens relative to input tokens
+        admission_scheduler (AdmissionScheduler): Optional RPM/TPM admission control. Defaults to
+            the scheduler of boto_helper, shared by every chat using that helper.
+        hedging_policy (HedgingPolicy): Optional hedged requests: a call still running at a deadline
+            learned from recent latencies (time to first token when streaming) is duplicated and
+            the first response wins. Hedges are not counted against the admission scheduler.
+        token_estimator (TokenEstimator): Local input token estimator, calibrated against the usage
+            of every call; used for admission control, cost projections and pre-flight checks.
+        context_window (int): Context window of the model in tokens. Defaults to the known window
+            of the model family (None if unknown, which disables the pre-flight check).
+        preflight_check (bool): Raise ContextWindowExceededError before calling the model when the
+            estimated input plus max_tokens does not fit the context window. Requests with
+            attachments, whose estimate is byte-based, are only rejected when they exceed the
+            window by PREFLIGHT_ATTACHMENT_MARGIN.
+        image_optimizer (ImageOptimizer): Optional downscaling and recompression of image prompts
+            before they are sent; the bytes saved are reported as "image_bytes_saved".
+        s3_location (bool): Pass media given as S3 URIs to the model as s3Location sources instead
+            of downloading them. Defaults to on for the models in S3_LOCATION_MODELS (Amazon Nova);
+            for other models, or unknown file extensions, the objects are downloaded.
     """
+    # How far the byte-based estimate of a request with attachments may exceed the context
+    # window before the pre-flight check rejects it
+    PREFLIGHT_ATTACHMENT_MARGIN = 1.5
+    # Models that read image, document and video sources from S3 (s3Location)
+    S3_LOCATION_MODELS = ("amazon.nova",)
+    # Converse formats by file extension, for media referenced by S3 URI
+    S3_MEDIA_FORMATS = {
+        "image": {"jpg": "jpeg", "jpeg": "jpeg", "png": "png", "gif": "gif", "webp": "webp"},
+        "document": {"pdf": "pdf", "csv": "csv", "doc": "doc", "docx": "docx", "xls": "xls", "xlsx": "xlsx",
+                     "html": "html", "txt": "txt", "md": "md"},
+        "video": {"mp4": "mp4", "mov": "mov", "mkv": "mkv", "webm": "webm", "flv": "flv", "mpeg": "mpeg",
+                  "mpg": "mpg", "wmv": "wmv", "3gp": "three_gp"},
+    }
+    # Bedrock allows at most four cache points per request
+    MAX_CACHE_POINTS = 4
+    CACHE_POINT = {"cachePoint": {"type": "default"}}
+
     def __init__(self, 
                  model_id,
                  boto_helper,
@@ -28,7 +79,18 @@ class BedrockChat(BaseChat):
                  temperature=0.6, 
                  p=0.5,
                  input_tokens_price=None,
-                 output_tokens_price=None):
+                 output_tokens_price=None,
+                 response_cache=None,
+                 prompt_caching=False,
+                 cache_read_price_multiplier=None,
+                 cache_write_price_multiplier=None,
+                 admission_scheduler=None,
+                 hedging_policy=None,
+                 token_estimator=None,
+                 context_window=None,
+                 preflight_check=True,
+                 image_optimizer=None,
+                 s3_location=None):
         """
         Initializes the BedrockChat with the specified model ID, parameters, and optional custom prices.
         """
@@ -38,6 +100,18 @@ class BedrockChat(BaseChat):
         self.max_tokens = max_tokens
         self.temperature = temperature
         self.p = p
+        self.response_cache = response_cache
+        self.prompt_caching = prompt_caching
+        self.admission_scheduler = admission_scheduler or getattr(boto_helper, "admission_scheduler", None)
+        self.hedging_policy = hedging_policy
+        self.token_estimator = token_estimator or TokenEstimator()
+        self.context_window = context_window or self.token_estimator.context_window(model_id)
+        self.preflight_check = preflight_check
+        self.image_optimizer = image_optimizer
+        self.s3_location = (
+            s3_location if s3_location is not None
+            else any(model in model_id for model in self.S3_LOCATION_MODELS)
+        )
 
         # Get model name
         self.model_details = self._get_model_details()
@@ -57,6 +131,18 @@ class BedrockChat(BaseChat):
             else model_pricing.get("output_tokens_price", 0.0)
         )
 
+        # Cached prompt tokens are billed relative to the input price: Nova charges nothing
+        # extra to write the cache and 25% to read it, Claude 125% and 10%
+        is_nova = "nova" in self.model_id
+        self.cache_read_price_multiplier = (
+            cache_read_price_multiplier if cache_read_price_multiplier is not None
+            else (0.25 if is_nova else 0.1)
+        )
+        self.cache_write_price_multiplier = (
+            cache_write_price_multiplier if cache_write_price_multiplier is not None
+            else (1.0 if is_nova else 1.25)
+        )
+
         # Create Bedrock client
         self.bedrock = self._create_client()
         self.s3_client = self.boto_helper.create_client(service_name="s3")
@@ -96,21 +182,17 @@ class BedrockChat(BaseChat):
     def _get_model_details(self):
         """
         Retrieves detailed information about the foundation model using the Bedrock (non-runtime) service.
+        Details are served from the BotoHelper model details cache after the first lookup.
 
         Returns:
             dict: The model details retrieved from the Bedrock service.
         """
-        # Create a separate client for the Bedrock control plane (non-runtime) API
-        bedrock_control_client = self.boto_helper.create_client(service_name="bedrock")
         try:
             if self.model_id.startswith("us."):
                 model_id = self.model_id.split("us.")[1]
             else:
                 model_id = self.model_id
-            response = bedrock_control_client.get_foundation_model(
-                modelIdentifier=model_id
-            )
-            return response["modelDetails"]
+            return self.boto_helper.get_model_details(model_id)
         except Exception as e:
             raise
 
@@ -118,7 +200,11 @@ class BedrockChat(BaseChat):
         """
         Prepares the request payload for the model invocation based on the given prompts.
 
-        Supports keys: "text", "image", "document", "video"
+        Supports keys: "text", "image", "document", "video". "system" prompts are skipped here
+        (see _prepare_system) and {"cache_point": True} marks the end of a cacheable prefix.
+        A prompt may carry a "role" ("user" by default, or "assistant"): consecutive prompts of
+        the same role form one message, so a multi-turn conversation is sent as alternating
+        user and assistant messages.
 
         Parameters:
             prompts (list): A list of prompt dictionaries. Each prompt should be a dict with either:
@@ -126,6 +212,8 @@ class BedrockChat(BaseChat):
                             - "image": str (path to the image file)
                             - "documet": str (path to the document file)
                             - "video": str (path to the video file)
+                            - "s3_document": str (S3 URI of the document)
+                            Images, documents and videos may also be given as bytes or as an S3 URI.
 
         Returns:
             list: A list representing the conversation for the LLM, formatted as required by the Bedrock API.
@@ -133,8 +221,30 @@ class BedrockChat(BaseChat):
         Raises:
             ValueError: If a prompt does not contain a "text", "image", "document" or "video" key.
         """
+        conversation = []
         messages = []
+        role = "user"
+        in_system = False
+        last_attachment = None
         for prompt in prompts:
+            if "system" in prompt:
+                in_system = True
+                continue
+            if "cache_point" in prompt:
+                # A cache point directly after a system prompt belongs to the system blocks
+                if prompt["cache_point"] and not in_system and messages:
+                    messages.append(dict(self.CACHE_POINT))
+                continue
+            in_system = False
+
+            if prompt.get("role", "user") != role:
+                # A new turn of the conversation
+                if messages:
+                    conversation.append({"role": role, "content": messages})
+                messages = []
+                last_attachment = None
+                role = prompt.get("role", "user")
+
             if "text" in prompt:
                 # Text prompt
                 message = {
@@ -142,63 +252,73 @@ class BedrockChat(BaseChat):
                 }
             elif "image" in prompt:
                 # Image prompt
-                image_format = self._get_file_format(prompt["image"])
-                if isinstance(prompt["image"], str):   
-                    encoded_image = self._read_file(prompt["image"])
-                elif isinstance(prompt["image"], bytes):
-                    encoded_image = prompt["image"]
+                if self._is_s3_uri(prompt["image"]):
+                    image_format, image_source = self._s3_media_source("image", prompt["image"])
+                else:
+                    image_format = self._get_file_format(prompt["image"])
+                    if isinstance(prompt["image"], str):
+                        encoded_image = self._read_file(prompt["image"])
+                    elif isinstance(prompt["image"], bytes):
+                        encoded_image = prompt["image"]
+                    image_source = {"bytes": encoded_image}
                 message = {
                     "image": {
                         "format": image_format,
-                        "source": {
-                            "bytes": encoded_image
-                        }
+                        "source": image_source
                     }
                 }
             elif "document" in prompt:
                 # Document prompt
                 doc_name = "document"
-                doc_format = self._get_file_format(prompt["document"])
-                if isinstance(prompt["document"], str):
-                    doc_bytes = self._read_file(prompt["document"])
-                elif isinstance(prompt["document"], bytes):
-                    doc_bytes = prompt["document"]
+                if self._is_s3_uri(prompt["document"]):
+                    doc_format, doc_source = self._s3_media_source("document", prompt["document"])
+                else:
+                    doc_format = self._get_file_format(prompt["document"])
+                    if isinstance(prompt["document"], str):
+                        doc_bytes = self._read_file(prompt["document"])
+                    elif isinstance(prompt["document"], bytes):
+                        doc_bytes = prompt["document"]
+                    doc_source = {"bytes": doc_bytes}
                 message = {
                     "document": {
                         "format": doc_format,
                         "name": doc_name,
-                        "source": {
-                            "bytes": doc_bytes
-                        }
+                        "source": doc_source
                     }
                 }
             elif "s3_document" in prompt:
                 # Document prompt
                 doc_name = "document"
-                if isinstance(prompt["s3_document"], str):
-                    doc_bytes = self.s3_helper.read_s3_file(prompt["s3_document"])
+                doc_format = self._s3_location_format("document", prompt["s3_document"])
+                if doc_format is not None:
+                    # The model reads the document from S3 itself
+                    doc_source = {"s3Location": {"uri": prompt["s3_document"]}}
+                else:
+                    # Otherwise send its extracted text
+                    doc_format = "txt"
+                    doc_source = {"bytes": self.s3_helper.read_s3_file(prompt["s3_document"])}
                 message = {
                     "document": {
-                        "format": "txt",
+                        "format": doc_format,
                         "name": doc_name,
-                        "source": {
-                            "bytes": doc_bytes
-                        }
+                        "source": doc_source
                     }
                 }
             elif "video" in prompt:
                 # Video prompt
-                video_format = self._get_file_format(prompt["video"])
-                if isinstance(prompt["video"], str):
-                    video_bytes = self._read_file(prompt["video"])
-                elif isinstance(prompt["video"], bytes):
-                    video_bytes = prompt["video"]
+                if self._is_s3_uri(prompt["video"]):
+                    video_format, video_source = self._s3_media_source("video", prompt["video"])
+                else:
+                    video_format = self._get_file_format(prompt["video"])
+                    if isinstance(prompt["video"], str):
+                        video_bytes = self._read_file(prompt["video"])
+                    elif isinstance(prompt["video"], bytes):
+                        video_bytes = prompt["video"]
+                    video_source = {"bytes": video_bytes}
                 message = {
                     "video": {
                         "format": video_format,
-                        "source": {
-                            "bytes": video_bytes
-                        }
+                        "source": video_source
                     }
                 }
             else:
@@ -206,60 +326,255 @@ class BedrockChat(BaseChat):
                     "Invalid prompt. Each prompt must include one of: 'text', 'image', 's3_document', 'document', or 'video'."
                 )
             messages.append(message)
+            if "text" not in message:
+                last_attachment = len(messages)
+
+        if self.prompt_caching and last_attachment is not None:
+            # Cache everything up to the last large attachment, so only the trailing text varies
+            if last_attachment == len(messages) or "cachePoint" not in messages[last_attachment]:
+                messages.insert(last_attachment, dict(self.CACHE_POINT))
+        if self.prompt_caching and conversation and "cachePoint" not in conversation[-1]["content"][-1]:
+            # Cache the earlier turns of a multi-turn conversation, which the next turn repeats
+            conversation[-1]["content"].append(dict(self.CACHE_POINT))
         # The Bedrock API expects the conversation in a list with role/content
-        conversation = [
+        conversation.append(
             {
-                "role": "user", 
+                "role": role,
                 "content": messages
             }
-        ]
+        )
         return conversation
 
-    def _invoke_model(self, messages):
+    @staticmethod
+    def _is_s3_uri(value):
+        return isinstance(value, str) and value.startswith("s3://")
+
+    def _s3_location_format(self, kind, uri):
+        """
+        Returns the Converse format of the media at an S3 URI if it can be passed to the model
+        as an s3Location source, i.e. if s3_location is on and the file extension is known.
+        """
+        if not self.s3_location:
+            return None
+        extension = os.path.splitext(uri)[1].lower().lstrip(".")
+        return self.S3_MEDIA_FORMATS[kind].get(extension)
+
+    def _s3_media_source(self, kind, uri):
+        """
+        Builds the Converse source of an image, document or video referenced by an S3 URI.
+
+        Parameters:
+            kind (str): "image", "document" or "video".
+            uri (str): The S3 URI of the media.
+
+        Returns:
+            tuple: (format, source). The source is an s3Location when the model supports it,
+                   so the media never passes through this process; otherwise the object is
+                   downloaded and sent as bytes.
+        """
+        media_format = self._s3_location_format(kind, uri)
+        if media_format is not None:
+            return media_format, {"s3Location": {"uri": uri}}
+        media_bytes = self.s3_helper.read_s3_bytes(uri)
+        return self._get_file_format(media_bytes), {"bytes": media_bytes}
+
+    def _prepare_system(self, prompts):
+        """
+        Collects the {"system": str} prompts into the Converse system blocks.
+
+        Parameters:
+            prompts (list): A list of prompt dictionaries.
+
+        Returns:
+            list or None: The system content blocks, or None if there is no system prompt.
+        """
+        system = []
+        in_system = False
+        for prompt in prompts:
+            if "system" in prompt:
+                system.append({"text": prompt["system"]})
+                in_system = True
+            elif "cache_point" in prompt:
+                if prompt["cache_point"] and in_system and system and "cachePoint" not in system[-1]:
+                    system.append(dict(self.CACHE_POINT))
+            else:
+                in_system = False
+
+        if not system:
+            return None
+        if self.prompt_caching and "cachePoint" not in system[-1]:
+            system.append(dict(self.CACHE_POINT))
+        return system
+
+    def _check_cache_points(self, messages, system):
+        """
+        Drops the cache points beyond Bedrock's per-request limit, keeping the earliest ones.
+        """
+        remaining = self.MAX_CACHE_POINTS
+        for blocks in [system or []] + [message["content"] for message in messages]:
+            for block in list(blocks):
+                if "cachePoint" in block:
+                    if remaining:
+                        remaining -= 1
+                    else:
+                        blocks.remove(block)
+
+    def _converse_kwargs(self, messages, system=None):
+        """
+        Builds the arguments shared by converse and converse_stream.
+        """
+        kwargs = {
+            "modelId": self.model_id,
+            "messages": messages,
+            "inferenceConfig": self._inference_config(),
+        }
+        if system:
+            kwargs["system"] = system
+        return kwargs
+
+    def _select_region(self):
+        """
+        Returns the region a new request is sent to. Subclasses routing across regions override it.
+        """
+        return self.bedrock.meta.region_name
+
+    def _client_for(self, region_name=None):
+        """
+        Returns the bedrock-runtime client for a region returned by _select_region.
+        """
+        return self.bedrock
+
+    def _hedge_region(self, region_name):
+        """
+        Returns the region a hedged duplicate of a request sent to region_name goes to.
+        """
+        return region_name
+
+    def _invoke_hedged(self, invoke_fn, messages, system, retry_stats, region_name, kind,
+                       estimated_input_tokens=0):
+        """
+        Calls invoke_fn (_invoke_model or _invoke_model_streaming) under the hedging policy.
+        The retry stats of the winning call are copied to retry_stats, with "hedged" and "hedge_won".
+        """
+        if self.hedging_policy is None:
+            return invoke_fn(messages, system, retry_stats, region_name)
+
+        stats = [dict(retry_stats), dict(retry_stats)]
+        response, hedged, hedge_won = self.hedging_policy.run(
+            lambda: invoke_fn(messages, system, stats[0], region_name),
+            lambda: invoke_fn(messages, system, stats[1], self._hedge_region(region_name)),
+            kind=kind,
+            on_loser=lambda loser: self._discard_response(loser, estimated_input_tokens)
+        )
+        retry_stats.update(stats[1] if hedge_won else stats[0])
+        retry_stats["hedged"] = hedged
+        retry_stats["hedge_won"] = hedge_won
+        return response
+
+    def _discard_response(self, response, estimated_input_tokens=0):
+        """
+        Disposes of the response of a losing hedged call, closing its stream if it has one,
+        and adds its tokens and cost to the hedging policy's waste totals.
+        """
+        event_stream = response.get("event_stream")
+        if event_stream is not None:
+            event_stream.close()
+            # A closed stream is billed for its input and the few tokens generated before closing
+            usage = {"inputTokens": estimated_input_tokens}
+        else:
+            usage = response.get("usage", {})
+        tokens = (usage.get("inputTokens") or 0) + (usage.get("outputTokens") or 0)
+        self.hedging_policy.record_waste(tokens, self._compute_costs(usage)["total_cost"])
+
+    def _hedge_waste(self, retry_stats, estimated_input_tokens, output_tokens):
+        """
+        Estimates the tokens and cost of the losing call of a hedged request, which are billed
+        but not part of its usage: its input, plus (for a non-streaming call, which cannot be
+        cancelled) about as many output tokens as the winner.
+
+        Returns:
+            dict: "hedge_wasted_tokens" and "hedge_wasted_cost" (0 when no hedge was sent).
+        """
+        if not retry_stats.get("hedged"):
+            return {"hedge_wasted_tokens": 0, "hedge_wasted_cost": 0.0}
+        usage = {"inputTokens": estimated_input_tokens, "outputTokens": output_tokens or 0}
+        return {
+            "hedge_wasted_tokens": usage["inputTokens"] + usage["outputTokens"],
+            "hedge_wasted_cost": self._compute_costs(usage)["total_cost"],
+        }
+
+    def _execute_with_retries(self, call, retry_stats=None):
+        """
+        Runs call() under the boto_helper retry policy.
+
+        Parameters:
+            call (callable): Makes the Bedrock call.
+            retry_stats (dict): Optional dict receiving the "retries" and "retry_backoff_time" counters.
+
+        Returns:
+            The result of call().
+        """
+        return self.boto_helper.retry_policy.execute(call, retry_stats)
+
+    def _invoke_model(self, messages, system=None, retry_stats=None, region_name=None):
         """
         Invokes the LLM model with the given request and returns the response.
+        Throttled and transiently failing calls are retried by the boto_helper retry policy.
 
         Parameters:
             messages (List): A List representing the conversation for the LLM.
+            system (List): Optional system content blocks, as built by _prepare_system.
+            retry_stats (dict): Optional dict receiving the "retries" and "retry_backoff_time" counters.
+            region_name (str): The region chosen by _select_region.
 
         Returns:
             dict: The response from the LLM model.
         """
+        kwargs = self._converse_kwargs(messages, system)
+        client = self._client_for(region_name)
         try:
-            response = self.bedrock.converse(
-                modelId=self.model_id,
-                messages=messages,
-                inferenceConfig={
-                    "maxTokens": self.max_tokens,
-                    "temperature": self.temperature,
-                    "topP": self.p
-                },
-            )
+            response = self._execute_with_retries(lambda: client.converse(**kwargs), retry_stats)
             return response
         except Exception as e:
             raise
 
-    def _invoke_model_streaming(self, messages):
+    def _invoke_model_streaming(self, messages, system=None, retry_stats=None, region_name=None):
         """
         Invokes the LLM model with the given request and returns a streaming_response generator.
 
+        The call is retried by the boto_helper retry policy only until the first token arrives:
+        the events preceding it are read ahead, so throttling reported at the start of the
+        stream is retried too, while an error after the first token is raised to the caller.
+
         Parameters:
             messages (List): A List representing the conversation for the LLM.
+            system (List): Optional system content blocks, as built by _prepare_system.
+            retry_stats (dict): Optional dict receiving the "retries" and "retry_backoff_time" counters.
+            region_name (str): The region chosen by _select_region.
 
         Returns:
             dict: A dictionary containing a "stream" key that yields streaming chunks.
         """
+        kwargs = self._converse_kwargs(messages, system)
+        client = self._client_for(region_name)
+
+        def open_stream():
+            response = client.converse_stream(**kwargs)
+            events = iter(response["stream"])
+            read_ahead = []
+            for event in events:
+                read_ahead.append(event)
+                if "contentBlockDelta" in event or "metadata" in event:
+                    break
+            return response, read_ahead, events
+
         try:
-            streaming_response = self.bedrock.converse_stream(
-                modelId=self.model_id,
-                messages=messages,
-                inferenceConfig={
-                    "maxTokens": self.max_tokens,
-                    "temperature": self.temperature,
-                    "topP": self.p
-                },
-            )
-            return streaming_response
+            streaming_response, read_ahead, events = self._execute_with_retries(open_stream, retry_stats)
+            return {
+                **streaming_response,
+                "stream": itertools.chain(read_ahead, events),
+                "event_stream": streaming_response["stream"]
+            }
         except Exception as e:
             raise
 
@@ -273,6 +588,8 @@ class BedrockChat(BaseChat):
                             - "image": str (path to the image file)
                             - "documet": str (path to the document file)
                             - "video": str (path to the video file)
+                            - "system": str (sent as the Converse system prompt)
+                            - "cache_point": True (ends a cacheable prefix)
 
         Returns:
             dict: A structured response containing the LLM's output and metrics.
@@ -281,11 +598,33 @@ class BedrockChat(BaseChat):
             raise ValueError('prompts must be a list')
 
         # Prepare the request
+        prompts, image_bytes_saved = self._optimize_prompt_images(prompts)
         messages = self._prepare_request(prompts)
+        system = self._prepare_system(prompts)
+        self._check_cache_points(messages, system)
+
+        retry_stats = {"retries": 0, "retry_backoff_time": 0.0}
+        cache_key = None
+        if self.response_cache is not None:
+            lookup_t = time.perf_counter()
+            cache_key = self._cache_key(messages, system)
+            cached = self.response_cache.get(cache_key) if cache_key is not None else None
+            if cached is not None:
+                return self._cached_response(cached, time.perf_counter() - lookup_t)
 
-        # Invoke the model and get the response
+        # Check the request fits, wait for RPM/TPM capacity, then invoke the model and get the response
+        estimated_input_tokens = self._preflight(messages, system)
+        region_name = self._select_region()
+        reservation = self._admit(estimated_input_tokens, region_name)
+        # Latencies are measured from admission; the time queued for capacity is admission_wait_time
         start_t = time.perf_counter()
-        response = self._invoke_model(messages)
+        try:
+            response = self._invoke_hedged(
+                self._invoke_model, messages, system, retry_stats, region_name, "invoke", estimated_input_tokens
+            )
+        except Exception:
+            self._settle(reservation, None)
+            raise
         time_to_last_token = time.perf_counter() - start_t
         
         # Extract the text from the response
@@ -295,12 +634,9 @@ class BedrockChat(BaseChat):
         model_usage = response.get("usage", {})
         inputTokens = model_usage.get("inputTokens")
         outputTokens = model_usage.get("outputTokens")
-        
-        # Compute costs
-        # Note: Because prices are per 1,000 tokens, we divide by 1,000
-        input_token_cost = (self.input_tokens_price * inputTokens) / 1000 if inputTokens else 0
-        output_token_cost = (self.output_tokens_price * outputTokens) / 1000 if outputTokens else 0
-        total_cost = input_token_cost + output_token_cost
+        costs = self._compute_costs(model_usage)
+        self._settle(reservation, model_usage)
+        self._calibrate(messages, system, model_usage)
 
         # Determine which model was actually used
         if "trace" in response:
@@ -308,134 +644,580 @@ class BedrockChat(BaseChat):
         else:
             model_id = self.model_id
 
-        return {
+        result = {
             "response_text": response_text, 
             "inputTokens": inputTokens,
             "outputTokens": outputTokens, 
             "time_to_first_token": None,  # Not measured here
             "time_to_last_token": time_to_last_token,
             "time_per_output_token": None,
+            "cacheReadInputTokens": costs["cache_read_input_tokens"],
+            "cacheWriteInputTokens": costs["cache_write_input_tokens"],
+            "cache_read_token_cost": costs["cache_read_token_cost"],
+            "cache_write_token_cost": costs["cache_write_token_cost"],
+            "input_token_cost": costs["input_token_cost"],
+            "output_token_cost": costs["output_token_cost"],
+            "total_cost": costs["total_cost"],
+            "retries": retry_stats["retries"],
+            "retry_backoff_time": retry_stats["retry_backoff_time"],
+            "admission_wait_time": reservation.wait_time if reservation else 0.0,
+            "estimated_input_tokens": estimated_input_tokens,
+            "model_id": model_id,
+            "provider": self.get_provider(retry_stats.get("region_name", region_name))
+        }
+
+        if cache_key is not None:
+            self.response_cache.set(cache_key, result)
+            result["cache_hit"] = False
+            result["saved_cost"] = 0.0
+        if self.hedging_policy is not None:
+            result["hedged"] = retry_stats["hedged"]
+            result["hedge_won"] = retry_stats["hedge_won"]
+            result.update(self._hedge_waste(retry_stats, estimated_input_tokens, outputTokens))
+        if self.image_optimizer is not None:
+            result["image_bytes_saved"] = image_bytes_saved
+
+        return result
+
+    def estimate_tokens(self, prompts):
+        """
+        Estimates the size and cost of a request locally, without calling the model.
+
+        Parameters:
+            prompts (list): A list of prompt dictionaries, as accepted by invoke().
+
+        Returns:
+            dict: The estimated input tokens, max_tokens, the context window, whether the request
+                  fits it, and the projected input cost and maximum total cost.
+        """
+        if not isinstance(prompts, list):
+            raise ValueError('prompts must be a list')
+
+        messages = self._prepare_request(prompts)
+        system = self._prepare_system(prompts)
+        input_tokens = self.token_estimator.estimate_messages(self.model_id, messages, system)
+        # Note: Because prices are per 1,000 tokens, we divide by 1,000
+        input_token_cost = (self.input_tokens_price * input_tokens) / 1000
+        max_output_token_cost = (self.output_tokens_price * self.max_tokens) / 1000
+        return {
+            "input_tokens": input_tokens,
+            "max_output_tokens": self.max_tokens,
+            "context_window": self.context_window,
+            "fits_context_window": self.context_window is None or input_tokens + self.max_tokens <= self.context_window,
+            "input_token_cost": input_token_cost,
+            "max_output_token_cost": max_output_token_cost,
+            "max_total_cost": input_token_cost + max_output_token_cost,
+        }
+
+    def _preflight(self, messages, system=None):
+        """
+        Estimates the input tokens of a prepared request and checks that it fits the context window.
+
+        Returns:
+            int: The estimated input tokens.
+
+        Raises:
+            ContextWindowExceededError: If preflight_check is on and the request would not fit.
+        """
+        estimated, text_only = self.token_estimator.estimate_request(self.model_id, messages, system)
+        if self.preflight_check and self.context_window:
+            limit = self.context_window if text_only else self.context_window * self.PREFLIGHT_ATTACHMENT_MARGIN
+            if estimated + self.max_tokens > limit:
+                raise ContextWindowExceededError(self.model_id, estimated, self.max_tokens, self.context_window)
+        return estimated
+
+    def _calibrate(self, messages, system, usage):
+        """
+        Feeds the input tokens Bedrock reported back into the token estimator.
+        """
+        input_tokens = ((usage.get("inputTokens") or 0) + (usage.get("cacheReadInputTokens") or 0)
+                        + (usage.get("cacheWriteInputTokens") or 0))
+        self.token_estimator.observe(self.model_id, messages, system, input_tokens)
+
+    def _admit(self, estimated_input_tokens, region_name=None):
+        """
+        Waits until the admission scheduler has capacity for the request in the region and reserves it.
+
+        Returns:
+            Reservation or None: The reservation, or None if no scheduler is configured.
+        """
+        if self.admission_scheduler is None:
+            return None
+        estimated = self.admission_scheduler.estimate_tokens(estimated_input_tokens, self.max_tokens)
+        return self.admission_scheduler.acquire(self.model_id, region_name or self.bedrock.meta.region_name, estimated)
+
+    def _settle(self, reservation, usage):
+        """
+        Reconciles a reservation with the actual usage, or releases it when the call failed (usage None).
+        """
+        if reservation is None:
+            return
+        if usage is None:
+            self.admission_scheduler.release(reservation)
+            return
+        input_tokens = ((usage.get("inputTokens") or 0) + (usage.get("cacheReadInputTokens") or 0)
+                        + (usage.get("cacheWriteInputTokens") or 0))
+        self.admission_scheduler.reconcile(reservation, input_tokens, usage.get("outputTokens") or 0)
+
+    def _compute_costs(self, usage):
+        """
+        Computes the request costs from Converse token usage. Prompt cache reads and writes
+        are billed at their multiple of the input price and included in input_token_cost.
+
+        Parameters:
+            usage (dict): The usage block of a Converse response or stream metadata event.
+
+        Returns:
+            dict: Cache token counts and the input, output, cache and total costs.
+        """
+        input_tokens = usage.get("inputTokens") or 0
+        output_tokens = usage.get("outputTokens") or 0
+        cache_read_tokens = usage.get("cacheReadInputTokens") or 0
+        cache_write_tokens = usage.get("cacheWriteInputTokens") or 0
+
+        # Note: Because prices are per 1,000 tokens, we divide by 1,000
+        cache_read_token_cost = (self.input_tokens_price * self.cache_read_price_multiplier * cache_read_tokens) / 1000
+        cache_write_token_cost = (self.input_tokens_price * self.cache_write_price_multiplier * cache_write_tokens) / 1000
+        input_token_cost = (self.input_tokens_price * input_tokens) / 1000 + cache_read_token_cost + cache_write_token_cost
+        output_token_cost = (self.output_tokens_price * output_tokens) / 1000
+
+        return {
+            "cache_read_input_tokens": cache_read_tokens,
+            "cache_write_input_tokens": cache_write_tokens,
+            "cache_read_token_cost": cache_read_token_cost,
+            "cache_write_token_cost": cache_write_token_cost,
             "input_token_cost": input_token_cost,
             "output_token_cost": output_token_cost,
-            "total_cost": total_cost,
-            "model_id": model_id,
-            "provider": self.get_provider()
+            "total_cost": input_token_cost + output_token_cost,
         }
 
-    def invoke_stream(self, prompts):
+    def _inference_config(self):
         """
-        Processes a list of prompts and returns a streaming LLM response.
+        Returns the inference parameters sent with every request.
+        """
+        return {
+            "maxTokens": self.max_tokens,
+            "temperature": self.temperature,
+            "topP": self.p
+        }
+
+    def _cache_key(self, messages, system):
+        """
+        Returns the response cache key of a prepared request. Media passed as s3Location is
+        keyed by the version (or ETag) of its object as well as its URI, so a replaced object
+        is not served a stale response.
+
+        Returns:
+            str or None: The key, or None if the request cannot be cached because the version
+                         of an S3 object could not be read.
+        """
+        s3_versions = {}
+        for message in messages:
+            for block in message["content"]:
+                for kind in ("image", "document", "video"):
+                    if kind not in block:
+                        continue
+                    location = block[kind]["source"].get("s3Location")
+                    if location is not None:
+                        try:
+                            s3_versions[location["uri"]] = self.s3_helper.get_s3_object_version(location["uri"])
+                        except ValueError:
+                            logger.warning(f"Not caching the response: the version of {location['uri']} is unknown")
+                            return None
+        return self.response_cache.make_key(
+            self.model_id, messages, self._inference_config(), system=system, s3_versions=s3_versions or None
+        )
+
+    def _cached_response(self, cached, time_to_last_token):
+        """
+        Builds the invoke() response for a response cache hit: nothing is billed, and the
+        cost of the original call is reported as saved.
+        """
+        return {
+            **cached,
+            "time_to_first_token": None,
+            "time_to_last_token": time_to_last_token,
+            "time_per_output_token": None,
+            "cache_read_token_cost": 0.0,
+            "cache_write_token_cost": 0.0,
+            "input_token_cost": 0.0,
+            "output_token_cost": 0.0,
+            "total_cost": 0.0,
+            "retries": 0,
+            "retry_backoff_time": 0.0,
+            "cache_hit": True,
+            "saved_cost": cached.get("total_cost") or 0.0
+        }
+
+    def _open_stream(self, prompts):
+        """
+        Prepares, checks and admits a streaming request, then opens the stream.
 
         Parameters:
             prompts (list): A list of prompt dictionaries.
 
         Returns:
-            generator: Yields chunks of the response text or metadata as received from the LLM.
+            dict: The stream state used by _consume_stream: the event "stream" and the
+                  underlying "event_stream", the prepared "messages" and "system", "start_t",
+                  "retry_stats", "region_name", "reservation", "estimated_input_tokens" and
+                  "image_bytes_saved". It must be passed to _close_stream once consumed.
         """
         if not isinstance(prompts, list):
             raise ValueError('prompts must be a list')
 
         # Prepare the request
+        prompts, image_bytes_saved = self._optimize_prompt_images(prompts)
         messages = self._prepare_request(prompts)
-        # Record the start time for measuring streaming performance
+        system = self._prepare_system(prompts)
+        self._check_cache_points(messages, system)
+        retry_stats = {"retries": 0, "retry_backoff_time": 0.0}
+        # Check the request fits, wait for RPM/TPM capacity, then invoke the model and get the response
+        estimated_input_tokens = self._preflight(messages, system)
+        region_name = self._select_region()
+        reservation = self._admit(estimated_input_tokens, region_name)
+        # Record the start time for measuring streaming performance, after admission
         start_t = time.perf_counter()
-        # Invoke the model and get the response
-        streaming_response = self._invoke_model_streaming(messages)
-        # Initialize a flag to capture the time to first token (TTFT)
-        flag_ttft = True
+        try:
+            streaming_response = self._invoke_hedged(
+                self._invoke_model_streaming, messages, system, retry_stats, region_name, "stream",
+                estimated_input_tokens
+            )
+        except Exception:
+            self._settle(reservation, None)
+            raise
+        return {
+            "stream": streaming_response["stream"],
+            "event_stream": streaming_response.get("event_stream"),
+            "messages": messages,
+            "system": system,
+            "start_t": start_t,
+            "retry_stats": retry_stats,
+            "region_name": region_name,
+            "reservation": reservation,
+            "estimated_input_tokens": estimated_input_tokens,
+            "image_bytes_saved": image_bytes_saved,
+        }
+
+    def _consume_stream(self, state, on_text):
+        """
+        Reads a stream opened by _open_stream, passing each text delta to on_text as a str.
+
+        The events are read in a plain loop, without a generator or chunk dict per delta,
+        so this is the path used when the caller only needs the text and the final metadata.
+
+        Parameters:
+            state (dict): The stream state returned by _open_stream.
+            on_text (callable): Called with the text of every content delta.
+
+        Returns:
+            dict: The metadata of the response (empty if the stream ended without any).
+        """
+        perf_counter = time.perf_counter
+        start_t = state["start_t"]
         time_to_first_token = None
         time_to_last_token = None
+        metadata = {}
+
+        try:
+            for chunk in state["stream"]:
+                # Content blocks contain the actual text
+                delta = chunk.get("contentBlockDelta")
+                if delta is not None:
+                    if time_to_first_token is None:
+                        # On receiving the first content, record the time to first token
+                        time_to_first_token = perf_counter() - start_t
+                    on_text(delta["delta"].get("text", ""))
+                # contentBlockStop indicates the LLM finished sending tokens
+                elif "contentBlockStop" in chunk:
+                    time_to_last_token = perf_counter() - start_t
+                # The metadata block arrives at the end of the conversation
+                elif "metadata" in chunk:
+                    metadata = self._stream_metadata(state, chunk["metadata"], time_to_first_token, time_to_last_token)
+        finally:
+            self._close_stream(state)
+        return metadata
+
+    def _close_stream(self, state):
+        """
+        Closes a stream opened by _open_stream. If it ended before its metadata event (the
+        caller stopped reading, or it failed), its admission reservation is settled for the
+        estimated input tokens, so the unused output tokens do not hold TPM capacity.
+        """
+        reservation = state["reservation"]
+        if reservation is not None and not reservation.settled:
+            self.admission_scheduler.reconcile(reservation, state["estimated_input_tokens"], 0)
+        event_stream = state.get("event_stream")
+        if event_stream is not None and hasattr(event_stream, "close"):
+            event_stream.close()
+
+    def _stream_metadata(self, state, metadata, time_to_first_token, time_to_last_token):
+        """
+        Builds the final metadata chunk of a stream and settles its admission reservation.
+
+        Parameters:
+            state (dict): The stream state returned by _open_stream.
+            metadata (dict): The "metadata" event of the stream.
+            time_to_first_token (float): Seconds from the request to the first delta.
+            time_to_last_token (float): Seconds from the request to the end of the content.
+
+        Returns:
+            dict: Token usage, timing, costs, retries and model details of the response.
+        """
+        retry_stats = state["retry_stats"]
+        reservation = state["reservation"]
+
+        # After streaming ends, extract token usage
+        usage = metadata.get("usage", {})
+        input_tokens = usage.get("inputTokens")
+        output_tokens = usage.get("outputTokens")
+
+        # Compute time per output token
         time_per_output_token = None
+        if output_tokens and time_to_last_token and time_to_first_token:
+            generation_time = time_to_last_token - time_to_first_token
+            time_per_output_token = generation_time / max(output_tokens - 1, 1)
 
-        for chunk in streaming_response["stream"]:
-            # Content blocks contain the actual text
-            if "contentBlockDelta" in chunk:
-                if flag_ttft:
-                    # On receiving the first content, record the time to first token
-                    time_to_first_token = time.perf_counter() - start_t
-                    flag_ttft = False
-                delta_text = chunk["contentBlockDelta"]["delta"].get("text", "")
-                yield {"text": delta_text}
-
-            # contentBlockStop indicates the LLM finished sending tokens
-            if "contentBlockStop" in chunk:
-                time_to_last_token = time.perf_counter() - start_t
-            
-             # The metadata block arrives at the end of the conversation
-            if "metadata" in chunk:
-                metadata = chunk["metadata"]
+        # Compute costs
+        costs = self._compute_costs(usage)
+        self._settle(reservation, usage)
+        self._calibrate(state["messages"], state["system"], usage)
 
-                # After streaming ends, extract token usage
-                usage = metadata.get("usage", {})
-                input_tokens = usage.get("inputTokens")
-                output_tokens = usage.get("outputTokens")
-                
-                # Compute time per output token
-                if output_tokens and time_to_last_token and time_to_first_token:
-                    generation_time = time_to_last_token - time_to_first_token
-                    time_per_output_token = generation_time / max(output_tokens - 1, 1)
-
-                # Compute costs
-                input_token_cost = (self.input_tokens_price * input_tokens) / 1000 if input_tokens else 0
-                output_token_cost = (self.output_tokens_price * output_tokens) / 1000 if output_tokens else 0
-                total_cost = input_token_cost + output_token_cost
-                
-                # Determine model ID
-                if "trace" in metadata:
-                    model_id = metadata["trace"]["promptRouter"]["invokedModelId"]
-                    model_id = f"prompt-router:{model_id.split('/')[-1]}"
-                else:
-                    model_id = self.model_id
-
-                # Return the metadata chunk (including cost info)
-                yield {
-                    "metadata": {
-                        "input_tokens": input_tokens,
-                        "output_tokens": output_tokens,
-                        "time_to_first_token": time_to_first_token,
-                        "time_to_last_token": time_to_last_token,
-                        "time_per_output_token": time_per_output_token,
-                        "input_token_cost": input_token_cost,
-                        "output_token_cost": output_token_cost,
-                        "total_cost": total_cost,
-                        "model_id": model_id,
-                        "provider": self.get_provider(),
+        # Determine model ID
+        if "trace" in metadata:
+            model_id = metadata["trace"]["promptRouter"]["invokedModelId"]
+            model_id = f"prompt-router:{model_id.split('/')[-1]}"
+        else:
+            model_id = self.model_id
+
+        # Fields only reported when the matching feature is enabled
+        optional = {}
+        if self.hedging_policy is not None:
+            optional.update(hedged=retry_stats["hedged"], hedge_won=retry_stats["hedge_won"])
+            # The losing stream is closed at its first token, so only its input is wasted
+            optional.update(self._hedge_waste(retry_stats, state["estimated_input_tokens"], 0))
+        if self.image_optimizer is not None:
+            optional["image_bytes_saved"] = state["image_bytes_saved"]
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "time_to_first_token": time_to_first_token,
+            "time_to_last_token": time_to_last_token,
+            "time_per_output_token": time_per_output_token,
+            "cache_read_input_tokens": costs["cache_read_input_tokens"],
+            "cache_write_input_tokens": costs["cache_write_input_tokens"],
+            "cache_read_token_cost": costs["cache_read_token_cost"],
+            "cache_write_token_cost": costs["cache_write_token_cost"],
+            "input_token_cost": costs["input_token_cost"],
+            "output_token_cost": costs["output_token_cost"],
+            "total_cost": costs["total_cost"],
+            "retries": retry_stats["retries"],
+            "retry_backoff_time": retry_stats["retry_backoff_time"],
+            "admission_wait_time": reservation.wait_time if reservation else 0.0,
+            "estimated_input_tokens": state["estimated_input_tokens"],
+            "model_id": model_id,
+            "provider": self.get_provider(retry_stats.get("region_name", state["region_name"])),
+            **optional,
+        }
+
+    def invoke_stream(self, prompts):
+        """
+        Processes a list of prompts and returns a streaming LLM response.
+
+        Parameters:
+            prompts (list): A list of prompt dictionaries.
+
+        Returns:
+            generator: Yields chunks of the response text or metadata as received from the LLM.
+        """
+        state = self._open_stream(prompts)
+        perf_counter = time.perf_counter
+        start_t = state["start_t"]
+        time_to_first_token = None
+        time_to_last_token = None
+
+        # The stream is closed when it ends, fails, or the generator is closed early
+        try:
+            for chunk in state["stream"]:
+                # Content blocks contain the actual text
+                delta = chunk.get("contentBlockDelta")
+                if delta is not None:
+                    if time_to_first_token is None:
+                        # On receiving the first content, record the time to first token
+                        time_to_first_token = perf_counter() - start_t
+                    yield {"text": delta["delta"].get("text", "")}
+                # contentBlockStop indicates the LLM finished sending tokens
+                elif "contentBlockStop" in chunk:
+                    time_to_last_token = perf_counter() - start_t
+                # The metadata block arrives at the end of the conversation
+                elif "metadata" in chunk:
+                    yield {
+                        "metadata": self._stream_metadata(
+                            state, chunk["metadata"], time_to_first_token, time_to_last_token
+                        )
                     }
-                }
+        finally:
+            self._close_stream(state)
 
-    def invoke_stream_parsed(self, prompts):
+    def invoke_stream_parsed(self, prompts, on_text=None):
         """
-        Wraps the invoke_stream method to measure timing and token usage.
+        Streams the response and accumulates the full text and final metadata.
+
+        The stream is consumed directly rather than through invoke_stream, and the text is
+        collected in a list joined once at the end, so long responses cost linear time.
 
         Parameters:
             prompts (list): A list of prompt dictionaries.
+            on_text (callable): Optional sink called with each text delta as it arrives
+                                (e.g. to print or forward it), without the per-chunk
+                                overhead of iterating invoke_stream.
 
         Returns:
             dict: A dictionary with response text, timing, and token usage.
         """
-        if not isinstance(prompts, list):
-            raise ValueError('prompts must be a list')
+        parts = []
+        append = parts.append
+        if on_text is None:
+            sink = append
+        else:
+            def sink(text):
+                append(text)
+                on_text(text)
+
+        metadata = self._consume_stream(self._open_stream(prompts), sink)
+        return {"response_text": "".join(parts), **metadata}
+
+    def invoke_many(self, prompt_lists, max_concurrency=8, ordered=True):
+        """
+        Invokes the model for many independent prompt lists on a bounded worker pool.
+
+        A failing item does not abort the batch: its error is reported in its own chunk.
+
+        Parameters:
+            prompt_lists (iterable): Prompt lists, each one what invoke() accepts.
+            max_concurrency (int): Maximum number of requests in flight at once.
+            ordered (bool): Yield results in input order (True) or as they complete (False).
+
+        Yields:
+            dict: One {"index", "result", "error"} chunk per prompt list, where "result" is the
+                  invoke() response (or None) and "error" the error message (or None), followed
+                  by a final {"metadata": {...}} chunk with aggregate token, cost and latency stats.
+        """
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1')
+
+        start_t = time.perf_counter()
+        stats = {
+            "requests": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "inputTokens": 0,
+            "outputTokens": 0,
+            "input_token_cost": 0.0,
+            "output_token_cost": 0.0,
+            "total_cost": 0.0,
+        }
+        latencies = []
+
+        def run(index, prompts):
+            try:
+                return {"index": index, "result": self.invoke(prompts), "error": None}
+            except Exception as e:
+                return {"index": index, "result": None, "error": str(e)}
 
-        response_stream = self.invoke_stream(prompts)
+        def record(item):
+            stats["requests"] += 1
+            result = item["result"]
+            if result is None:
+                stats["failed"] += 1
+                return
+            stats["succeeded"] += 1
+            stats["inputTokens"] += result.get("inputTokens") or 0
+            stats["outputTokens"] += result.get("outputTokens") or 0
+            stats["input_token_cost"] += result.get("input_token_cost") or 0
+            stats["output_token_cost"] += result.get("output_token_cost") or 0
+            stats["total_cost"] += result.get("total_cost") or 0
+            if result.get("time_to_last_token") is not None:
+                latencies.append(result["time_to_last_token"])
 
-        response_text = ""
+        prompt_iter = enumerate(prompt_lists)
+        pending = set()
+        completed = {}
+        next_index = 0
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            # Keep at most max_concurrency requests queued so large (or lazy) inputs
+            # are not materialized all at once
+            def fill():
+                while len(pending) < max_concurrency:
+                    try:
+                        index, prompts = next(prompt_iter)
+                    except StopIteration:
+                        return
+                    pending.add(executor.submit(run, index, prompts))
+
+            fill()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                pending.difference_update(done)
+                fill()
+                for future in done:
+                    item = future.result()
+                    record(item)
+                    if not ordered:
+                        yield item
+                    else:
+                        completed[item["index"]] = item
+                while next_index in completed:
+                    yield completed.pop(next_index)
+                    next_index += 1
+
+        latencies.sort()
+        wall_time = time.perf_counter() - start_t
+        yield {
+            "metadata": {
+                **stats,
+                "wall_time": wall_time,
+                "mean_latency": sum(latencies) / len(latencies) if latencies else None,
+                "p50_latency": latencies[int(0.5 * (len(latencies) - 1))] if latencies else None,
+                "p95_latency": latencies[int(0.95 * (len(latencies) - 1))] if latencies else None,
+                "max_latency": latencies[-1] if latencies else None,
+                "model_id": self.model_id,
+                "provider": self.get_provider(),
+            }
+        }
+
+    def invoke_many_parsed(self, prompt_lists, max_concurrency=8, ordered=True):
+        """
+        Wraps the invoke_many method to collect every result and the aggregate stats.
+
+        Parameters:
+            prompt_lists (iterable): Prompt lists, each one what invoke() accepts.
+            max_concurrency (int): Maximum number of requests in flight at once.
+            ordered (bool): Collect results in input order (True) or completion order (False).
+
+        Returns:
+            dict: {"results": [{"index", "result", "error"}, ...], **aggregate stats}.
+        """
+        results = []
         metadata = {}
-        for chunk in response_stream:
-            if "text" in chunk:
-                response_text += chunk.get("text", "")
-            elif "metadata" in chunk:
+        for chunk in self.invoke_many(prompt_lists, max_concurrency=max_concurrency, ordered=ordered):
+            if "metadata" in chunk:
                 metadata = chunk["metadata"]
+            else:
+                results.append(chunk)
 
-        return {"response_text": response_text, **metadata}
+        return {"results": results, **metadata}
 
-    def get_provider(self):
+    def get_provider(self, region_name=None):
         """
         Returns the provider type.
 
+        Parameters:
+            region_name (str): The region a request was served from. Defaults to the client region.
+
         Returns:
             str: The name of the provider, e.g., "Bedrock".
         """
-        return f"{self.BEDROCK_PROVIDER}:{self.bedrock.meta.region_name}:{self.model_details['providerName']}"
+        return f"{self.BEDROCK_PROVIDER}:{region_name or self.bedrock.meta.region_name}:{self.model_details['providerName']}"
 
     def get_model_pricing(self):
         """
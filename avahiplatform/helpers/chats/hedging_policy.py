@@ -0,0 +1,199 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from loguru import logger
+
+
+class HedgingPolicy:
+    """
+    Hedged requests: when a call has not completed by a deadline learned from recent
+    latencies, a duplicate is sent and whichever finishes first is used.
+
+    The deadline is the given percentile of the last ``window`` latencies of the same kind
+    of call ("invoke" measures time to last token, "stream" time to first token). Until
+    ``min_samples`` latencies are known, ``initial_delay`` is used (no hedging if None).
+
+    Hedges are paid for, so their rate is capped: every call earns ``max_hedge_rate`` of a
+    hedge credit (up to ``max_burst``) and a hedge spends one credit.
+
+    The primary call runs on its own thread, so it never queues behind other calls; only
+    hedges use the worker pool (at most ``max_workers`` in flight).
+
+    A losing stream is closed. A losing non-streaming call cannot be cancelled once sent
+    (boto3 calls are blocking), so it runs to completion and its result is discarded. The
+    tokens and cost of losing calls are added up with ``record_waste``.
+
+    Attributes:
+        percentile (float): Percentile of recent latencies used as the deadline, e.g. 0.95.
+        max_hedge_rate (float): Maximum fraction of calls that are hedged.
+        window (int): Number of recent latencies kept per kind of call.
+        min_samples (int): Latencies needed before the learned deadline is used.
+        initial_delay (float): Deadline used before min_samples latencies are known.
+        min_delay (float): Lower bound of the deadline, in seconds.
+    """
+
+    def __init__(self,
+                 percentile=0.95,
+                 max_hedge_rate=0.05,
+                 window=200,
+                 min_samples=20,
+                 initial_delay=None,
+                 min_delay=0.05,
+                 max_burst=5,
+                 max_workers=32):
+        """
+        Initializes the hedging policy.
+        """
+        self.percentile = percentile
+        self.max_hedge_rate = max_hedge_rate
+        self.window = window
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_burst = max_burst
+        self.max_workers = max_workers
+
+        self._latencies = {}
+        self._credit = 0.0
+        self._lock = threading.Lock()
+        self._executor = None
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.wasted_tokens = 0
+        self.wasted_cost = 0.0
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hedge")
+        return self._executor
+
+    @staticmethod
+    def _start(fn):
+        """
+        Runs fn on a new thread and returns its future.
+        """
+        future = Future()
+
+        def target():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=target, name="hedge-primary", daemon=True).start()
+        return future
+
+    def record(self, kind, latency):
+        """
+        Adds a latency (in seconds) to the window of a kind of call.
+        """
+        with self._lock:
+            self._latencies.setdefault(kind, deque(maxlen=self.window)).append(latency)
+
+    def hedge_delay(self, kind):
+        """
+        Returns the current deadline for a kind of call, or None if it should not be hedged.
+        """
+        with self._lock:
+            latencies = self._latencies.get(kind)
+            if not latencies or len(latencies) < self.min_samples:
+                delay = self.initial_delay
+            else:
+                ordered = sorted(latencies)
+                delay = ordered[min(len(ordered) - 1, int(self.percentile * len(ordered)))]
+        return None if delay is None else max(delay, self.min_delay)
+
+    def _take_hedge_credit(self):
+        with self._lock:
+            if self._credit >= 1:
+                self._credit -= 1
+                self.hedges += 1
+                return True
+            return False
+
+    def run(self, primary, hedge, kind="invoke", on_loser=None):
+        """
+        Runs primary() and, if it is still running at the deadline, hedge() as well.
+
+        Parameters:
+            primary (callable): Sends the request.
+            hedge (callable): Sends the duplicate request.
+            kind (str): "invoke" or "stream"; deadlines are learned separately per kind.
+            on_loser (callable): Called with the result of the losing call, if it succeeds
+                (e.g. to close a stream).
+
+        Returns:
+            tuple: (result, hedged, hedge_won): the winning result, whether a hedge was sent
+                and whether it finished first.
+
+        Raises:
+            Exception: The error of the primary call if both calls failed (or it failed un-hedged).
+        """
+        with self._lock:
+            self.calls += 1
+            self._credit = min(self.max_burst, self._credit + self.max_hedge_rate)
+
+        delay = self.hedge_delay(kind)
+        start_t = time.perf_counter()
+        futures = [self._start(primary)]
+
+        done, _ = wait(futures, timeout=delay)
+        if not done and self._take_hedge_credit():
+            logger.debug(f"Hedging {kind} call still running after {delay:.3f}s")
+            futures.append(self._get_executor().submit(hedge))
+
+        pending = set(futures)
+        winner = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None and winner is None:
+                    winner = future
+            if winner is not None:
+                break
+
+        if winner is None:
+            raise futures[0].exception()
+
+        hedge_won = futures.index(winner) == 1
+        self.record(kind, time.perf_counter() - start_t)
+        if hedge_won:
+            with self._lock:
+                self.hedge_wins += 1
+
+        # Dispose of the losing call whenever it finishes
+        for future in futures:
+            if future is not winner and on_loser is not None:
+                future.add_done_callback(
+                    lambda f: on_loser(f.result()) if not f.cancelled() and f.exception() is None else None
+                )
+        return winner.result(), len(futures) > 1, hedge_won
+
+    def record_waste(self, tokens, cost):
+        """
+        Adds the tokens and cost of a losing call to the totals reported by get_stats.
+        """
+        with self._lock:
+            self.wasted_tokens += tokens
+            self.wasted_cost += cost
+
+    def get_stats(self):
+        """
+        Returns the number of calls, hedges sent, hedges that won, the tokens and cost of
+        losing calls and current deadlines.
+        """
+        return {
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": self.hedges / self.calls if self.calls else 0.0,
+            "wasted_tokens": self.wasted_tokens,
+            "wasted_cost": self.wasted_cost,
+            "deadlines": {kind: self.hedge_delay(kind) for kind in list(self._latencies)},
+        }
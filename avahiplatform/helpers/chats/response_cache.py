@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from loguru import logger
+from avahiplatform.helpers.connectors.utils import Utils
+
+
+class ResponseCache(ABC):
+    """Base class of the BedrockChat response caches.
+
+    Responses are stored under a content address: a SHA-256 over the model id, the
+    inference configuration and the prepared messages, attachment bytes included.
+    Subclasses implement ``get``, ``set`` and ``invalidate``.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None) -> None:
+        """Initialize the cache.
+
+        Args:
+            ttl_seconds: How long an entry is served. None keeps entries until evicted.
+        """
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _normalize(value: Any) -> Any:
+        """Make a message structure JSON-serializable, replacing bytes by their digest."""
+        if isinstance(value, (bytes, bytearray)):
+            return {"__sha256__": hashlib.sha256(value).hexdigest()}
+        if isinstance(value, dict):
+            return {key: ResponseCache._normalize(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [ResponseCache._normalize(item) for item in value]
+        return value
+
+    @classmethod
+    def make_key(cls, model_id: str, messages: Any, inference_config: Dict[str, Any], **extra: Any) -> str:
+        """Return the content address of a request.
+
+        Args:
+            model_id: The model the request is sent to.
+            messages: The prepared Converse messages.
+            inference_config: The inference parameters (maxTokens, temperature, topP).
+            **extra: Any other request fields that change the response.
+
+        Returns:
+            str: The hex SHA-256 of the normalized request.
+        """
+        payload = {
+            "model_id": model_id,
+            "inference_config": inference_config,
+            "messages": cls._normalize(messages),
+            **{key: cls._normalize(value) for key, value in extra.items() if value is not None},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - created_at >= self.ttl_seconds
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response for a key, or None."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a response under a key."""
+        pass
+
+    @abstractmethod
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop one entry, or every entry when no key is given."""
+        pass
+
+
+class InMemoryResponseCache(ResponseCache):
+    """A process-local LRU response cache bounded by the total size of the stored responses."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl_seconds: Optional[float] = None) -> None:
+        """Initialize a new InMemoryResponseCache.
+
+        Args:
+            max_bytes: Approximate upper bound of the serialized size of all entries.
+            ttl_seconds: How long an entry is served. None keeps entries until evicted.
+        """
+        super().__init__(ttl_seconds)
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            response, created_at, size = entry
+            if self._expired(created_at):
+                del self._entries[key]
+                self._size -= size
+                return None
+            self._entries.move_to_end(key)
+            return dict(response)
+
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        size = len(json.dumps(response, default=str))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[2]
+            self._entries[key] = (dict(response), time.time(), size)
+            self._size += size
+            # Evict least recently used entries until back under budget
+            while self._size > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._size = 0
+            else:
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    self._size -= entry[2]
+
+
+class SQLiteResponseCache(ResponseCache):
+    """A response cache persisted in a local SQLite file, shared across processes."""
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: Optional[float] = None,
+                 max_entries: Optional[int] = None) -> None:
+        """Initialize a new SQLiteResponseCache.
+
+        Args:
+            path: Path of the SQLite database file. Defaults to response_cache.sqlite3 in the
+                per-user cache directory ($XDG_CACHE_HOME or ~/.cache, under avahiplatform/).
+            ttl_seconds: How long an entry is served. None keeps entries until evicted.
+            max_entries: Optional cap; the least recently used entries beyond it are deleted.
+        """
+        super().__init__(ttl_seconds)
+        path = path or Utils.default_cache_path("response_cache.sqlite3")
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self._expired(row[1]):
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        try:
+            return json.loads(row[0])
+        except json.JSONDecodeError:
+            logger.warning(f"Dropping unreadable response cache entry {key}")
+            self.invalidate(key)
+            return None
+
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(response, default=str), now, now)
+            )
+            if self.max_entries is not None:
+                self._connection.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        with self._lock, self._connection:
+            if key is None:
+                self._connection.execute("DELETE FROM responses")
+            else:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
@@ -0,0 +1,229 @@
+import threading
+import time
+from collections import deque
+from loguru import logger
+from .bedrock_chat import BedrockChat
+
+
+class _RegionHealth:
+    """Moving windows of recent latencies and outcomes for one region."""
+
+    def __init__(self, window):
+        self.latencies = deque(maxlen=window)
+        self.errors = deque(maxlen=window)
+        self.unhealthy_until = 0.0
+
+    def score(self):
+        """Mean recent latency, or 0 for a region without samples so that it gets tried."""
+        return sum(self.latencies) / len(self.latencies) if self.latencies else 0.0
+
+    def error_rate(self):
+        return sum(self.errors) / len(self.errors) if self.errors else 0.0
+
+
+class RoutedBedrockChat(BedrockChat):
+    """
+    A BedrockChat that spreads requests over several regions.
+
+    A warm bedrock-runtime client is kept per region (created through the shared BotoHelper
+    registry). Every response updates a moving window of latencies (time to last token, or
+    time to first token when streaming) and outcomes for its region. New requests go to the
+    healthy region with the lowest mean latency. A region whose call fails with a regional
+    error (throttling, service unavailable, timeouts) is marked unhealthy for error_cooldown
+    seconds and the request fails over to the next best region at once. Calls are not retried
+    within a region: the boto_helper retry policy's attempts and time budget apply across
+    regions, and its backoff is only used once every region has failed. Streaming requests
+    only fail over before their first token.
+
+    The region that served a request is reported in "provider" ("Bedrock:<region>:<provider>").
+    With a hedging policy, hedged duplicates go to the next best region.
+    With an admission scheduler, capacity is reserved in the region chosen first.
+
+    Attributes (in addition to BedrockChat's):
+        regions (list): The regions to route across; the first one is used for model details.
+        window (int): Number of recent calls kept per region.
+        error_cooldown (float): Seconds a region is skipped after a regional error.
+        max_error_rate (float): Error rate over the window above which a region is skipped.
+    """
+
+    def __init__(self,
+                 model_id,
+                 boto_helper,
+                 regions,
+                 window=50,
+                 error_cooldown=30.0,
+                 max_error_rate=0.5,
+                 **kwargs):
+        """
+        Initializes the routed chat. Other keyword arguments are passed to BedrockChat.
+        """
+        if not regions:
+            raise ValueError("regions must list at least one region")
+        self.regions = list(regions)
+        self.window = window
+        self.error_cooldown = error_cooldown
+        self.max_error_rate = max_error_rate
+        self._health = {region: _RegionHealth(window) for region in self.regions}
+        self._health_lock = threading.Lock()
+        super().__init__(model_id=model_id, boto_helper=boto_helper, **kwargs)
+
+        # Warm one client (and connection pool) per region up front
+        self.region_clients = {
+            region: self.boto_helper.create_client(service_name="bedrock-runtime", region_name=region)
+            for region in self.regions
+        }
+
+    def _create_client(self, *args, **kwargs):
+        """
+        Creates the Bedrock client of the first region, used for model details and as the default.
+        """
+        return self.boto_helper.create_client(service_name="bedrock-runtime", region_name=self.regions[0])
+
+    def _get_model_details(self):
+        """
+        Retrieves the model details from the Bedrock service of the first region.
+        """
+        if self.model_id.startswith("us."):
+            model_id = self.model_id.split("us.")[1]
+        else:
+            model_id = self.model_id
+        return self.boto_helper.get_model_details(model_id, region_name=self.regions[0])
+
+    def _client_for(self, region_name=None):
+        return self.region_clients.get(region_name, self.bedrock)
+
+    def _ranked_regions(self, exclude=()):
+        """
+        Returns the candidate regions, fastest healthy ones first, unhealthy ones last.
+        """
+        now = time.monotonic()
+        with self._health_lock:
+            ranked = sorted(
+                (region for region in self.regions if region not in exclude),
+                key=lambda region: (
+                    self._health[region].unhealthy_until > now
+                    or self._health[region].error_rate() > self.max_error_rate,
+                    self._health[region].score()
+                )
+            )
+        return ranked
+
+    def _select_region(self):
+        return self._ranked_regions()[0]
+
+    def _hedge_region(self, region_name):
+        # Send hedged duplicates to the next best region, so a slow region is worked around
+        candidates = self._ranked_regions(exclude=(region_name,))
+        return candidates[0] if candidates else region_name
+
+    def _record(self, region_name, latency=None, error=False):
+        with self._health_lock:
+            health = self._health[region_name]
+            health.errors.append(1 if error else 0)
+            if error:
+                health.unhealthy_until = time.monotonic() + self.error_cooldown
+            else:
+                health.latencies.append(latency)
+
+    def _is_regional_error(self, error):
+        """
+        Errors worth retrying elsewhere: throttling and transient service or network errors.
+        """
+        return self.boto_helper.retry_policy.classify(error) != "fatal"
+
+    def _execute_with_retries(self, call, retry_stats=None):
+        """
+        Calls call() once: retries are made across regions by _with_failover.
+        """
+        return call()
+
+    def _with_failover(self, call, region_name, retry_stats):
+        """
+        Runs call(region) starting in region_name. On a regional error the next best region
+        not tried yet is called at once; when every region has failed, the retry policy's
+        backoff is slept and the regions are tried again, until its max_attempts or
+        max_elapsed budget is spent. Records the serving region, the failover count and
+        the retry counters in retry_stats.
+        """
+        retry_policy = self.boto_helper.retry_policy
+        if retry_stats is None:
+            retry_stats = {}
+        retry_stats.setdefault("retries", 0)
+        retry_stats.setdefault("retry_backoff_time", 0.0)
+
+        start_t = time.monotonic()
+        attempts = 0
+        rounds = 0
+        failovers = 0
+        tried = []
+        region = region_name
+        while True:
+            tried.append(region)
+            attempts += 1
+            call_t = time.perf_counter()
+            try:
+                result = call(region)
+            except Exception as e:
+                if not self._is_regional_error(e):
+                    raise
+                self._record(region, error=True)
+                if attempts >= retry_policy.max_attempts:
+                    raise
+                candidates = self._ranked_regions(exclude=tried)
+                if candidates:
+                    logger.warning(f"{self.model_id} failed in {region} ({str(e)}), failing over to {candidates[0]}")
+                else:
+                    # Every region failed: back off, then start over from the best one
+                    delay = retry_policy.backoff_delay(rounds)
+                    if time.monotonic() - start_t + delay > retry_policy.max_elapsed:
+                        raise
+                    rounds += 1
+                    logger.warning(f"{self.model_id} failed in every region ({str(e)}), retrying in {delay:.2f}s")
+                    time.sleep(delay)
+                    retry_stats["retry_backoff_time"] += delay
+                    tried = []
+                    candidates = self._ranked_regions()
+                retry_stats["retries"] += 1
+                if candidates[0] != region:
+                    failovers += 1
+                region = candidates[0]
+                continue
+            self._record(region, latency=time.perf_counter() - call_t)
+            retry_stats["region_name"] = region
+            retry_stats["failovers"] = failovers
+            return result
+
+    def _invoke_model(self, messages, system=None, retry_stats=None, region_name=None):
+        return self._with_failover(
+            lambda region: super(RoutedBedrockChat, self)._invoke_model(messages, system, retry_stats, region),
+            region_name or self._select_region(),
+            retry_stats
+        )
+
+    def _invoke_model_streaming(self, messages, system=None, retry_stats=None, region_name=None):
+        # The base method returns once the first token has been read ahead, so the
+        # recorded latency is the time to first token and failover stops there
+        return self._with_failover(
+            lambda region: super(RoutedBedrockChat, self)._invoke_model_streaming(messages, system, retry_stats, region),
+            region_name or self._select_region(),
+            retry_stats
+        )
+
+    def get_region_stats(self):
+        """
+        Returns the current routing view of every region.
+
+        Returns:
+            dict: Per region, the mean latency and error rate over the window and whether it is healthy.
+        """
+        now = time.monotonic()
+        with self._health_lock:
+            return {
+                region: {
+                    "mean_latency": health.score() if health.latencies else None,
+                    "error_rate": health.error_rate(),
+                    "healthy": health.unhealthy_until <= now and health.error_rate() <= self.max_error_rate,
+                    "samples": len(health.errors)
+                }
+                for region, health in self._health.items()
+            }
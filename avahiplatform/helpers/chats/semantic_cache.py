@@ -0,0 +1,158 @@
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+from loguru import logger
+
+
+class _NamespaceIndex:
+    """Fixed-capacity matrix of unit-normalized query embeddings with LRU bookkeeping."""
+
+    def __init__(self, capacity: int, dimensions: int) -> None:
+        self.vectors = np.zeros((min(capacity, 64), dimensions), dtype=np.float32)
+        self.capacity = capacity
+        self.size = 0
+        self.entries = []           # (query, response) per row
+        self.last_used = np.zeros(self.vectors.shape[0], dtype=np.int64)
+        self.created_at = np.zeros(self.vectors.shape[0], dtype=np.float64)
+
+    def _live_rows(self, expired_before: Optional[float]) -> np.ndarray:
+        if expired_before is None:
+            return np.ones(self.size, dtype=bool)
+        return self.created_at[:self.size] > expired_before
+
+    def _row_for_insert(self, expired_before: Optional[float]) -> int:
+        # Expired rows are never served, so they are overwritten first
+        expired = np.flatnonzero(~self._live_rows(expired_before))
+        if expired.size:
+            return int(expired[0])
+        if self.size < self.vectors.shape[0]:
+            return self.size
+        if self.size < self.capacity:
+            # Grow geometrically up to the capacity
+            rows = min(self.capacity, self.vectors.shape[0] * 2)
+            self.vectors = np.resize(self.vectors, (rows, self.vectors.shape[1]))
+            self.last_used = np.resize(self.last_used, rows)
+            self.created_at = np.resize(self.created_at, rows)
+            return self.size
+        # Full: reuse the least recently used row
+        return int(np.argmin(self.last_used[:self.size]))
+
+
+class SemanticResponseCache:
+    """A response cache matched on the meaning of the query rather than its exact text.
+
+    Queries are embedded with a BedrockEmbeddings model and compared by cosine similarity
+    against earlier queries of the same namespace (e.g. one per feature, or per database
+    for NL2SQL). When the best match reaches ``similarity_threshold``, its response is
+    returned and the LLM is not called. Each namespace holds at most ``max_entries``
+    queries and evicts the least recently used one when full.
+    """
+
+    def __init__(self,
+                 embedder,
+                 similarity_threshold: float = 0.92,
+                 max_entries: int = 1000,
+                 ttl_seconds: Optional[float] = None,
+                 embedding_kwargs: Optional[Dict[str, Any]] = None) -> None:
+        """Initialize a new SemanticResponseCache.
+
+        Args:
+            embedder: A BedrockEmbeddings instance for a text embedding model.
+            similarity_threshold: Minimum cosine similarity for a cached response to be reused.
+            max_entries: Maximum number of queries kept per namespace.
+            ttl_seconds: How long an entry is served. None keeps entries until evicted.
+            embedding_kwargs: Extra arguments for embedder.generate_embeddings (e.g. dimensions).
+        """
+        self.embedder = embedder
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.embedding_kwargs = embedding_kwargs or {}
+        self._namespaces: Dict[str, _NamespaceIndex] = {}
+        self._lock = threading.Lock()
+        self._clock = 0
+
+    def _expired_before(self) -> Optional[float]:
+        return None if self.ttl_seconds is None else time.time() - self.ttl_seconds
+
+    def embed(self, query: str) -> np.ndarray:
+        """Return the unit-normalized embedding of a query."""
+        embeddings = self.embedder.generate_embeddings(text=query, **self.embedding_kwargs)["embeddings"]
+        # Cohere returns {"float": [[...]]} or [[...]], Titan a flat list
+        if isinstance(embeddings, dict):
+            embeddings = next(iter(embeddings.values()))
+        if embeddings and isinstance(embeddings[0], list):
+            embeddings = embeddings[0]
+        vector = np.asarray(embeddings, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, namespace: str, query: str) -> Tuple[Optional[Dict[str, Any]], float, np.ndarray]:
+        """Find the cached response of the most similar earlier query.
+
+        Args:
+            namespace: The namespace to search.
+            query: The user query.
+
+        Returns:
+            tuple: (response or None, best similarity, query embedding). Pass the embedding
+                   to store() on a miss to avoid embedding the query twice.
+        """
+        vector = self.embed(query)
+        with self._lock:
+            index = self._namespaces.get(namespace)
+            if index is None or index.size == 0:
+                return None, 0.0, vector
+            live = index._live_rows(self._expired_before())
+            if not live.any():
+                return None, 0.0, vector
+            # Expired rows are masked out, so a fresher copy of the same query can match
+            similarities = np.where(live, index.vectors[:index.size] @ vector, -np.inf)
+            row = int(np.argmax(similarities))
+            similarity = float(similarities[row])
+            if similarity < self.similarity_threshold:
+                return None, similarity, vector
+            _, response = index.entries[row]
+            self._clock += 1
+            index.last_used[row] = self._clock
+            return dict(response), similarity, vector
+
+    def store(self, namespace: str, query: str, response: Dict[str, Any],
+              embedding: Optional[np.ndarray] = None) -> None:
+        """Add a query and its response to a namespace.
+
+        Args:
+            namespace: The namespace to add to.
+            query: The user query.
+            response: The response to serve for similar queries.
+            embedding: The query embedding returned by lookup(), if available.
+        """
+        vector = embedding if embedding is not None else self.embed(query)
+        with self._lock:
+            index = self._namespaces.get(namespace)
+            if index is None:
+                index = _NamespaceIndex(self.max_entries, vector.shape[0])
+                self._namespaces[namespace] = index
+            if vector.shape[0] != index.vectors.shape[1]:
+                logger.warning(f"Not caching query in '{namespace}': embedding size changed")
+                return
+            row = index._row_for_insert(self._expired_before())
+            entry = (query, dict(response))
+            if row == index.size:
+                index.entries.append(entry)
+                index.size += 1
+            else:
+                index.entries[row] = entry
+            index.vectors[row] = vector
+            index.created_at[row] = time.time()
+            self._clock += 1
+            index.last_used[row] = self._clock
+
+    def invalidate(self, namespace: Optional[str] = None) -> None:
+        """Drop one namespace, or every namespace when none is given."""
+        with self._lock:
+            if namespace is None:
+                self._namespaces.clear()
+            else:
+                self._namespaces.pop(namespace, None)
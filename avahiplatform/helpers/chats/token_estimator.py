@@ -0,0 +1,204 @@
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class ContextWindowExceededError(ValueError):
+    """Raised before a call whose estimated size does not fit the model's context window."""
+
+    def __init__(self, model_id: str, estimated_input_tokens: int, max_output_tokens: int, context_window: int) -> None:
+        self.model_id = model_id
+        self.estimated_input_tokens = estimated_input_tokens
+        self.max_output_tokens = max_output_tokens
+        self.context_window = context_window
+        super().__init__(
+            f"Request to {model_id} is estimated at {estimated_input_tokens} input tokens plus "
+            f"{max_output_tokens} output tokens, over its {context_window} token context window. "
+            "Shorten or chunk the input, or lower max_tokens."
+        )
+
+
+class TokenEstimator:
+    """Fast local estimate of the input tokens of a Converse request.
+
+    Text is estimated from its length with a characters-per-token ratio per model
+    family. Each family's ratio is calibrated against the ``usage`` reported by
+    Bedrock: after a text-only call, ``observe`` folds the ratio of actual to
+    estimated tokens into an exponentially weighted correction factor.
+
+    Images and videos get a fixed allowance. Documents are estimated from their
+    size, with a bytes-per-token ratio per format, because Bedrock bills only the
+    extracted text of binary formats such as PDF.
+    """
+
+    # Characters per token of English text, by model family (the model id prefix)
+    CHARS_PER_TOKEN = {
+        "anthropic": 3.5,
+        "amazon": 4.0,
+        "meta": 3.8,
+        "mistral": 3.6,
+        "cohere": 4.0,
+        "ai21": 4.0,
+    }
+    DEFAULT_CHARS_PER_TOKEN = 4.0
+
+    # Bytes per token of document formats whose bytes are not the text itself
+    DOCUMENT_BYTES_PER_TOKEN = {
+        "pdf": 12.0,
+        "doc": 10.0,
+        "docx": 8.0,
+        "xls": 10.0,
+        "xlsx": 8.0,
+    }
+    IMAGE_TOKENS = 1600
+    VIDEO_TOKENS = 10000
+
+    # Context windows (in tokens) by model id fragment, most specific first
+    CONTEXT_WINDOWS = (
+        ("anthropic.claude-instant", 100000),
+        ("anthropic.claude-v2:1", 200000),
+        ("anthropic.claude-v2", 100000),
+        ("anthropic.claude", 200000),
+        ("amazon.nova-micro", 128000),
+        ("amazon.nova", 300000),
+        ("amazon.titan-text-premier", 32000),
+        ("amazon.titan-text", 8000),
+        ("meta.llama3-1", 128000),
+        ("meta.llama3-2", 128000),
+        ("meta.llama3-3", 128000),
+        ("meta.llama3", 8000),
+        ("mistral.mistral-large-2407", 128000),
+        ("mistral.mistral-large", 32000),
+        ("mistral.mixtral", 32000),
+        ("mistral.mistral", 32000),
+        ("cohere.command-r", 128000),
+    )
+
+    def __init__(self, smoothing: float = 0.1, min_factor: float = 0.5, max_factor: float = 2.0) -> None:
+        """Initialize a new TokenEstimator.
+
+        Args:
+            smoothing: Weight of each new observation in the calibration factor.
+            min_factor: Lower bound of the calibration factor.
+            max_factor: Upper bound of the calibration factor.
+        """
+        self.smoothing = smoothing
+        self.min_factor = min_factor
+        self.max_factor = max_factor
+        self._factors: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def model_family(model_id: str) -> str:
+        """Return the family of a model id, ignoring inference profile prefixes such as "us."."""
+        # Also handles ARNs, e.g. ".../default-prompt-router/anthropic.claude:1"
+        parts = model_id.split("/")[-1].split(":")[0].split(".")
+        for part in parts:
+            if part in TokenEstimator.CHARS_PER_TOKEN:
+                return part
+        return parts[0]
+
+    def context_window(self, model_id: str) -> Optional[int]:
+        """Return the context window of a model in tokens, or None if it is not known."""
+        for fragment, window in self.CONTEXT_WINDOWS:
+            if fragment in model_id:
+                return window
+        return None
+
+    def calibration_factor(self, model_id: str) -> float:
+        """Return the current correction factor of the model's family (1.0 until calibrated)."""
+        return self._factors.get(self.model_family(model_id), 1.0)
+
+    def _text_tokens(self, model_id: str, chars: int) -> float:
+        chars_per_token = self.CHARS_PER_TOKEN.get(self.model_family(model_id), self.DEFAULT_CHARS_PER_TOKEN)
+        return chars / chars_per_token * self.calibration_factor(model_id)
+
+    def estimate_text(self, model_id: str, text: str) -> int:
+        """Return the estimated tokens of a text."""
+        return int(self._text_tokens(model_id, len(text))) + 1
+
+    def estimate_messages(self, model_id: str, messages: List[Dict[str, Any]],
+                          system: Optional[List[Dict[str, Any]]] = None) -> int:
+        """Return the estimated input tokens of prepared Converse messages and system blocks."""
+        return self._estimate(model_id, messages, system)[0]
+
+    def estimate_request(self, model_id: str, messages: List[Dict[str, Any]],
+                         system: Optional[List[Dict[str, Any]]] = None) -> Tuple[int, bool]:
+        """Return the estimated input tokens of a request and whether it is text only.
+
+        The estimate of a request with attachments relies on fixed allowances and byte sizes,
+        so it is much rougher than that of a text-only request.
+        """
+        return self._estimate(model_id, messages, system)
+
+    def _estimate(self, model_id, messages, system=None) -> Tuple[int, bool]:
+        """Return (estimated tokens, whether the request is text only)."""
+        chars = 0
+        other_tokens = 0.0
+        text_only = True
+        for block in (system or []) + [block for message in messages for block in message["content"]]:
+            if "text" in block:
+                chars += len(block["text"])
+            elif "document" in block:
+                text_only = False
+                document = block["document"]
+                size = len(document["source"].get("bytes", b""))
+                bytes_per_token = self.DOCUMENT_BYTES_PER_TOKEN.get(document.get("format"))
+                if bytes_per_token is None:
+                    # Text formats (txt, csv, md, html): the bytes are the text
+                    other_tokens += self._text_tokens(model_id, size)
+                else:
+                    other_tokens += size / bytes_per_token
+            elif "image" in block:
+                text_only = False
+                other_tokens += self.IMAGE_TOKENS
+            elif "video" in block:
+                text_only = False
+                other_tokens += self.VIDEO_TOKENS
+        return int(self._text_tokens(model_id, chars) + other_tokens) + 1, text_only
+
+    def observe(self, model_id: str, messages: List[Dict[str, Any]], system: Optional[List[Dict[str, Any]]],
+                actual_input_tokens: Optional[int]) -> None:
+        """Calibrate the model's family against the input tokens Bedrock reported for a request.
+
+        Only text-only requests are used, since attachments get fixed allowances.
+        """
+        if not actual_input_tokens:
+            return
+        estimated, text_only = self._estimate(model_id, messages, system)
+        if not text_only or estimated < 50:
+            # Very short prompts are dominated by the fixed overhead of the chat template
+            return
+        family = self.model_family(model_id)
+        with self._lock:
+            factor = self._factors.get(family, 1.0)
+            observed = factor * actual_input_tokens / estimated
+            factor += self.smoothing * (observed - factor)
+            self._factors[family] = min(self.max_factor, max(self.min_factor, factor))
+
+    def split_text(self, model_id: str, text: str, max_tokens: int, overlap_tokens: int = 0) -> List[str]:
+        """Split a text into chunks of at most ``max_tokens`` estimated tokens.
+
+        Chunks end at a paragraph, line or sentence break where possible, and each chunk
+        repeats about ``overlap_tokens`` tokens of the end of the previous one.
+        """
+        chars_per_token = self.CHARS_PER_TOKEN.get(self.model_family(model_id), self.DEFAULT_CHARS_PER_TOKEN)
+        chars_per_token /= self.calibration_factor(model_id)
+        max_chars = max(1, int((max_tokens - 1) * chars_per_token))
+        overlap_chars = min(int(overlap_tokens * chars_per_token), max_chars // 2)
+
+        chunks = []
+        start = 0
+        while start < len(text):
+            end = min(len(text), start + max_chars)
+            if end < len(text):
+                # Prefer to break in the second half of the chunk
+                for separator in ("\n\n", "\n", ". ", " "):
+                    cut = text.rfind(separator, start + max_chars // 2, end)
+                    if cut != -1:
+                        end = cut + len(separator)
+                        break
+            chunks.append(text[start:end])
+            if end >= len(text):
+                break
+            start = max(end - overlap_chars, start + 1)
+        return chunks
@@ -1,9 +1,42 @@
-from .boto_helper import BotoHelper
-from .s3_helper import S3Helper
-from .utils import Utils
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .boto_helper import BotoHelper
+    from .s3_helper import S3Helper
+    from .utils import Utils
+    from .model_details_cache import ModelDetailsCache
+    from .retry_policy import RetryPolicy
+    from .admission_scheduler import AdmissionScheduler
+
+# Submodules are imported on first attribute access (PEP 562)
+_LAZY_IMPORTS = {
+    "BotoHelper": ".boto_helper",
+    "S3Helper": ".s3_helper",
+    "Utils": ".utils",
+    "ModelDetailsCache": ".model_details_cache",
+    "RetryPolicy": ".retry_policy",
+    "AdmissionScheduler": ".admission_scheduler",
+}
 
 __all__ = [
     "BotoHelper",
     "S3Helper",
-    "Utils"
-]
\ No newline at end of file
+    "Utils",
+    "ModelDetailsCache",
+    "RetryPolicy",
+    "AdmissionScheduler"
+]
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
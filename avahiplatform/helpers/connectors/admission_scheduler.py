@@ -0,0 +1,185 @@
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+from loguru import logger
+
+
+class _TokenBucket:
+    """A bucket refilled continuously at ``per_minute / 60`` units per second, holding at most ``per_minute``."""
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` is available (0 if it is available now)."""
+        missing = amount - self.level
+        return missing / self.rate if missing > 0 else 0.0
+
+
+class Reservation:
+    """Capacity granted by AdmissionScheduler.acquire, to be settled with reconcile() or release()."""
+
+    __slots__ = ("key", "estimated_tokens", "settled", "wait_time")
+
+    def __init__(self, key: Tuple[str, Optional[str]], estimated_tokens: float, wait_time: float) -> None:
+        self.key = key
+        self.estimated_tokens = estimated_tokens
+        self.settled = False
+        self.wait_time = wait_time
+
+
+class AdmissionScheduler:
+    """Client-side admission control for Bedrock requests-per-minute and tokens-per-minute quotas.
+
+    Each (model id, region) gets a request bucket and a token bucket sized from its
+    limits. A call first reserves one request and its estimated tokens (input plus
+    max output), waiting in FIFO order until both buckets have capacity, so that
+    concurrent callers are spread out instead of being throttled. Once the response
+    arrives the estimate is reconciled with the actual usage: unused tokens are
+    returned to the bucket and an underestimate is charged.
+
+    Models without configured limits are admitted immediately.
+    """
+
+    def __init__(self,
+                 default_requests_per_minute: Optional[float] = None,
+                 default_tokens_per_minute: Optional[float] = None,
+                 output_token_weight: float = 1.0,
+                 max_wait: Optional[float] = None) -> None:
+        """Initialize a new AdmissionScheduler.
+
+        Args:
+            default_requests_per_minute: Requests per minute for models without their own limits.
+            default_tokens_per_minute: Tokens per minute for models without their own limits.
+            output_token_weight: Quota burndown of one output token, in input tokens (some
+                models count output tokens several times against the TPM quota).
+            max_wait: Maximum seconds a call may wait for capacity before TimeoutError is raised.
+        """
+        self.default_requests_per_minute = default_requests_per_minute
+        self.default_tokens_per_minute = default_tokens_per_minute
+        self.output_token_weight = output_token_weight
+        self.max_wait = max_wait
+        self._limits: Dict[Tuple[str, Optional[str]], Tuple[Optional[float], Optional[float]]] = {}
+        self._buckets: Dict[Tuple[str, Optional[str]], Tuple[Optional[_TokenBucket], Optional[_TokenBucket]]] = {}
+        self._queues: Dict[Tuple[str, Optional[str]], deque] = {}
+        self._tickets = itertools.count()
+        self._condition = threading.Condition()
+
+    def set_limits(self, model_id: str, requests_per_minute: Optional[float] = None,
+                   tokens_per_minute: Optional[float] = None, region_name: Optional[str] = None) -> None:
+        """Set the quotas of a model, in one region or (region_name=None) in every region."""
+        with self._condition:
+            self._limits[(model_id, region_name)] = (requests_per_minute, tokens_per_minute)
+            # Rebuild the affected buckets with the new sizes on next use
+            for key in [key for key in self._buckets if key[0] == model_id and region_name in (None, key[1])]:
+                del self._buckets[key]
+            self._condition.notify_all()
+
+    def _get_buckets(self, key):
+        buckets = self._buckets.get(key)
+        if buckets is None:
+            model_id, region_name = key
+            rpm, tpm = self._limits.get(key) or self._limits.get((model_id, None)) or (
+                self.default_requests_per_minute, self.default_tokens_per_minute)
+            buckets = (_TokenBucket(rpm) if rpm else None, _TokenBucket(tpm) if tpm else None)
+            self._buckets[key] = buckets
+        return buckets
+
+    def estimate_tokens(self, input_tokens: float, max_output_tokens: float) -> float:
+        """Return the quota a request is expected to use."""
+        return input_tokens + max_output_tokens * self.output_token_weight
+
+    def acquire(self, model_id: str, region_name: Optional[str], estimated_tokens: float) -> Reservation:
+        """Wait until a request of ``estimated_tokens`` fits both quotas, then reserve it.
+
+        Args:
+            model_id: The model being called.
+            region_name: The region the call is sent to.
+            estimated_tokens: Estimated quota use, e.g. from estimate_tokens().
+
+        Returns:
+            Reservation: To be passed to reconcile() (or release() if the call failed).
+
+        Raises:
+            TimeoutError: If capacity did not become available within max_wait.
+        """
+        key = (model_id, region_name)
+        start_t = time.monotonic()
+        with self._condition:
+            request_bucket, token_bucket = self._get_buckets(key)
+            if request_bucket is None and token_bucket is None:
+                return Reservation(key, 0.0, 0.0)
+
+            # A request larger than the whole bucket could never fit; let it through once the bucket is full
+            tokens = min(estimated_tokens, token_bucket.capacity) if token_bucket else 0.0
+            ticket = next(self._tickets)
+            queue = self._queues.setdefault(key, deque())
+            queue.append(ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    request_bucket, token_bucket = self._get_buckets(key)
+                    wait = 0.0
+                    if request_bucket:
+                        request_bucket.refill(now)
+                        wait = max(wait, request_bucket.wait_time(1))
+                    if token_bucket:
+                        token_bucket.refill(now)
+                        tokens = min(tokens, token_bucket.capacity)
+                        wait = max(wait, token_bucket.wait_time(tokens))
+
+                    if queue[0] == ticket and wait == 0:
+                        if request_bucket:
+                            request_bucket.level -= 1
+                        if token_bucket:
+                            token_bucket.level -= tokens
+                        waited = now - start_t
+                        if waited > 1:
+                            logger.debug(f"Admitted {model_id} request after waiting {waited:.2f}s for quota")
+                        return Reservation(key, tokens if token_bucket else 0.0, waited)
+
+                    if self.max_wait is not None and now - start_t + wait > self.max_wait:
+                        raise TimeoutError(
+                            f"No {model_id} quota available within {self.max_wait} seconds"
+                        )
+                    # Callers behind the head of the queue are woken when it is admitted
+                    self._condition.wait(timeout=wait if queue[0] == ticket else None)
+            finally:
+                queue.remove(ticket)
+                self._condition.notify_all()
+
+    def reconcile(self, reservation: Reservation, input_tokens: float, output_tokens: float) -> None:
+        """Replace the estimated token use of a reservation by the actual usage."""
+        if reservation.settled:
+            return
+        reservation.settled = True
+        actual = input_tokens + output_tokens * self.output_token_weight
+        self._adjust(reservation, reservation.estimated_tokens - actual)
+
+    def release(self, reservation: Reservation) -> None:
+        """Return the reserved tokens of a call that failed before using them."""
+        if reservation.settled:
+            return
+        reservation.settled = True
+        self._adjust(reservation, reservation.estimated_tokens)
+
+    def _adjust(self, reservation: Reservation, tokens: float) -> None:
+        if not tokens:
+            return
+        with self._condition:
+            _, token_bucket = self._buckets.get(reservation.key, (None, None))
+            if token_bucket is None:
+                return
+            token_bucket.refill(time.monotonic())
+            # An underestimate may take the bucket below zero, delaying the next callers
+            token_bucket.level = min(token_bucket.capacity, token_bucket.level + tokens)
+            self._condition.notify_all()
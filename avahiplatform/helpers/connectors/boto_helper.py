@@ -1,10 +1,16 @@
-from typing import Optional, Any
+from typing import Optional, Any, Dict
+import json
+import threading
 import boto3
 from boto3.session import Session
 from boto3.resources.base import ServiceResource
 from botocore.client import BaseClient
+from botocore.config import Config
 from loguru import logger
 import botocore.exceptions
+from .model_details_cache import ModelDetailsCache, default_model_details_cache
+from .retry_policy import RetryPolicy
+from .admission_scheduler import AdmissionScheduler
 
 
 class BotoHelper:
@@ -12,14 +18,35 @@ class BotoHelper:
 
     This class provides a wrapper around boto3 Session to create clients and resources
     with proper error handling and logging.
+
+    Clients are cached per (service, region, config): every component sharing a
+    BotoHelper reuses the same client, and therefore the same pool of warm
+    (keep-alive) HTTPS connections. boto3 clients are thread-safe once created.
+
+    The helper also carries the RetryPolicy that components apply to their Bedrock calls,
+    and optionally an AdmissionScheduler shared by the chats built on it. So that the two
+    retry layers do not multiply, Bedrock clients make a single attempt per call unless
+    retry_mode or max_attempts is given, leaving retries to the RetryPolicy.
     """
 
+    # Services whose calls are retried by the RetryPolicy rather than by botocore
+    POLICY_RETRIED_SERVICES = frozenset({"bedrock", "bedrock-runtime"})
+
     def __init__(
         self,
         aws_access_key_id: Optional[str] = None,
         aws_secret_access_key: Optional[str] = None,
         region_name: Optional[str] = None,
         aws_session_token: Optional[str] = None,
+        max_pool_connections: int = 50,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        tcp_keepalive: bool = True,
+        retry_mode: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+        model_details_cache: Optional[ModelDetailsCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        admission_scheduler: Optional[AdmissionScheduler] = None,
     ) -> None:
         """Initialize a new BotoHelper instance.
 
@@ -27,6 +54,19 @@ class BotoHelper:
             aws_access_key_id: AWS access key ID. If not provided, will use environment variables.
             aws_secret_access_key: AWS secret access key. If not provided, will use environment variables.
             region_name: AWS region name. If not provided, will use environment variables.
+            aws_session_token: AWS session token for temporary credentials.
+            max_pool_connections: Maximum number of connections kept in each client's pool
+                (botocore defaults to 10).
+            connect_timeout: Seconds to wait when establishing a connection (botocore default 60).
+            read_timeout: Seconds to wait for a response (botocore default 60).
+            tcp_keepalive: Whether to enable TCP keepalive on pooled connections.
+            retry_mode: botocore retry mode ('legacy', 'standard' or 'adaptive').
+            max_attempts: Maximum attempts made by botocore's retry handler. When either this or
+                retry_mode is set it also applies to Bedrock clients, whose calls are then retried
+                by botocore inside every RetryPolicy attempt (up to max_attempts times as many calls).
+            model_details_cache: Cache used by get_model_details. Defaults to the process-wide cache.
+            retry_policy: Backoff policy for throttled Bedrock calls. Defaults to RetryPolicy().
+            admission_scheduler: Optional RPM/TPM admission control for Bedrock chat calls.
         """
         self._session: Session = boto3.Session(
             aws_access_key_id=aws_access_key_id,
@@ -35,11 +75,54 @@ class BotoHelper:
             region_name=region_name
         )
 
-    def create_client(self, service_name: str) -> BaseClient:
-        """Create a Boto3 client for the specified service.
+        config_options = {
+            "max_pool_connections": max_pool_connections,
+            "tcp_keepalive": tcp_keepalive,
+        }
+        if connect_timeout is not None:
+            config_options["connect_timeout"] = connect_timeout
+        if read_timeout is not None:
+            config_options["read_timeout"] = read_timeout
+        retries = {}
+        if retry_mode is not None:
+            retries["mode"] = retry_mode
+        if max_attempts is not None:
+            retries["max_attempts"] = max_attempts
+        if retries:
+            config_options["retries"] = retries
+        self._config_options: Dict[str, Any] = config_options
+
+        # Creating clients from a shared Session is not thread-safe, so the
+        # registry is guarded by a lock
+        self._clients: Dict[tuple, BaseClient] = {}
+        self._clients_lock = threading.Lock()
+
+        self.model_details_cache = model_details_cache or default_model_details_cache
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.admission_scheduler = admission_scheduler
+
+    @property
+    def region_name(self) -> Optional[str]:
+        """The default region of the underlying boto3 Session."""
+        return self._session.region_name
+
+    def _build_config(self, service_name: str, config_overrides: Dict[str, Any]) -> Config:
+        """Build the botocore Config for a client from the helper defaults and per-call overrides."""
+        options = dict(self._config_options)
+        if service_name in self.POLICY_RETRIED_SERVICES and "retries" not in options:
+            # A single botocore attempt: the RetryPolicy retries these calls
+            options["retries"] = {"mode": "standard", "total_max_attempts": 1}
+        options.update(config_overrides)
+        return Config(**options)
+
+    def create_client(self, service_name: str, region_name: Optional[str] = None, **config_overrides) -> BaseClient:
+        """Return the shared Boto3 client for the specified service, creating it on first use.
 
         Args:
             service_name: The name of the AWS service (e.g., 's3', 'ec2', etc.)
+            region_name: Region of the client. Defaults to the session region.
+            **config_overrides: botocore Config options (e.g. read_timeout=120) applied on top
+                of the helper defaults. Clients with different overrides are cached separately.
 
         Returns:
             A boto3 client instance for the specified service.
@@ -48,8 +131,26 @@ class BotoHelper:
             ValueError: If AWS credentials are not properly configured.
             Exception: For other boto3-related errors.
         """
+        cache_key = (
+            service_name,
+            region_name or self._session.region_name,
+            json.dumps(config_overrides, sort_keys=True, default=str)
+        )
+        client = self._clients.get(cache_key)
+        if client is not None:
+            return client
+
         try:
-            return self._session.client(service_name=service_name)
+            with self._clients_lock:
+                client = self._clients.get(cache_key)
+                if client is None:
+                    client = self._session.client(
+                        service_name=service_name,
+                        region_name=region_name,
+                        config=self._build_config(service_name, config_overrides)
+                    )
+                    self._clients[cache_key] = client
+            return client
         except botocore.exceptions.NoCredentialsError as e:
             logger.error(f"No AWS credentials found for {service_name}. Please provide credentials or configure your environment.")
             raise ValueError(
@@ -66,6 +167,32 @@ class BotoHelper:
             logger.error(f"Error setting up {service_name} client: {str(e)}")
             raise
 
+    def get_model_details(self, model_id: str, region_name: Optional[str] = None) -> Dict[str, Any]:
+        """Return the Bedrock foundation model details for a model, served from the model details cache.
+
+        The Bedrock control plane (get_foundation_model) is only called on a cache miss
+        or once the cached entry has expired.
+
+        Args:
+            model_id: The foundation model identifier.
+            region_name: Region to query. Defaults to the session region.
+
+        Returns:
+            A copy of the "modelDetails" dictionary, with "region_name" added.
+        """
+        bedrock_control_client = self.create_client(service_name="bedrock", region_name=region_name)
+        region = bedrock_control_client.meta.region_name
+
+        def load():
+            response = self.retry_policy.execute(
+                lambda: bedrock_control_client.get_foundation_model(modelIdentifier=model_id)
+            )
+            details = response["modelDetails"]
+            details["region_name"] = region
+            return details
+
+        return self.model_details_cache.get(model_id, region, load)
+
     def create_resource(self, service_name: str) -> ServiceResource:
         """Create a Boto3 resource for the specified service.
 
@@ -80,7 +207,7 @@ class BotoHelper:
             Exception: For other boto3-related errors.
         """
         try:
-            return self._session.resource(service_name=service_name)
+            return self._session.resource(service_name=service_name, config=self._build_config(service_name, {}))
         except botocore.exceptions.NoCredentialsError as e:
             logger.error(f"No AWS credentials found for {service_name}. Please provide credentials or configure your environment.")
             raise ValueError(
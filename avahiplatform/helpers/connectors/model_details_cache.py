@@ -0,0 +1,111 @@
+import copy
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from loguru import logger
+
+
+class ModelDetailsCache:
+    """A process-wide cache of Bedrock foundation model details.
+
+    Entries are keyed by (region, model id) and considered fresh for
+    ``ttl_seconds``. When ``cache_file`` is set, entries are also persisted to a
+    JSON file so that new processes start warm. If refreshing an expired entry
+    fails (no network, missing control-plane permissions, throttling), the stale
+    entry is returned instead of raising.
+    """
+
+    def __init__(self, ttl_seconds: float = 24 * 60 * 60, cache_file: Optional[str] = None) -> None:
+        """Initialize a new ModelDetailsCache.
+
+        Args:
+            ttl_seconds: How long an entry is served without re-fetching it.
+            cache_file: Optional path of a JSON file used to persist entries across processes.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.cache_file = cache_file
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._file_loaded = False
+
+    @staticmethod
+    def _key(model_id: str, region_name: Optional[str]) -> str:
+        return f"{region_name or 'default'}|{model_id}"
+
+    def _load_file(self) -> None:
+        """Load persisted entries once; a missing or malformed file is ignored."""
+        if self._file_loaded:
+            return
+        self._file_loaded = True
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, "r") as f:
+                self._entries.update(json.load(f))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable model details cache {self.cache_file}: {str(e)}")
+
+    def _save_file(self) -> None:
+        """Atomically write all entries to the cache file."""
+        if not self.cache_file:
+            return
+        tmp_file = f"{self.cache_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(self._entries, f, default=str)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            logger.warning(f"Could not persist model details cache {self.cache_file}: {str(e)}")
+
+    def get(self, model_id: str, region_name: Optional[str], loader: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return the details of a model, calling ``loader`` only when no fresh entry exists.
+
+        Args:
+            model_id: The model identifier.
+            region_name: The region the details were requested in.
+            loader: Callable fetching the details from the Bedrock control plane.
+
+        Returns:
+            dict: A copy of the cached model details.
+
+        Raises:
+            Exception: Whatever ``loader`` raised, if there is no stale entry to fall back on.
+        """
+        key = self._key(model_id, region_name)
+        with self._lock:
+            self._load_file()
+            entry = self._entries.get(key)
+        if entry is not None and time.time() - entry["fetched_at"] < self.ttl_seconds:
+            return copy.deepcopy(entry["details"])
+
+        try:
+            details = loader()
+        except Exception as e:
+            if entry is None:
+                raise
+            logger.warning(f"Could not refresh details for {model_id}, using cached copy: {str(e)}")
+            # Serve the stale entry for a while before trying the control plane again
+            retry_interval = min(self.ttl_seconds, 300)
+            with self._lock:
+                entry["fetched_at"] = time.time() - self.ttl_seconds + retry_interval
+            return copy.deepcopy(entry["details"])
+
+        with self._lock:
+            self._entries[key] = {"details": copy.deepcopy(details), "fetched_at": time.time()}
+            self._save_file()
+        return details
+
+    def invalidate(self, model_id: Optional[str] = None, region_name: Optional[str] = None) -> None:
+        """Drop one entry, or every entry when no model id is given."""
+        with self._lock:
+            if model_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(self._key(model_id, region_name), None)
+            self._save_file()
+
+
+# Shared by every BotoHelper that is not given its own cache
+default_model_details_cache = ModelDetailsCache()
@@ -0,0 +1,124 @@
+import random
+import time
+from typing import Any, Callable, Dict, Optional
+from loguru import logger
+import botocore.exceptions
+
+
+class RetryPolicy:
+    """Retries throttled and transiently failing AWS calls with exponential backoff.
+
+    Delays use "full jitter": before retry ``n`` the policy sleeps a random time between
+    0 and ``min(max_delay, base_delay * 2 ** n)``, which spreads out clients that were
+    throttled at the same moment. Retrying stops after ``max_attempts`` calls, or when
+    the next delay would exceed the ``max_elapsed`` budget, and the last error is raised.
+
+    Errors are classified by their AWS error code: throttling and service-side transient
+    errors are retried, client errors (validation, access denied, ...) are raised at once.
+    Connection and read timeouts are treated as transient.
+    """
+
+    THROTTLING_ERROR_CODES = frozenset({
+        "ThrottlingException",
+        "Throttling",
+        "TooManyRequestsException",
+        "ServiceQuotaExceededException",
+        "ProvisionedThroughputExceededException",
+        "RequestLimitExceeded",
+        "SlowDown",
+    })
+    TRANSIENT_ERROR_CODES = frozenset({
+        "ServiceUnavailableException",
+        "ServiceUnavailable",
+        "InternalServerException",
+        "InternalFailure",
+        "ModelNotReadyException",
+        "ModelTimeoutException",
+        "RequestTimeout",
+        "RequestTimeoutException",
+    })
+
+    def __init__(self,
+                 max_attempts: int = 6,
+                 base_delay: float = 0.5,
+                 max_delay: float = 20.0,
+                 max_elapsed: float = 120.0,
+                 retry_on_timeouts: bool = True) -> None:
+        """Initialize a new RetryPolicy.
+
+        Args:
+            max_attempts: Maximum number of calls, including the first one.
+            base_delay: Upper bound of the first backoff delay, in seconds.
+            max_delay: Cap of any single backoff delay, in seconds.
+            max_elapsed: Total time budget, in seconds, beyond which no retry is started.
+            retry_on_timeouts: Whether connection errors and read timeouts are retried.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_elapsed = max_elapsed
+        self.retry_on_timeouts = retry_on_timeouts
+
+    @staticmethod
+    def error_code(error: BaseException) -> Optional[str]:
+        """Return the AWS error code of an exception, or None."""
+        if isinstance(error, botocore.exceptions.ClientError):
+            code = error.response.get("Error", {}).get("Code")
+            # Stream events name their errors in camelCase (e.g. "throttlingException")
+            return code[:1].upper() + code[1:] if code else code
+        return None
+
+    def classify(self, error: BaseException) -> str:
+        """Classify an error as "throttling", "transient" or "fatal"."""
+        code = self.error_code(error)
+        if code in self.THROTTLING_ERROR_CODES:
+            return "throttling"
+        if code in self.TRANSIENT_ERROR_CODES:
+            return "transient"
+        if self.retry_on_timeouts and isinstance(error, (
+                botocore.exceptions.ConnectionError,
+                botocore.exceptions.ReadTimeoutError,
+                botocore.exceptions.ConnectTimeoutError)):
+            return "transient"
+        return "fatal"
+
+    def backoff_delay(self, retry: int) -> float:
+        """Return the jittered delay before the given retry (0 for the first retry)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** retry)))
+
+    def execute(self, func: Callable[[], Any], stats: Optional[Dict[str, Any]] = None) -> Any:
+        """Call ``func`` until it succeeds, a fatal error occurs or the budget is spent.
+
+        Args:
+            func: A callable without arguments making the AWS call.
+            stats: Optional dict updated in place with "retries" and "retry_backoff_time".
+
+        Returns:
+            Whatever ``func`` returns.
+
+        Raises:
+            Exception: The last error raised by ``func``.
+        """
+        if stats is not None:
+            stats.setdefault("retries", 0)
+            stats.setdefault("retry_backoff_time", 0.0)
+
+        start_t = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return func()
+            except Exception as e:
+                attempt += 1
+                kind = self.classify(e)
+                if kind == "fatal" or attempt >= self.max_attempts:
+                    raise
+                delay = self.backoff_delay(attempt - 1)
+                if time.monotonic() - start_t + delay > self.max_elapsed:
+                    raise
+                logger.warning(f"Retrying after {kind} error ({self.error_code(e) or type(e).__name__}), "
+                               f"attempt {attempt + 1}/{self.max_attempts} in {delay:.2f}s")
+                time.sleep(delay)
+                if stats is not None:
+                    stats["retries"] += 1
+                    stats["retry_backoff_time"] += delay
@@ -2,7 +2,6 @@ from loguru import logger
 from io import BytesIO
 from .utils import Utils
 import os
-import pandas as pd
 import io
 
 
@@ -41,6 +40,22 @@ class S3Helper:
 
         return text
 
+    def read_s3_bytes(self, s3_file_path):
+        """
+        Download the raw bytes of an S3 object (e.g. an image or video to attach to a request).
+        Uses a managed transfer, so large objects are fetched as concurrent ranged GETs.
+        """
+        bucket_name, key_name = self.parse_s3_path(s3_file_path)
+        try:
+            logger.info(f"Downloading file from S3: {s3_file_path}")
+            buffer = BytesIO()
+            self.s3_client.download_fileobj(Bucket=bucket_name, Key=key_name, Fileobj=buffer)
+        except Exception as e:
+            user_friendly_error = Utils.get_user_friendly_error(e)
+            logger.error(user_friendly_error)
+            raise ValueError(user_friendly_error)
+        return buffer.getvalue()
+
     def parse_s3_path(self, s3_file_path):
         if not s3_file_path.startswith('s3://'):
             logger.error(
@@ -55,6 +70,62 @@ class S3Helper:
                 "Invalid S3 path format. It should be 's3://bucket_name/key_name'.")
         return parts[0], parts[1]
 
+    def upload_fileobj(self, fileobj, s3_uri, content_type="application/octet-stream"):
+        """
+        Upload a file-like object (or bytes) to an S3 URI without writing it to disk first.
+        Uses a managed transfer, so large objects are sent as a concurrent multipart upload.
+        """
+        bucket_name, key_name = self.parse_s3_path(s3_uri)
+        if isinstance(fileobj, (bytes, bytearray)):
+            fileobj = BytesIO(fileobj)
+        try:
+            self.s3_client.upload_fileobj(
+                Fileobj=fileobj, Bucket=bucket_name, Key=key_name, ExtraArgs={"ContentType": content_type}
+            )
+            logger.info(f"Uploaded to S3: {s3_uri}")
+        except Exception as e:
+            user_friendly_error = Utils.get_user_friendly_error(e)
+            logger.error(user_friendly_error)
+            raise ValueError(user_friendly_error)
+        return s3_uri
+
+    def get_s3_object_version(self, s3_uri):
+        """
+        Return the version id of an S3 object, or its ETag when the bucket is not versioned,
+        without downloading it.
+        """
+        bucket_name, key_name = self.parse_s3_path(s3_uri)
+        try:
+            response = self.s3_client.head_object(Bucket=bucket_name, Key=key_name)
+        except Exception as e:
+            user_friendly_error = Utils.get_user_friendly_error(e)
+            logger.error(user_friendly_error)
+            raise ValueError(user_friendly_error)
+        version_id = response.get('VersionId')
+        if version_id and version_id != 'null':
+            return version_id
+        return response['ETag']
+
+    def iter_s3_lines(self, s3_uri):
+        """
+        Yield the lines of an S3 object as decoded strings, streaming the body instead of
+        reading the whole object into memory.
+        """
+        bucket_name, key_name = self.parse_s3_path(s3_uri)
+        try:
+            response = self.s3_client.get_object(Bucket=bucket_name, Key=key_name)
+        except self.s3_client.exceptions.NoSuchKey:
+            logger.error(f"The file {s3_uri} does not exist in the S3 bucket. Please check the S3 file path.")
+            raise ValueError(f"The file {s3_uri} does not exist in the S3 bucket. Please check the S3 file path.")
+        except Exception as e:
+            user_friendly_error = Utils.get_user_friendly_error(e)
+            logger.error(user_friendly_error)
+            raise ValueError(user_friendly_error)
+
+        for line in response['Body'].iter_lines():
+            if line:
+                yield line.decode('utf-8')
+
     def get_s3_object(self, bucket_name, key_name):
         try:
             response = self.s3_client.get_object(Bucket=bucket_name, Key=key_name)
@@ -186,6 +257,8 @@ class S3Helper:
             return None, None
 
     def fetch_csv_files(self, s3_file_paths: dict) -> dict:
+        import pandas as pd
+
         dataframes = {}
         for name, s3_file_path in s3_file_paths.items():
             bucket_name, key_name = self.parse_s3_path(s3_file_path)
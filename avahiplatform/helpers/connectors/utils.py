@@ -1,18 +1,18 @@
 from loguru import logger
 import botocore.exceptions
-import pymupdf
-import docx
 import json
 import base64
 from io import BytesIO
-from PIL import Image
-from typing import Dict, Any
+from typing import Dict, Any, TYPE_CHECKING
 import os
-import numpy as np
 import contextlib
 import ast
 import io
 
+# pymupdf, docx, PIL and numpy are imported inside the helpers that need them
+if TYPE_CHECKING:
+    from PIL import Image
+
 class PythonASTREPL:
     def __init__(self, dataframes=None, locals=None, globals=None):
         """
@@ -83,6 +83,21 @@ class PythonASTREPL:
 
 class Utils:
     """Utility class containing helper methods used across the application."""
+
+    @staticmethod
+    def default_cache_path(filename: str) -> str:
+        """
+        Returns the path of a file in the per-user avahiplatform cache directory
+        ($XDG_CACHE_HOME or ~/.cache, under avahiplatform/).
+
+        Args:
+            filename (str): Name of the file in the cache directory
+
+        Returns:
+            str: The path of the file
+        """
+        cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return os.path.join(cache_dir, "avahiplatform", filename)
     
     @staticmethod
     def get_user_friendly_error(error: Exception) -> str:
@@ -103,7 +118,7 @@ class Utils:
             return f"An unexpected error occurred: {str(error)}."
 
     @staticmethod
-    def transform_response_to_pillow(response: Dict[str, Any], model_name: str) -> Image.Image:
+    def transform_response_to_pillow(response: Dict[str, Any], model_name: str) -> "Image.Image":
         """
         Transform a base64 image response from various AI models into a Pillow Image.
         
@@ -117,6 +132,8 @@ class Utils:
         Raises:
             ValueError: If the model_name is not supported or if response format is invalid
         """
+        from PIL import Image
+
         try:
             model_response = json.loads(response.get('body').read())
             
@@ -152,6 +169,8 @@ class Utils:
 
     @staticmethod
     def read_pdf(file_obj):
+        import pymupdf
+
         logger.info(f"Reading PDF content from in-memory file object")
         doc = pymupdf.open(file_obj)
         text = ""
@@ -161,6 +180,8 @@ class Utils:
 
     @staticmethod
     def read_pdf_from_stream(file_obj):
+        import pymupdf
+
         logger.info(f"Reading PDF content from in-memory file object")
         doc = pymupdf.open(stream=file_obj, filetype="pdf")
         text = ""
@@ -170,6 +191,8 @@ class Utils:
 
     @staticmethod
     def read_docx(file_obj):
+        import docx
+
         logger.info(f"Reading DOCX content from in-memory file object")
         doc = docx.Document(file_obj)
         return "\n".join([paragraph.text for paragraph in doc.paragraphs])
@@ -218,6 +241,8 @@ class Utils:
         Raises:
             ValueError: If the input format is not supported or if S3 operations fail
         """
+        from PIL import Image
+
         if isinstance(input_image, bytes):
             return input_image
         elif isinstance(input_image, Image.Image):
@@ -240,6 +265,7 @@ class Utils:
 
     @staticmethod
     def cosine_similarity(vector, matrix_or_vector):
+        import numpy as np
 
         if matrix_or_vector.ndim == 1:
             # Compute cosine similarity between two vectors
@@ -1,7 +1,30 @@
-from .base_embeddings import BaseEmbeddings
-from .bedrock_embeddings import BedrockEmbeddings
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .base_embeddings import BaseEmbeddings
+    from .bedrock_embeddings import BedrockEmbeddings
+
+# Submodules are imported on first attribute access (PEP 562)
+_LAZY_IMPORTS = {
+    "BaseEmbeddings": ".base_embeddings",
+    "BedrockEmbeddings": ".bedrock_embeddings",
+}
 
 __all__ = [
     "BaseEmbeddings",
     "BedrockEmbeddings"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
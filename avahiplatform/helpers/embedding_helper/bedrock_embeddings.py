@@ -100,20 +100,14 @@ class BedrockEmbeddings(BaseEmbeddings):
                   - outputModalities
                   - region_name (added from client metadata)
         
+        Details are served from the BotoHelper model details cache after the first lookup.
+
         Raises:
             Exception: Propagates any exceptions that occur during the API call.
         """
-        # Create a client for the Bedrock control plane (non-runtime API)
-        bedrock_control_client = self.boto_helper.create_client(service_name="bedrock")
         try:
-            response = bedrock_control_client.get_foundation_model(
-                modelIdentifier=self.model_id
-            )
-            # Include the region in the model details for additional context
-            response["modelDetails"].update({
-                "region_name": bedrock_control_client.meta.region_name
-            })
-            return response["modelDetails"]
+            # The cached details already include the region for additional context
+            return self.boto_helper.get_model_details(self.model_id)
         except Exception as e:
             raise e
 
@@ -206,12 +200,14 @@ class BedrockEmbeddings(BaseEmbeddings):
 
         return json.dumps(request_body)
 
-    def _execute_request(self, body):
+    def _execute_request(self, body, retry_stats=None):
         """
         Invokes the Bedrock model using the provided request body.
+        Throttled and transiently failing calls are retried by the boto_helper retry policy.
 
         Args:
             body (str): A JSON string representing the prepared request body.
+            retry_stats (dict): Optional dict receiving the "retries" and "retry_backoff_time" counters.
 
         Returns:
             object: The response from the Bedrock service which includes metadata and the response body.
@@ -220,11 +216,14 @@ class BedrockEmbeddings(BaseEmbeddings):
             Exception: Propagates any exceptions encountered during model invocation.
         """
         try:
-            response = self.bedrock.invoke_model(
-                body=body,
-                modelId=self.model_id,
-                accept="application/json",
-                contentType="application/json"
+            response = self.boto_helper.retry_policy.execute(
+                lambda: self.bedrock.invoke_model(
+                    body=body,
+                    modelId=self.model_id,
+                    accept="application/json",
+                    contentType="application/json"
+                ),
+                retry_stats
             )
             return response
         except Exception as e:
@@ -246,6 +245,7 @@ class BedrockEmbeddings(BaseEmbeddings):
                   - embeddings: The generated embeddings.
                   - inputTokens: The number of input tokens counted by Bedrock.
                   - latency: The model invocation latency as reported by Bedrock.
+                  - retries, retry_backoff_time: Retries made after throttling and the time spent backing off.
                   - model_id: The identifier of the model used.
                   - provider: A string that identifies the provider and region.
         """
@@ -253,7 +253,8 @@ class BedrockEmbeddings(BaseEmbeddings):
         request_body = self._prepare_request(**kwargs)
 
         # Execute the request using the Bedrock runtime client
-        response = self._execute_request(request_body)
+        retry_stats = {"retries": 0, "retry_backoff_time": 0.0}
+        response = self._execute_request(request_body, retry_stats)
 
         # Extract header metadata such as token count and latency
         inputTokens = response.get("ResponseMetadata").get("HTTPHeaders").get("x-amzn-bedrock-input-token-count", 0)
@@ -273,6 +274,8 @@ class BedrockEmbeddings(BaseEmbeddings):
             "embeddings": embeddings,
             "inputTokens": inputTokens,
             "latency": latency,
+            "retries": retry_stats["retries"],
+            "retry_backoff_time": retry_stats["retry_backoff_time"],
             "model_id": self.model_id,
             "provider": f"Bedrock:{self.model_details['region_name']}:{self.model_details['providerName']}"
         }
\ No newline at end of file
@@ -1,5 +1,31 @@
-from .bedrock_image_generation import BedrockImageGeneration
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .bedrock_image_generation import BedrockImageGeneration
+    from .image_optimizer import ImageOptimizer
+
+# Submodules are imported on first attribute access (PEP 562), so PIL is only
+# loaded when image generation is actually used.
+_LAZY_IMPORTS = {
+    "BedrockImageGeneration": ".bedrock_image_generation",
+    "ImageOptimizer": ".image_optimizer",
+}
 
 __all__ = [
-    "BedrockImageGeneration"
-]
\ No newline at end of file
+    "BedrockImageGeneration",
+    "ImageOptimizer"
+]
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -106,22 +106,16 @@ class BedrockImageGeneration(BaseImageGeneration):
         """
         Retrieves details about the foundation model from the Bedrock service.
 
+        Details are served from the BotoHelper model details cache after the first lookup.
+
         Returns:
             dict: A dictionary containing model metadata (ARN, ID, name, provider, etc.).
 
         Raises:
             Exception: If the retrieval of model details fails.
         """
-        # Create a separate client for the Bedrock control plane (non-runtime) API
-        bedrock_control_client = self.boto_helper.create_client(service_name="bedrock")
         try:
-            response = bedrock_control_client.get_foundation_model(
-                modelIdentifier=self.model_id
-            )
-            response["modelDetails"].update({
-                "region_name": bedrock_control_client.meta.region_name
-            })
-            return response["modelDetails"]
+            return self.boto_helper.get_model_details(self.model_id)
         except Exception as e:
             raise
 
@@ -276,12 +270,14 @@ class BedrockImageGeneration(BaseImageGeneration):
 
         return json.dumps(request_body)
 
-    def _invoke(self, body):
+    def _invoke(self, body, retry_stats=None):
         """
         Invokes the Bedrock model with the given request body.
+        Throttled and transiently failing calls are retried by the boto_helper retry policy.
 
         Args:
             body (str): JSON-encoded request body.
+            retry_stats (dict): Optional dict receiving the "retries" and "retry_backoff_time" counters.
 
         Returns:
             dict: Decoded JSON response from the model invocation.
@@ -289,11 +285,14 @@ class BedrockImageGeneration(BaseImageGeneration):
         Raises:
             Exception: If any error occurs while reading the response.
         """
-        response = self.bedrock.invoke_model(
-            modelId=self.model_id,
-            body=body,
-            accept="application/json",
-            contentType="application/json"
+        response = self.boto_helper.retry_policy.execute(
+            lambda: self.bedrock.invoke_model(
+                modelId=self.model_id,
+                body=body,
+                accept="application/json",
+                contentType="application/json"
+            ),
+            retry_stats
         )
 
         return response
@@ -320,6 +319,7 @@ class BedrockImageGeneration(BaseImageGeneration):
                 - dict: A dictionary containing additional details, including:
                     - Model metadata (ARN, ID, name, provider)
                     - Seed used for generation
+                    - Retries made after throttling and the time spent backing off
                     - Invocation latency (if available)
 
         Raises:
@@ -335,7 +335,8 @@ class BedrockImageGeneration(BaseImageGeneration):
         body = self._prepare_request(prompt, **kwargs)
 
         # Step 2: Invoke the model using the prepared request body.
-        response = self._invoke(body)
+        retry_stats = {"retries": 0, "retry_backoff_time": 0.0}
+        response = self._invoke(body, retry_stats)
 
         # Step 3: Decode the response from JSON format.
         body_response = json.loads(response["body"].read().decode("utf-8"))
@@ -366,6 +367,7 @@ class BedrockImageGeneration(BaseImageGeneration):
         # Step 7: Collect additional details, including model metadata and seed.
         details = self.get_model_details
         details["seed"] = seed
+        details.update(retry_stats)
 
         # Attempt to retrieve invocation latency from the response metadata.
         metadata = response["ResponseMetadata"]["HTTPHeaders"]
@@ -0,0 +1,182 @@
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ImageOptimizer:
+    """
+    Downscales and recompresses images before they are sent to a multimodal model.
+
+    Images whose long edge exceeds ``max_edge`` are resized (models downscale larger
+    images anyway, so detail is not lost but upload time and input tokens are). They are
+    re-encoded as ``image_format`` (or their own format) with EXIF and other metadata
+    stripped, after applying the EXIF orientation. If the result is over ``max_bytes``,
+    the quality and then the size are lowered until it fits.
+
+    An image is sent unchanged when optimizing it would not make it smaller, and animated
+    images are always sent unchanged. Results are cached by content hash, and batches are
+    processed on a worker pool. PIL is imported on first use.
+
+    Attributes:
+        max_edge (int): Maximum length of the long edge, in pixels.
+        image_format (str): "jpeg", "png" or "webp", or None to keep each image's format.
+        quality (int): Encoder quality for jpeg and webp.
+        strip_exif (bool): Drop EXIF and other metadata from re-encoded images.
+        max_bytes (int): Optional upper bound of the optimized image size.
+        cache_size (int): Number of optimized images kept, by content hash.
+        max_workers (int): Size of the worker pool used by optimize_many.
+    """
+
+    FORMATS = {"jpeg": "JPEG", "png": "PNG", "webp": "WEBP", "gif": "GIF"}
+    MIN_QUALITY = 40
+    MIN_EDGE = 64
+
+    def __init__(self,
+                 max_edge=1568,
+                 image_format=None,
+                 quality=85,
+                 strip_exif=True,
+                 max_bytes=None,
+                 cache_size=256,
+                 max_workers=4):
+        """
+        Initializes the image optimizer.
+        """
+        if image_format is not None and image_format not in ("jpeg", "png", "webp"):
+            raise ValueError("image_format must be 'jpeg', 'png', 'webp' or None")
+        self.max_edge = max_edge
+        self.image_format = image_format
+        self.quality = quality
+        self.strip_exif = strip_exif
+        self.max_bytes = max_bytes
+        self.cache_size = cache_size
+        self.max_workers = max_workers
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = None
+        self.images = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix="image-optimizer")
+        return self._executor
+
+    def optimize(self, data):
+        """
+        Optimizes one image.
+
+        Parameters:
+            data (bytes): The encoded image.
+
+        Returns:
+            tuple: (image bytes, format, bytes saved). The format is one of "jpeg", "png",
+                "webp" or "gif"; bytes saved is 0 when the image is sent unchanged.
+        """
+        key = hashlib.sha256(data).digest()
+        with self._lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+        if result is None:
+            result = self._optimize(data)
+            with self._lock:
+                self._cache[key] = result
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        optimized, image_format = result
+        with self._lock:
+            self.images += 1
+            self.bytes_in += len(data)
+            self.bytes_out += len(optimized)
+        return optimized, image_format, len(data) - len(optimized)
+
+    def optimize_many(self, images):
+        """
+        Optimizes several images on the worker pool.
+
+        Parameters:
+            images (list): Encoded images, as bytes.
+
+        Returns:
+            list: One (image bytes, format, bytes saved) tuple per image, in order.
+        """
+        if len(images) < 2:
+            return [self.optimize(data) for data in images]
+        return list(self._get_executor().map(self.optimize, images))
+
+    def _optimize(self, data):
+        from PIL import Image, ImageOps
+
+        with Image.open(io.BytesIO(data)) as image:
+            source_format = (image.format or "").lower()
+            if source_format == "mpo":
+                # Multi-picture JPEGs from phone cameras: keep the primary image
+                source_format = "jpeg"
+            if getattr(image, "is_animated", False) or source_format not in self.FORMATS:
+                return data, source_format or "png"
+            # Returns a rotated copy, with the orientation tag removed from its EXIF
+            image = ImageOps.exif_transpose(image)
+            exif = image.info.get("exif")
+
+        needs_resize = max(image.size) > self.max_edge
+        if needs_resize:
+            image.thumbnail((self.max_edge, self.max_edge), Image.LANCZOS)
+
+        target_format = self.image_format or source_format
+        if target_format == "gif":
+            target_format = "png"
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info)
+        if target_format == "jpeg" and has_alpha:
+            # JPEG has no alpha channel; keep transparency rather than flatten it
+            target_format = "png"
+
+        quality = self.quality
+        optimized = self._encode(image, target_format, quality, exif)
+        while self.max_bytes and len(optimized) > self.max_bytes:
+            if target_format in ("jpeg", "webp") and quality > self.MIN_QUALITY:
+                quality = max(self.MIN_QUALITY, quality - 15)
+            elif max(image.size) > self.MIN_EDGE:
+                image = image.resize(
+                    (max(1, int(image.width * 0.75)), max(1, int(image.height * 0.75))), Image.LANCZOS
+                )
+            else:
+                break
+            optimized = self._encode(image, target_format, quality, exif)
+
+        within_budget = not self.max_bytes or len(data) <= self.max_bytes
+        if len(optimized) >= len(data) and not needs_resize and within_budget and \
+                (self.image_format is None or self.image_format == source_format):
+            return data, source_format
+        return optimized, target_format
+
+    def _encode(self, image, image_format, quality, exif):
+        if (image_format == "jpeg" and image.mode not in ("RGB", "L")) or image.mode == "CMYK":
+            image = image.convert("RGB")
+        options = {"optimize": True}
+        if image_format in ("jpeg", "webp"):
+            options["quality"] = quality
+            if not self.strip_exif and exif:
+                options["exif"] = exif
+        buffer = io.BytesIO()
+        image.save(buffer, format=self.FORMATS[image_format], **options)
+        return buffer.getvalue()
+
+    def get_stats(self):
+        """
+        Returns the number of images optimized and the bytes before and after.
+        """
+        return {
+            "images": self.images,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "bytes_saved": self.bytes_in - self.bytes_out,
+        }
@@ -1,31 +1,48 @@
-from avahiplatform.helpers import (
-    BedrockChat,
-    BotoHelper,
-    S3Helper,
-    Utils
-)
+from avahiplatform.helpers.connectors.boto_helper import BotoHelper
+from avahiplatform.helpers.connectors.model_details_cache import ModelDetailsCache
+from avahiplatform.helpers.connectors.utils import Utils
 from avahiplatform.src import (
     FunctionWrapper,
     track_observability,
-    Observability,
-    BedrockSummarizer,
-    BedrockStructuredExtraction,
-    ProductDescriptionGeneration, 
-    GrammarCorrection,
-    DataMasking,
-    BedrockChatbot,
-    QueryCSV,
-    ICDCodeGenerator,
-    MedicalScribe,
-    BedrockNL2SQL,
-    ImageGeneration,
-    BedrockImageSimilarity
+    Observability
 )
 
 import os
+import json
+import mimetypes
+import threading
 from loguru import logger
 
 
+class lazy_component:
+    """Descriptor that builds an AvahiPlatform component the first time it is accessed.
+
+    The factory runs at most once per instance, under the instance's
+    ``_component_lock``; the result is stored in the instance ``__dict__`` so
+    later lookups bypass the descriptor entirely.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.__doc__ = factory.__doc__
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return instance.__dict__[self.name]
+        except KeyError:
+            pass
+        # Re-entrant lock: factories may depend on other lazy components
+        with instance._component_lock:
+            if self.name not in instance.__dict__:
+                instance.__dict__[self.name] = self.factory(instance)
+        return instance.__dict__[self.name]
+
+
 class AvahiPlatform:
     def __init__(self, 
                  aws_access_key_id=None, 
@@ -39,7 +56,19 @@ class AvahiPlatform:
                  p=0.5,
                  input_bucket_name_for_medical_scribing="",
                  iam_arn_for_medical_scribing="",
-                 default_model_name='anthropic.claude-3-sonnet-20240229-v1:0'):
+                 default_model_name='anthropic.claude-3-sonnet-20240229-v1:0',
+                 boto_client_config=None,
+                 retry_policy=None,
+                 admission_scheduler=None,
+                 model_details_cache_file=None,
+                 response_cache=None,
+                 prompt_caching=False,
+                 bedrock_regions=None,
+                 hedging_policy=None,
+                 semantic_cache_threshold=None,
+                 semantic_cache_embedding_model="amazon.titan-embed-text-v2:0",
+                 incremental_summary_db=None,
+                 image_optimizer=None):
 
         self.aws_access_key_id = aws_access_key_id
         self.aws_secret_access_key = aws_secret_access_key
@@ -53,88 +82,40 @@ class AvahiPlatform:
         self.output_tokens_price = output_tokens_price
 
         self.default_model_name = default_model_name
+        self.response_cache = response_cache
+        self.prompt_caching = prompt_caching
+        self.bedrock_regions = bedrock_regions
+        self.hedging_policy = hedging_policy
+        self.semantic_cache_threshold = semantic_cache_threshold
+        self.semantic_cache_embedding_model = semantic_cache_embedding_model
+        self.incremental_summary_db = incremental_summary_db
+        self.image_optimizer = image_optimizer
+
+        # Model details are cached process-wide; optionally persisted to disk as well
+        model_details_cache = None
+        if model_details_cache_file:
+            model_details_cache = ModelDetailsCache(cache_file=model_details_cache_file)
 
         # Initialize boto helper
         self.boto_helper = BotoHelper(
             aws_access_key_id=self.aws_access_key_id,
             aws_secret_access_key=self.aws_secret_access_key,
             aws_session_token=self.aws_session_token,
-            region_name=self.region_name
+            region_name=self.region_name,
+            model_details_cache=model_details_cache,
+            retry_policy=retry_policy,
+            admission_scheduler=admission_scheduler,
+            **(boto_client_config or {})
         )
 
-        self.s3_helper = S3Helper(
-            s3_client=self.boto_helper.create_client(service_name="s3")
-        )
+        self.input_bucket_name_for_medical_scribing = input_bucket_name_for_medical_scribing
+        self.iam_arn_for_medical_scribing = iam_arn_for_medical_scribing
 
         self.observability = Observability()
 
-        # Initialize BedrockChat
-        self.bedrockchat = BedrockChat(
-            model_id=self.default_model_name,
-            boto_helper=self.boto_helper,
-            input_tokens_price=self.input_tokens_price,
-            output_tokens_price=self.output_tokens_price,
-            max_tokens=self.max_tokens,
-            temperature=self.temperature,
-            p=self.p
-        )
-
-        self.summarizer = BedrockSummarizer(
-            bedrockchat=self.bedrockchat
-        )
-
-        self.structuredExtraction = BedrockStructuredExtraction(
-            bedrockchat=self.bedrockchat
-        )
-
-        self.productDescriptionAssistant = ProductDescriptionGeneration(
-            bedrockchat=self.bedrockchat
-        )
-
-        self.grammarAssistant = GrammarCorrection(
-            bedrockchat=self.bedrockchat
-        )
-
-        self.dataMasking = DataMasking(
-            bedrockchat=self.bedrockchat
-        )
-
-        self.chatbot = BedrockChatbot(
-            bedrockchat=self.bedrockchat
-        )
-
-        self.csv_querying = QueryCSV(
-            bedrockchat=self.bedrockchat,
-            s3_helper=self.s3_helper
-        )
-
-        self.icd_code_generator = ICDCodeGenerator(
-            bedrock_helper=self.boto_helper,
-            s3_helper=self.s3_helper
-        )
-
-        self.medical_scribing = MedicalScribe(
-            boto_helper=self.boto_helper,
-            s3_helper=self.s3_helper,
-            input_bucket_name=input_bucket_name_for_medical_scribing,
-            iam_arn=iam_arn_for_medical_scribing,
-            region_name=self.region_name
-        )
-
-        self.natural_language_to_sql = BedrockNL2SQL(
-            bedrockchat=self.bedrockchat
-        )
-
-        self.imageGeneration = ImageGeneration(
-            boto_helper=self.boto_helper,
-            default_model_id=self.default_model_name
-        )
-
-        self.imageSimilarity = BedrockImageSimilarity(
-            boto_helper=self.boto_helper,
-            s3_helper=self.s3_helper,
-            default_model_id=self.default_model_name
-        )
+        # Feature objects (and the boto clients behind them) are built lazily,
+        # on first attribute access, by the lazy_component descriptors below.
+        self._component_lock = threading.RLock()
 
         # Initialize observability
 
@@ -164,6 +145,8 @@ class AvahiPlatform:
         self.summarize_image = FunctionWrapper(summarize_image_with_tracking)
         self.summarize_video = FunctionWrapper(summarize_video_with_tracking)
         self.summarize_s3_document = FunctionWrapper(summarize_s3_document_with_tracking)
+        self.summarize_batch = FunctionWrapper(self._summarize_batch)
+        self.summarize_incremental = FunctionWrapper(self._summarize_incremental)
 
         self.medicalscribing = FunctionWrapper(self._medicalscribing)
         self.generate_icdcode = FunctionWrapper(self.icdcoding)
@@ -174,9 +157,13 @@ class AvahiPlatform:
         self.product_description_assistant = FunctionWrapper(self.product_description)
         self.nl2sql = FunctionWrapper(self.nlquery2sql)
         self.get_similar_images = FunctionWrapper(self._imageSimilarity)
+        self.extract_structures_batch = FunctionWrapper(self._structure_extraction_batch)
+        self.mask_data_batch = FunctionWrapper(self._data_masking_batch)
+        self.grammar_assistant_batch = FunctionWrapper(self._grammar_correction_batch)
 
 
         self.image_generation = FunctionWrapper(self._imageGeneration)
+        self.images_generation = FunctionWrapper(self._imagesGeneration)
         # self.pdfsummarizer = FunctionWrapper(pdfsummarizer)
         # self.perform_semantic_search = FunctionWrapper(perform_semantic_search)
         # self.perform_rag_with_sources = FunctionWrapper(perform_rag_with_sources)
@@ -184,6 +171,181 @@ class AvahiPlatform:
 
         self.initialize_observability = self._initialize_observability
 
+    @lazy_component
+    def s3_helper(self):
+        from avahiplatform.helpers import S3Helper
+
+        return S3Helper(
+            s3_client=self.boto_helper.create_client(service_name="s3")
+        )
+
+    @lazy_component
+    def bedrockchat(self):
+        from avahiplatform.helpers import BedrockChat, RoutedBedrockChat
+
+        if self.bedrock_regions:
+            # Route across several regions, failing over between them
+            return RoutedBedrockChat(
+                model_id=self.default_model_name,
+                boto_helper=self.boto_helper,
+                regions=self.bedrock_regions,
+                input_tokens_price=self.input_tokens_price,
+                output_tokens_price=self.output_tokens_price,
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                p=self.p,
+                response_cache=self.response_cache,
+                prompt_caching=self.prompt_caching,
+                hedging_policy=self.hedging_policy,
+                image_optimizer=self.image_optimizer
+            )
+
+        return BedrockChat(
+            model_id=self.default_model_name,
+            boto_helper=self.boto_helper,
+            input_tokens_price=self.input_tokens_price,
+            output_tokens_price=self.output_tokens_price,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            p=self.p,
+            response_cache=self.response_cache,
+            prompt_caching=self.prompt_caching,
+            hedging_policy=self.hedging_policy,
+            image_optimizer=self.image_optimizer
+        )
+
+    @lazy_component
+    def summarizer(self):
+        from avahiplatform.src import BedrockSummarizer
+
+        return BedrockSummarizer(
+            bedrockchat=self.bedrockchat
+        )
+
+    @lazy_component
+    def incrementalSummarizer(self):
+        from avahiplatform.src import IncrementalSummarizer, IncrementalSummaryStore
+
+        return IncrementalSummarizer(
+            bedrockchat=self.bedrockchat,
+            store=IncrementalSummaryStore(self.incremental_summary_db)
+        )
+
+    @lazy_component
+    def structuredExtraction(self):
+        from avahiplatform.src import BedrockStructuredExtraction
+
+        return BedrockStructuredExtraction(
+            bedrockchat=self.bedrockchat
+        )
+
+    @lazy_component
+    def productDescriptionAssistant(self):
+        from avahiplatform.src import ProductDescriptionGeneration
+
+        return ProductDescriptionGeneration(
+            bedrockchat=self.bedrockchat
+        )
+
+    @lazy_component
+    def grammarAssistant(self):
+        from avahiplatform.src import GrammarCorrection
+
+        return GrammarCorrection(
+            bedrockchat=self.bedrockchat
+        )
+
+    @lazy_component
+    def dataMasking(self):
+        from avahiplatform.src import DataMasking
+
+        return DataMasking(
+            bedrockchat=self.bedrockchat
+        )
+
+    @lazy_component
+    def chatbot(self):
+        from avahiplatform.src import BedrockChatbot
+
+        return BedrockChatbot(
+            bedrockchat=self.bedrockchat,
+            semantic_cache=self.semantic_cache
+        )
+
+    @lazy_component
+    def csv_querying(self):
+        from avahiplatform.src import QueryCSV
+
+        return QueryCSV(
+            bedrockchat=self.bedrockchat,
+            s3_helper=self.s3_helper
+        )
+
+    @lazy_component
+    def icd_code_generator(self):
+        from avahiplatform.src import ICDCodeGenerator
+
+        return ICDCodeGenerator(
+            bedrock_helper=self.boto_helper,
+            s3_helper=self.s3_helper
+        )
+
+    @lazy_component
+    def medical_scribing(self):
+        from avahiplatform.src import MedicalScribe
+
+        return MedicalScribe(
+            boto_helper=self.boto_helper,
+            s3_helper=self.s3_helper,
+            input_bucket_name=self.input_bucket_name_for_medical_scribing,
+            iam_arn=self.iam_arn_for_medical_scribing,
+            region_name=self.region_name
+        )
+
+    @lazy_component
+    def natural_language_to_sql(self):
+        from avahiplatform.src import BedrockNL2SQL
+
+        return BedrockNL2SQL(
+            bedrockchat=self.bedrockchat,
+            semantic_cache=self.semantic_cache
+        )
+
+    @lazy_component
+    def semantic_cache(self):
+        # Opt-in: only built (and the embedding model only resolved) when a threshold is configured
+        if self.semantic_cache_threshold is None:
+            return None
+        from avahiplatform.helpers import BedrockEmbeddings, SemanticResponseCache
+
+        return SemanticResponseCache(
+            embedder=BedrockEmbeddings(
+                model_id=self.semantic_cache_embedding_model,
+                boto_helper=self.boto_helper
+            ),
+            similarity_threshold=self.semantic_cache_threshold
+        )
+
+    @lazy_component
+    def imageGeneration(self):
+        from avahiplatform.src import ImageGeneration
+
+        return ImageGeneration(
+            boto_helper=self.boto_helper,
+            default_model_id=self.default_model_name
+        )
+
+    @lazy_component
+    def imageSimilarity(self):
+        from avahiplatform.src import BedrockImageSimilarity
+
+        return BedrockImageSimilarity(
+            boto_helper=self.boto_helper,
+            s3_helper=self.s3_helper,
+            default_model_id=self.default_model_name,
+            image_optimizer=self.image_optimizer
+        )
+
     @track_observability
     def icdcoding(self, input_content):
         try:
@@ -253,61 +415,113 @@ class AvahiPlatform:
             return "None"
 
     @track_observability
-    def structure_extraction(self, input_content, system_prompt=None, stream=False):
+    def structure_extraction(self, input_content, system_prompt=None, stream=False, as_generator=False):
         try:
             if os.path.exists(input_content):  # Check if input is a local file path
-                return self.structuredExtraction.extract_document(input_content, system_prompt, stream)
+                return self.structuredExtraction.extract_document(input_content, system_prompt, stream, as_generator)
             elif input_content.startswith('s3://'):  # Check if input is an S3 file path
-                return self.structuredExtraction.extract_s3_document(input_content, system_prompt, stream)
+                return self.structuredExtraction.extract_s3_document(input_content, system_prompt, stream, as_generator)
             else:  # Assume input is text
-                return self.structuredExtraction.extract_text(input_content, system_prompt, stream)
+                return self.structuredExtraction.extract_text(input_content, system_prompt, stream, as_generator)
         except Exception as e:
             user_friendly_error = Utils.get_user_friendly_error(e)
             logger.error(user_friendly_error)
             return "None"
 
     @track_observability
-    def data_masking(self, input_content, system_prompt=None, stream=False):
+    def data_masking(self, input_content, system_prompt=None, stream=False, as_generator=False):
         try:
             if os.path.exists(input_content):  # Check if input is a local file path
-                return self.dataMasking.mask_document(input_content, system_prompt, stream)
+                return self.dataMasking.mask_document(input_content, system_prompt, stream, as_generator)
             elif input_content.startswith('s3://'):  # Check if input is an S3 file path
-                return self.dataMasking.mask_s3_file(input_content, system_prompt, stream)
+                return self.dataMasking.mask_s3_file(input_content, system_prompt, stream, as_generator)
             else:  # Assume input is text
-                return self.dataMasking.mask_text(input_content, system_prompt, stream)
+                return self.dataMasking.mask_text(input_content, system_prompt, stream, as_generator)
         except Exception as e:
             user_friendly_error = Utils.get_user_friendly_error(e)
             logger.error(user_friendly_error)
             return "None"
 
     @track_observability
-    def grammar_correction(self, input_content, system_prompt=None, stream=False):
+    def grammar_correction(self, input_content, system_prompt=None, stream=False, as_generator=False):
         try:
             if os.path.exists(input_content):  # Check if input is a local file path
-                return self.grammarAssistant.correct_document(input_content, system_prompt, stream)
+                return self.grammarAssistant.correct_document(input_content, system_prompt, stream, as_generator)
             elif input_content.startswith('s3://'):  # Check if input is an S3 file path
-                return self.grammarAssistant.correct_s3_document(input_content, system_prompt, stream)
+                return self.grammarAssistant.correct_s3_document(input_content, system_prompt, stream, as_generator)
             else:  # Assume input is text
-                return self.grammarAssistant.correct_text(input_content, system_prompt, stream)
+                return self.grammarAssistant.correct_text(input_content, system_prompt, stream, as_generator)
         except Exception as e:
             user_friendly_error = Utils.get_user_friendly_error(e)
             logger.error(user_friendly_error)
             return "None"
     
     @track_observability
-    def product_description(self, product_sku, event_name, customer_segmentation, system_prompt=None, stream=False):
+    def _summarize_batch(self, input_contents, content_type="text", system_prompt=None, max_concurrency=8):
         try:
-            return self.productDescriptionAssistant.generate_product_description(product_sku, event_name, customer_segmentation, system_prompt, stream)
+            return self.summarizer.summarize_batch(input_contents, content_type, system_prompt, max_concurrency)
+        except Exception as e:
+            user_friendly_error = Utils.get_user_friendly_error(e)
+            logger.error(user_friendly_error)
+            return "None"
+
+    @track_observability
+    def _summarize_incremental(self, input_content, document_id=None, system_prompt=None):
+        try:
+            if os.path.exists(input_content):  # Check if input is a local file path
+                return self.incrementalSummarizer.summarize_file(input_content, system_prompt)
+            elif document_id is None:
+                raise ValueError("document_id is required to summarize text incrementally")
+            else:  # The current text of the document
+                return self.incrementalSummarizer.summarize(document_id, input_content, system_prompt)
+        except Exception as e:
+            user_friendly_error = Utils.get_user_friendly_error(e)
+            logger.error(user_friendly_error)
+            return "None"
+
+    @track_observability
+    def _structure_extraction_batch(self, input_contents, content_type="text", system_prompt=None, max_concurrency=8):
+        try:
+            return self.structuredExtraction.extract_batch(input_contents, content_type, system_prompt, max_concurrency)
+        except Exception as e:
+            user_friendly_error = Utils.get_user_friendly_error(e)
+            logger.error(user_friendly_error)
+            return "None"
+
+    @track_observability
+    def _data_masking_batch(self, input_contents, content_type="text", system_prompt=None, max_concurrency=8):
+        try:
+            return self.dataMasking.mask_batch(input_contents, content_type, system_prompt, max_concurrency)
+        except Exception as e:
+            user_friendly_error = Utils.get_user_friendly_error(e)
+            logger.error(user_friendly_error)
+            return "None"
+
+    @track_observability
+    def _grammar_correction_batch(self, input_contents, content_type="text", system_prompt=None, max_concurrency=8):
+        try:
+            return self.grammarAssistant.grammar_correction_batch(input_contents, content_type, system_prompt, max_concurrency)
+        except Exception as e:
+            user_friendly_error = Utils.get_user_friendly_error(e)
+            logger.error(user_friendly_error)
+            return "None"
+
+    @track_observability
+    def product_description(self, product_sku, event_name, customer_segmentation, system_prompt=None, stream=False,
+                            as_generator=False):
+        try:
+            return self.productDescriptionAssistant.generate_product_description(product_sku, event_name, customer_segmentation,
+                                                                                 system_prompt, stream, as_generator)
         except Exception as e:
             user_friendly_error = Utils.get_user_friendly_error(e)
             logger.error(user_friendly_error)
 
     @track_observability
     def nlquery2sql(self, nl_query, db_type, username, password, host,
-           port, dbname, db_path=None, user_prompt=None, stream=False):
+           port, dbname, db_path=None, user_prompt=None, stream=False, as_generator=False):
         try:
             return self.natural_language_to_sql.get_answer_from_db(db_type, nl_query, username, password, host,
-                           port, dbname, db_path, user_prompt, stream)
+                           port, dbname, db_path, user_prompt, stream, as_generator)
         except Exception as e:
             user_friendly_error = Utils.get_user_friendly_error(e)
             logger.error(user_friendly_error)
@@ -322,8 +536,19 @@ class AvahiPlatform:
             logger.error(user_friendly_error)
             return "None"
 
+    @track_observability
+    def _imagesGeneration(self, image_prompts, max_concurrency=4):
+        try:
+            return self.imageGeneration.generate_images(image_prompts, max_concurrency=max_concurrency)
+        except Exception as e:
+            user_friendly_error = Utils.get_user_friendly_error(e)
+            logger.error(user_friendly_error)
+            return "None"
+
     @track_observability
     def _imageSimilarity(self, image, other_file, k=10, embedding_length=256):
+        from PIL import Image
+
         try:
             if isinstance(other_file, str):
                 if os.path.isfile(other_file) or (other_file.startswith("s3://") and mimetypes.guess_type(other_file)[0] is not None):
@@ -1,6 +1,6 @@
 import time
+import inspect
 from functools import wraps
-from prometheus_client import Counter, Histogram, Gauge, start_http_server, REGISTRY
 import threading
 import json
 from datetime import datetime
@@ -22,7 +22,7 @@ class Observability:
             self.metrics_file = 'metrics.jsonl'
             self.prometheus_started = False
             self.prometheus_port = 8000
-            self.registry = REGISTRY
+            self.registry = None
 
             # Load existing metrics or initialize
             self._metrics_lock = threading.Lock()
@@ -35,6 +35,22 @@ class Observability:
             else:
                 self.metrics_data = {"functions": {}}
 
+            # Prometheus metrics are created on first use, so prometheus_client
+            # is not imported until something is actually tracked
+            self._prometheus_lock = threading.Lock()
+            self._prometheus_ready = False
+
+            self.initialized = True
+
+    def _ensure_prometheus_metrics(self):
+        if self._prometheus_ready:
+            return
+        with self._prometheus_lock:
+            if self._prometheus_ready:
+                return
+            from prometheus_client import REGISTRY
+            self.registry = REGISTRY
+
             # Ensure Prometheus metrics are not duplicated
             self.request_counter = self._get_or_create_counter(
                 'bedrock_requests_total',
@@ -60,10 +76,30 @@ class Observability:
                 'bedrock_total_cost_dollars',
                 'Total cumulative cost in dollars'
             )
-
-            self.initialized = True
+            self.cache_hits = self._get_or_create_counter(
+                'bedrock_response_cache_hits_total',
+                'Total number of requests served from the response cache',
+                ['function_name', 'model_name']
+            )
+            self.cache_misses = self._get_or_create_counter(
+                'bedrock_response_cache_misses_total',
+                'Total number of response cache lookups that called Bedrock',
+                ['function_name', 'model_name']
+            )
+            self.cache_saved_cost = self._get_or_create_counter(
+                'bedrock_response_cache_saved_cost_dollars',
+                'Total cost in dollars saved by response cache hits',
+                ['function_name', 'model_name']
+            )
+            self.hedge_wasted_cost = self._get_or_create_counter(
+                'bedrock_hedge_wasted_cost_dollars',
+                'Total cost in dollars of hedged requests whose response was discarded',
+                ['function_name', 'model_name']
+            )
+            self._prometheus_ready = True
 
     def _get_or_create_counter(self, name, documentation, labelnames):
+        from prometheus_client import Counter
         try:
             return Counter(name, documentation, labelnames, registry=self.registry)
         except ValueError:
@@ -71,6 +107,7 @@ class Observability:
             return self.registry._names_to_collectors[name]
 
     def _get_or_create_histogram(self, name, documentation, labelnames):
+        from prometheus_client import Histogram
         try:
             return Histogram(name, documentation, labelnames, registry=self.registry)
         except ValueError:
@@ -78,6 +115,7 @@ class Observability:
             return self.registry._names_to_collectors[name]
 
     def _get_or_create_gauge(self, name, documentation):
+        from prometheus_client import Gauge
         try:
             return Gauge(name, documentation, registry=self.registry)
         except ValueError:
@@ -92,6 +130,8 @@ class Observability:
 
     def start_prometheus_server(self):
         if not self.prometheus_started:
+            from prometheus_client import start_http_server
+            self._ensure_prometheus_metrics()
             start_http_server(self.prometheus_port)
             print(f"Prometheus metrics server started on port {self.prometheus_port}")
             self.prometheus_started = True
@@ -101,74 +141,120 @@ class Observability:
         def wrapper(*args, **kwargs):
             start_time = time.perf_counter()
             function_name = f"{func.__module__}.{func.__qualname__}"
-            # Initialize model_name as 'unknown_model' by default
-            model_name = 'unknown_model'
-            # model_name = kwargs.get('model_name', 'default_model')
-
-            # Increment Prometheus metrics
 
             result = func(*args, **kwargs)
-            # Extract model_id from the result if available
-            if isinstance(result, dict):
-                model_id = result.get('model_id', '')
-                model_name = model_id
-
-            response_time_ms = (time.perf_counter() - start_time) * 1000
-
-            self.request_counter.labels(function_name, model_name).inc()
-
-            # Update Prometheus metrics
-            self.response_time.labels(function_name, model_name).observe(response_time_ms)
-
-            # Extract metrics from result if available
-            response_text = None
-            input_tokens = 0
-            output_tokens = 0
-            time_to_first_token = None
-            time_to_last_token = None
-            time_per_output_token = None
-            input_cost = 0.0
-            output_cost = 0.0
-            total_cost = 0.0
-
-            if isinstance(result, dict):
-                response_text = result.get('response_text')
-                input_tokens = result.get('inputTokens', 0)
-                output_tokens = result.get('outputTokens', 0)
-                time_to_first_token = result.get('time_to_first_token')
-                time_to_last_token = result.get('time_to_last_token')
-                time_per_output_token = result.get('time_per_output_token')
-                input_cost = result.get('input_token_cost', 0.0)
-                output_cost = result.get('output_token_cost', 0.0)
-                total_cost = result.get('total_cost', 0.0)
-
-            # Update Prometheus cost metrics
-            self.input_cost_tracker.labels(function_name, model_name).inc(input_cost)
-            self.output_cost_tracker.labels(function_name, model_name).inc(output_cost)
-            self.total_cost.inc(total_cost)
-
-            # Update metrics file
-            self._update_metrics_file(
-                function_name,
-                model_name,
-                response_time_ms,
-                input_cost,
-                output_cost,
-                total_cost,
-                response_text,
-                input_tokens,
-                output_tokens,
-                time_to_first_token,
-                time_to_last_token,
-                time_per_output_token
-            )
-
+            if inspect.isgenerator(result):
+                # Streaming mode: record the metrics once the caller has consumed the stream
+                return self._track_stream(result, function_name, start_time)
+            self._record_result(function_name, result, start_time)
             return result
         return wrapper
 
+    def _track_stream(self, stream, function_name, start_time):
+        """
+        Passes the chunks of a streaming feature call through, accumulating the text deltas
+        and the final metadata chunk, and records the call once the stream is exhausted.
+        """
+        text_parts = []
+        metadata = {}
+        for chunk in stream:
+            if "text" in chunk:
+                text_parts.append(chunk["text"])
+            elif "metadata" in chunk:
+                metadata = chunk["metadata"]
+            yield chunk
+        self._record_result(function_name, {"response_text": "".join(text_parts), **metadata}, start_time)
+
+    def _record_result(self, function_name, result, start_time):
+        """
+        Records the Prometheus and metrics file entries of one feature call.
+        """
+        # Initialize model_name as 'unknown_model' by default
+        model_name = 'unknown_model'
+        # Extract model_id from the result if available
+        if isinstance(result, dict):
+            model_id = result.get('model_id', '')
+            model_name = model_id
+
+        response_time_ms = (time.perf_counter() - start_time) * 1000
+
+        self._ensure_prometheus_metrics()
+        self.request_counter.labels(function_name, model_name).inc()
+
+        # Update Prometheus metrics
+        self.response_time.labels(function_name, model_name).observe(response_time_ms)
+
+        # Extract metrics from result if available
+        response_text = None
+        input_tokens = 0
+        output_tokens = 0
+        time_to_first_token = None
+        time_to_last_token = None
+        time_per_output_token = None
+        input_cost = 0.0
+        output_cost = 0.0
+        total_cost = 0.0
+        cache_hit = None
+        saved_cost = 0.0
+        hedge_wasted_cost = 0.0
+
+        if isinstance(result, dict):
+            response_text = result.get('response_text')
+            # Streamed responses report snake_case token counts
+            input_tokens = result.get('inputTokens', result.get('input_tokens', 0))
+            output_tokens = result.get('outputTokens', result.get('output_tokens', 0))
+            time_to_first_token = result.get('time_to_first_token')
+            time_to_last_token = result.get('time_to_last_token')
+            time_per_output_token = result.get('time_per_output_token')
+            input_cost = result.get('input_token_cost', 0.0)
+            output_cost = result.get('output_token_cost', 0.0)
+            total_cost = result.get('total_cost', 0.0)
+            # Only present when a response cache is configured
+            cache_hit = result.get('cache_hit')
+            saved_cost = result.get('saved_cost', 0.0)
+            # Only present when a hedging policy is configured
+            hedge_wasted_cost = result.get('hedge_wasted_cost', 0.0)
+
+        # Update Prometheus cost metrics
+        self.input_cost_tracker.labels(function_name, model_name).inc(input_cost)
+        self.output_cost_tracker.labels(function_name, model_name).inc(output_cost)
+        self.total_cost.inc(total_cost)
+
+        # Update Prometheus response cache metrics
+        if cache_hit is True:
+            self.cache_hits.labels(function_name, model_name).inc()
+            self.cache_saved_cost.labels(function_name, model_name).inc(saved_cost)
+        elif cache_hit is False:
+            self.cache_misses.labels(function_name, model_name).inc()
+
+        # The discarded hedge response is billed too
+        if hedge_wasted_cost:
+            self.hedge_wasted_cost.labels(function_name, model_name).inc(hedge_wasted_cost)
+            self.total_cost.inc(hedge_wasted_cost)
+
+        # Update metrics file
+        self._update_metrics_file(
+            function_name,
+            model_name,
+            response_time_ms,
+            input_cost,
+            output_cost,
+            total_cost,
+            response_text,
+            input_tokens,
+            output_tokens,
+            time_to_first_token,
+            time_to_last_token,
+            time_per_output_token,
+            cache_hit,
+            saved_cost,
+            hedge_wasted_cost
+        )
+
     def _update_metrics_file(self, function_name, model_name, response_time_ms, input_cost, output_cost, total_cost, 
                            response_text=None, input_tokens=0, output_tokens=0, time_to_first_token=None, 
-                           time_to_last_token=None, time_per_output_token=None):
+                           time_to_last_token=None, time_per_output_token=None, cache_hit=None, saved_cost=0.0,
+                           hedge_wasted_cost=0.0):
         with self._metrics_lock:
             if "functions" not in self.metrics_data:
                 self.metrics_data["functions"] = {}
@@ -190,8 +276,13 @@ class Observability:
                     "provider": None,
                     "cumulative_total_cost_dollars": 0.0
                 }
-
             func_metrics = self.metrics_data["functions"][function_name]
+            # Response cache fields, added to entries created by older versions too
+            func_metrics.setdefault("cache_hits", 0)
+            func_metrics.setdefault("cache_misses", 0)
+            func_metrics.setdefault("cache_hit_rate", None)
+            func_metrics.setdefault("cumulative_saved_cost_dollars", 0.0)
+            func_metrics.setdefault("cumulative_hedge_wasted_cost_dollars", 0.0)
 
             # Update metrics
             func_metrics["total_requests"] += 1
@@ -205,6 +296,14 @@ class Observability:
             func_metrics["output_token_cost"] = output_cost
             func_metrics["total_cost"] = total_cost
             func_metrics["cumulative_total_cost_dollars"] += total_cost
+            if cache_hit is not None:
+                func_metrics["cache_hits" if cache_hit else "cache_misses"] += 1
+                func_metrics["cumulative_saved_cost_dollars"] += saved_cost or 0.0
+                lookups = func_metrics["cache_hits"] + func_metrics["cache_misses"]
+                func_metrics["cache_hit_rate"] = func_metrics["cache_hits"] / lookups
+            if hedge_wasted_cost:
+                func_metrics["cumulative_hedge_wasted_cost_dollars"] += hedge_wasted_cost
+                func_metrics["cumulative_total_cost_dollars"] += hedge_wasted_cost
 
             # Write back to the JSON file
             with open(self.metrics_file, 'w') as f:
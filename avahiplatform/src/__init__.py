@@ -1,14 +1,57 @@
-from .create_ui_wrapper_from_gradio import FunctionWrapper
-from .chatbot import BedrockChatbot
-from .data_masking import DataMasking
-from .summarizer import BedrockSummarizer
-from .productDescriptionGeneration import ProductDescriptionGeneration
-from .grammarCorrection import GrammarCorrection
-from .icd_code_generator import ICDCodeGenerator
-from .query_csv import QueryCSV
-from .imageGeneration import ImageGeneration
-from .medical_scribing import MedicalScribe
-from .nl2sql import BedrockNL2SQL
+import importlib
+from typing import TYPE_CHECKING
+
+# Imported eagerly: the submodule shares its name with the class, and it is
+# light (prometheus_client is only loaded when metrics are first recorded).
 from .Observability import Observability, track_observability
-from .structredExtraction import BedrockStructuredExtraction
-from .imageSimilarity import BedrockImageSimilarity
+
+if TYPE_CHECKING:
+    from .create_ui_wrapper_from_gradio import FunctionWrapper
+    from .chatbot import BedrockChatbot
+    from .data_masking import DataMasking
+    from .summarizer import BedrockSummarizer
+    from .incremental_summarizer import IncrementalSummarizer, IncrementalSummaryStore
+    from .productDescriptionGeneration import ProductDescriptionGeneration
+    from .grammarCorrection import GrammarCorrection
+    from .icd_code_generator import ICDCodeGenerator
+    from .query_csv import QueryCSV
+    from .imageGeneration import ImageGeneration
+    from .medical_scribing import MedicalScribe
+    from .nl2sql import BedrockNL2SQL
+    from .structredExtraction import BedrockStructuredExtraction
+    from .imageSimilarity import BedrockImageSimilarity
+
+# Features are imported on first attribute access (PEP 562): each one only pulls
+# in its own dependencies (pandas for QueryCSV, sqlalchemy for BedrockNL2SQL, ...).
+_LAZY_IMPORTS = {
+    "FunctionWrapper": ".create_ui_wrapper_from_gradio",
+    "BedrockChatbot": ".chatbot",
+    "DataMasking": ".data_masking",
+    "BedrockSummarizer": ".summarizer",
+    "IncrementalSummarizer": ".incremental_summarizer",
+    "IncrementalSummaryStore": ".incremental_summarizer",
+    "ProductDescriptionGeneration": ".productDescriptionGeneration",
+    "GrammarCorrection": ".grammarCorrection",
+    "ICDCodeGenerator": ".icd_code_generator",
+    "QueryCSV": ".query_csv",
+    "ImageGeneration": ".imageGeneration",
+    "MedicalScribe": ".medical_scribing",
+    "BedrockNL2SQL": ".nl2sql",
+    "BedrockStructuredExtraction": ".structredExtraction",
+    "BedrockImageSimilarity": ".imageSimilarity",
+}
+
+__all__ = list(_LAZY_IMPORTS) + ["Observability", "track_observability"]
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
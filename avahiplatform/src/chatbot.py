@@ -1,28 +1,64 @@
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from loguru import logger
 from typing import Optional, Dict, Any, List
 from avahiplatform.helpers.chats.bedrock_chat import BedrockChat
 from .Observability import track_observability
-import gradio as gr
 
 class BedrockChatbot:
     def __init__(
         self,
         bedrockchat: BedrockChat,
         max_conversation_turns: int = 10,
-        max_message_length: int = 4000
+        max_message_length: int = 4000,
+        semantic_cache=None,
+        max_history_tokens: int = 4000,
+        summarize_history: bool = True
     ):
         """
         Initialize the Chatbot with BedrockChat instance.
 
+        The conversation is sent as role-separated Converse messages after the system prompt.
+        When the history exceeds max_conversation_turns or max_history_tokens, its oldest turns
+        are folded into a rolling summary (sent with the system prompt) by a background call,
+        so replies never wait for it; until the summary is ready those turns are still sent.
+
         Args:
             bedrockchat (BedrockChat): BedrockChat instance for making API calls.
             max_conversation_turns (int): Maximum number of conversation turns to retain.
             max_message_length (int): Maximum length for each message.
+            semantic_cache (SemanticResponseCache): Optional cache answering the opening query of
+                a conversation from similar earlier ones (under the same system prompt) without
+                calling the model. Later turns depend on the history and always call the model.
+            max_history_tokens (int): Estimated token budget of the retained turns.
+            summarize_history (bool): Fold turns over the limits into a rolling summary. If False,
+                they are dropped.
         """
         self.bedrockchat = bedrockchat
         self.conversation_history: List[Dict[str, str]] = []
         self.max_conversation_turns = max_conversation_turns
         self.max_message_length = max_message_length
         self.system_prompt: Optional[str] = None
+        self.semantic_cache = semantic_cache
+        self.max_history_tokens = max_history_tokens
+        self.summarize_history = summarize_history
+        self.summary: Optional[str] = None
+
+        self.summary_prompt = (
+            "You maintain a running summary of a conversation between a user and an assistant. "
+            "Update the current summary with the new turns. Keep facts, decisions, user preferences "
+            "and open questions that later replies may depend on, and return only the updated summary."
+        )
+
+        self._lock = threading.Lock()
+        self._executor = None
+        self._summary_future = None
+        # Turns (after the system entry) being folded into the summary by the background call
+        self._folding = 0
+        # Bumped when the history is reset, so a summary of the old history is discarded
+        self._generation = 0
 
     def initialize_system(self, system_prompt: str) -> None:
         """
@@ -31,20 +67,30 @@ class BedrockChatbot:
         Args:
             system_prompt (str): The system prompt that defines the chatbot's behavior.
         """
-        self.system_prompt = system_prompt[:self.max_message_length]
-        self.conversation_history = [{"role": "system", "content": self.system_prompt}]
+        with self._lock:
+            self.system_prompt = system_prompt[:self.max_message_length]
+            self.conversation_history = [{"role": "system", "content": self.system_prompt}]
+            self._reset_summary()
+
+    def _reset_summary(self) -> None:
+        self.summary = None
+        self._folding = 0
+        self._generation += 1
 
     def _create_prompt_list(self) -> list:
         """
         Creates a list of prompts for the BedrockChat API based on conversation history.
 
         Returns:
-            list: List containing the formatted prompt for BedrockChat.
+            list: The system prompt (with the rolling summary, if any) followed by one prompt
+                  per turn, tagged with its role.
         """
-        prompt_text = "\n".join(
-            f"{turn['role'].capitalize()}: {turn['content']}" for turn in self.conversation_history
-        )
-        return [{"text": prompt_text}]
+        with self._lock:
+            system = self.system_prompt
+            if self.summary:
+                system += f"\n\nSummary of the earlier conversation:\n{self.summary}"
+            turns = [{"text": turn["content"], "role": turn["role"]} for turn in self.conversation_history[1:]]
+        return [{"system": system}] + turns
 
     @track_observability
     def chat(
@@ -69,9 +115,27 @@ class BedrockChatbot:
             raise ValueError("System prompt not initialized. Call initialize_system first.")
 
         user_input = user_input[:self.max_message_length]
-        self.conversation_history.append({"role": "user", "content": user_input})
+        with self._lock:
+            # Only the opening turn is cached: follow-ups such as "why?" mean something else
+            # in every conversation
+            first_turn = len(self.conversation_history) == 1 and self.summary is None
+            self.conversation_history.append({"role": "user", "content": user_input})
 
         try:
+            start_t = time.perf_counter()
+            cache_namespace = None
+            if self.semantic_cache is not None and first_turn:
+                # Separate namespace per system prompt, so different personas never share answers
+                cache_namespace = "chatbot:" + hashlib.sha256(self.system_prompt.encode("utf-8")).hexdigest()[:16]
+                cached, similarity, embedding = self.semantic_cache.lookup(cache_namespace, user_input)
+                if cached is not None:
+                    response = self.bedrockchat._cached_response(cached, time.perf_counter() - start_t)
+                    response["similarity"] = similarity
+                    with self._lock:
+                        self.conversation_history.append({"role": "assistant", "content": response["response_text"]})
+                    self._trim_conversation_history()
+                    return response
+
             prompts = self._create_prompt_list()
             
             if stream:
@@ -80,30 +144,113 @@ class BedrockChatbot:
                 response = self.bedrockchat.invoke(prompts)
 
             ai_message = response["response_text"]
-            self.conversation_history.append({"role": "assistant", "content": ai_message})
+            with self._lock:
+                self.conversation_history.append({"role": "assistant", "content": ai_message})
+            self._trim_conversation_history()
 
-            # Trim conversation history if it exceeds max_conversation_turns
-            if len(self.conversation_history) > self.max_conversation_turns * 2:
-                # Keep system prompt and last n turns
-                self.conversation_history = (
-                    [self.conversation_history[0]] +  # System prompt
-                    self.conversation_history[-(self.max_conversation_turns * 2 - 1):]  # Last n turns
-                )
+            if cache_namespace is not None:
+                self.semantic_cache.store(cache_namespace, user_input, response, embedding)
+                response = {**response, "cache_hit": False, "saved_cost": 0.0}
 
             return response
 
         except Exception as e:
+            with self._lock:
+                # Do not leave a user turn without a reply, or turns would stop alternating
+                if self.conversation_history and self.conversation_history[-1]["role"] == "user":
+                    self.conversation_history.pop()
             raise
 
+    def _turn_tokens(self, turns: List[Dict[str, str]]) -> List[int]:
+        chat = self.bedrockchat
+        return [chat.token_estimator.estimate_text(chat.model_id, turn["content"]) for turn in turns]
+
+    def _trim_conversation_history(self) -> None:
+        """
+        Fold (or drop) the oldest turns once the history exceeds max_conversation_turns or
+        max_history_tokens.
+
+        Whole user/assistant exchanges are removed, down to half of the limits, so a summary
+        call covers several exchanges. Summarization runs on a background thread.
+        """
+        with self._lock:
+            turns = self.conversation_history[1 + self._folding:]
+            # Estimated once per turn; the loop below subtracts the folded turns from the total
+            turn_tokens = self._turn_tokens(turns)
+            remaining_tokens = sum(turn_tokens)
+            if len(turns) <= self.max_conversation_turns * 2 and remaining_tokens <= self.max_history_tokens:
+                return
+            if self._folding:
+                # A summary is already being generated; its turns are still sent meanwhile
+                return
+
+            fold = 0
+            while fold + 2 < len(turns) and (
+                len(turns) - fold > self.max_conversation_turns
+                or remaining_tokens > self.max_history_tokens // 2
+            ):
+                remaining_tokens -= turn_tokens[fold] + turn_tokens[fold + 1]
+                fold += 2
+            if not fold:
+                return
+
+            if not self.summarize_history:
+                del self.conversation_history[1:1 + fold]
+                return
+
+            self._folding = fold
+            folded = [dict(turn) for turn in turns[:fold]]
+            generation = self._generation
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chatbot-summary")
+            self._summary_future = self._executor.submit(self._fold_into_summary, folded, self.summary, generation)
+
+    def _fold_into_summary(self, turns: List[Dict[str, str]], summary: Optional[str], generation: int) -> None:
+        """
+        Summarize turns into the rolling summary (as it was when the fold was scheduled), then
+        remove them from the history.
+        """
+        transcript = "\n".join(f"{turn['role'].capitalize()}: {turn['content']}" for turn in turns)
+        text = f"New turns:\n{transcript}"
+        if summary:
+            text = f"Current summary:\n{summary}\n\n{text}"
+        try:
+            response = self.bedrockchat.invoke([{"system": self.summary_prompt}, {"text": text}])
+        except Exception as e:
+            logger.warning(f"Could not summarize the conversation history, keeping the turns: {str(e)}")
+            with self._lock:
+                if generation == self._generation:
+                    self._folding = 0
+            return
+
+        with self._lock:
+            if generation != self._generation:
+                return
+            self.summary = response["response_text"]
+            del self.conversation_history[1:1 + len(turns)]
+            self._folding = 0
+
+    def wait_for_summary(self, timeout: Optional[float] = None) -> None:
+        """
+        Block until the background summarization in progress, if any, has finished.
+        """
+        future = self._summary_future
+        if future is not None:
+            future.result(timeout=timeout)
+
     def get_conversation_history(self) -> str:
         """
         Get the formatted conversation history.
 
         Returns:
-            str: Beautified conversation history.
+            str: Beautified conversation history, with the rolling summary (if any) after the system prompt.
         """
+        with self._lock:
+            history = list(self.conversation_history)
+            if self.summary:
+                history.insert(1 if history else 0, {"role": "summary", "content": self.summary})
         beautified_history = "\n".join(
-            f"{turn['role'].upper()}: {turn['content']}" for turn in self.conversation_history
+            f"{turn['role'].upper()}: {turn['content']}" for turn in history
         )
         return beautified_history
 
@@ -111,15 +258,19 @@ class BedrockChatbot:
         """
         Clear the conversation history but maintain the system prompt.
         """
-        if self.system_prompt:
-            self.conversation_history = [{"role": "system", "content": self.system_prompt}]
-        else:
-            self.conversation_history.clear()
+        with self._lock:
+            if self.system_prompt:
+                self.conversation_history = [{"role": "system", "content": self.system_prompt}]
+            else:
+                self.conversation_history.clear()
+            self._reset_summary()
 
     def launch_chat_ui(self, share: bool = True):
         """
         Launch the chatbot UI using Gradio with observability tracking
         """
+        import gradio as gr
+
         def send_message(user_input: str, system_prompt: Optional[str], stream: bool) -> str:
             if system_prompt:
                 self.initialize_system(system_prompt)
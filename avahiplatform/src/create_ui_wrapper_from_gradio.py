@@ -1,22 +1,34 @@
-import gradio as gr
 import inspect
+import threading
 from typing import get_origin, Union, Any
-from PIL import Image
 
 
 class FunctionWrapper:
     def __init__(self, func):
         self.func = func
-        self.interface = self.create_gradio_interface(func)
+        # The Gradio interface (and gradio itself) is only built when a UI is requested
+        self._interface = None
+        self._interface_lock = threading.Lock()
 
     def __call__(self, *args, **kwargs):
         return self.func(*args, **kwargs)
 
+    @property
+    def interface(self):
+        if self._interface is None:
+            with self._interface_lock:
+                if self._interface is None:
+                    self._interface = self.create_gradio_interface(self.func)
+        return self._interface
+
     def process_inputs(self, *args):
         processed_args = [None if arg == "" else arg for arg in args]
         return self.func(*processed_args)
 
     def create_gradio_interface(self, func):
+        import gradio as gr
+        from PIL import Image
+
         sig = inspect.signature(func)
         params = sig.parameters
 
@@ -1,12 +1,7 @@
 import os
 from loguru import logger
-from typing import Optional, Union, Dict, Any
+from typing import Optional, Union, Dict, Any, List
 from avahiplatform.helpers.chats.bedrock_chat import BedrockChat
-import pymupdf
-import docx
-from io import BytesIO
-import boto3
-import botocore.exceptions
 
 
 class DataMasking:
@@ -48,12 +43,15 @@ class DataMasking:
 
         if content_type == "text":
             prompts = [
-                {"text": f"system_prompt: {system_prompt}\n user_prompt: {content}"}
+                {"system": system_prompt},
+                {"text": content}
             ]
         else:
+            # Converse requires a text block next to a document
             prompts = [
-                {"text": system_prompt},
-                {content_type: content}
+                {"system": system_prompt},
+                {content_type: content},
+                {"text": "Mask the sensitive data in this document."}
             ]
 
         return prompts
@@ -63,7 +61,8 @@ class DataMasking:
         content_type: str,
         content: Union[str, bytes],
         system_prompt: Optional[str] = None,
-        stream: bool = False
+        stream: bool = False,
+        as_generator: bool = False
     ) -> Dict[str, Any]:
         """
         Mask sensitive data in the provided content using the Bedrock model.
@@ -73,6 +72,7 @@ class DataMasking:
             content (Union[str, bytes]): The content to mask (can be text or file path).
             system_prompt (Optional[str]): Optional custom system prompt.
             stream (bool): Whether to stream the response.
+            as_generator (bool): Return a generator yielding text deltas as they arrive, then a metadata chunk.
 
         Returns:
             Dict[str, Any]: Response containing masked text and metadata.
@@ -80,6 +80,8 @@ class DataMasking:
         try:
             prompts = self._create_prompt_list(content_type, content, system_prompt)
 
+            if as_generator:
+                return self.bedrockchat.invoke_stream(prompts)
             if stream:
                 logger.info("Invoking BedrockChat in streaming mode for Data Masking.")
                 response = self.bedrockchat.invoke_stream_parsed(prompts)
@@ -97,7 +99,8 @@ class DataMasking:
         self,
         text: str,
         system_prompt: Optional[str] = None,
-        stream: bool = False
+        stream: bool = False,
+        as_generator: bool = False
     ) -> Dict[str, Any]:
         """
         Mask sensitive data in text content.
@@ -106,17 +109,19 @@ class DataMasking:
             text (str): The input text to be masked.
             system_prompt (Optional[str]): Optional custom system prompt.
             stream (bool): Whether to stream the response.
+            as_generator (bool): Return a generator yielding text deltas as they arrive, then a metadata chunk.
 
         Returns:
             Dict[str, Any]: Response containing masked text and metadata.
         """
-        return self.mask("text", text, system_prompt, stream)
+        return self.mask("text", text, system_prompt, stream, as_generator)
 
     def mask_document(
         self,
         file_path: str,
         system_prompt: Optional[str] = None,
-        stream: bool = False
+        stream: bool = False,
+        as_generator: bool = False
     ) -> Dict[str, Any]:
         """
         Mask sensitive data in a local document file.
@@ -125,17 +130,19 @@ class DataMasking:
             file_path (str): Path to the document file.
             system_prompt (Optional[str]): Optional custom system prompt.
             stream (bool): Whether to stream the response.
+            as_generator (bool): Return a generator yielding text deltas as they arrive, then a metadata chunk.
 
         Returns:
             Dict[str, Any]: Response containing masked text and metadata.
         """
-        return self.mask("document", file_path, system_prompt, stream)
+        return self.mask("document", file_path, system_prompt, stream, as_generator)
 
     def mask_s3_file(
         self,
         s3_file_path: str,
         system_prompt: Optional[str] = None,
-        stream: bool = False
+        stream: bool = False,
+        as_generator: bool = False
     ) -> Dict[str, Any]:
         """
         Mask sensitive data in a file stored in S3.
@@ -144,9 +151,33 @@ class DataMasking:
             s3_file_path (str): S3 path to the input file.
             system_prompt (Optional[str]): Optional custom system prompt.
             stream (bool): Whether to stream the response.
+            as_generator (bool): Return a generator yielding text deltas as they arrive, then a metadata chunk.
 
         Returns:
             Dict[str, Any]: Response containing masked text and metadata.
         """
-        return self.mask("s3_document", s3_file_path, system_prompt, stream)
+        return self.mask("s3_document", s3_file_path, system_prompt, stream, as_generator)
+
+    def mask_batch(
+        self,
+        contents: List[Union[str, bytes]],
+        content_type: str = "text",
+        system_prompt: Optional[str] = None,
+        max_concurrency: int = 8
+    ) -> Dict[str, Any]:
+        """
+        Mask sensitive data in several texts or files concurrently.
+
+        Args:
+            contents (List[Union[str, bytes]]): Texts, document paths or S3 paths to mask.
+            content_type (str): Type of every item ('text', 'document', 's3_document').
+            system_prompt (Optional[str]): Optional custom system prompt.
+            max_concurrency (int): Maximum number of masking requests in flight.
+
+        Returns:
+            Dict[str, Any]: "results", one masked response per item in input order, and the
+                aggregate token and cost metadata of the batch.
+        """
+        prompt_lists = [self._create_prompt_list(content_type, content, system_prompt) for content in contents]
+        return self.bedrockchat.invoke_many_parsed(prompt_lists, max_concurrency=max_concurrency)
 
@@ -1,4 +1,4 @@
-from typing import Optional, Union, Dict, Any
+from typing import Optional, Union, Dict, Any, List
 from avahiplatform.helpers.chats.bedrock_chat import BedrockChat
 
 
@@ -36,12 +36,15 @@ class GrammarCorrection:
 
         if content_type == "text":
             prompts = [
-                {"text": f"system_prompt: {system_prompt}\n user_prompt: {content}"}
+                {"system": system_prompt},
+                {"text": content}
             ]
         else:
+            # Converse requires a text block next to a document
             prompts = [
-                {"text": system_prompt},
-                {content_type: content}
+                {"system": system_prompt},
+                {content_type: content},
+                {"text": "Correct this document."}
             ]
 
         return prompts
@@ -51,7 +54,8 @@ class GrammarCorrection:
         content_type: str,
         content: Union[str, bytes],
         system_prompt: Optional[str] = None,
-        stream: bool = False
+        stream: bool = False,
+        as_generator: bool = False
     ) -> Dict[str, Any]:
         """
         Correct grammar and spelling in the provided content using the Bedrock model.
@@ -61,6 +65,7 @@ class GrammarCorrection:
             content (Union[str, bytes]): The content to correct (can be text or file path).
             system_prompt (Optional[str]): Optional custom system prompt.
             stream (bool): Whether to stream the response.
+            as_generator (bool): Return a generator yielding text deltas as they arrive, then a metadata chunk.
 
         Returns:
             Dict[str, Any]: Response containing corrected text and metadata.
@@ -68,6 +73,8 @@ class GrammarCorrection:
         try:
             prompts = self._create_prompt_list(content_type, content, system_prompt)
 
+            if as_generator:
+                return self.bedrockchat.invoke_stream(prompts)
             if stream:
                 response = self.bedrockchat.invoke_stream_parsed(prompts)
             else:
@@ -82,7 +89,8 @@ class GrammarCorrection:
         self,
         text: str,
         system_prompt: Optional[str] = None,
-        stream: bool = False
+        stream: bool = False,
+        as_generator: bool = False
     ) -> Dict[str, Any]:
         """
         Correct grammar and spelling in text content.
@@ -91,17 +99,19 @@ class GrammarCorrection:
             text (str): The input text to be corrected.
             system_prompt (Optional[str]): Optional custom system prompt.
             stream (bool): Whether to stream the response.
+            as_generator (bool): Return a generator yielding text deltas as they arrive, then a metadata chunk.
 
         Returns:
             Dict[str, Any]: Response containing corrected text and metadata.
         """
-        return self.grammar_correction("text", text, system_prompt, stream)
+        return self.grammar_correction("text", text, system_prompt, stream, as_generator)
 
     def correct_document(
         self,
         document_path: str,
         system_prompt: Optional[str] = None,
-        stream: bool = False
+        stream: bool = False,
+        as_generator: bool = False
     ) -> Dict[str, Any]:
         """
         Correct grammar and spelling in a local document file.
@@ -110,18 +120,20 @@ class GrammarCorrection:
             document_path (str): Path to the document file.
             system_prompt (Optional[str]): Optional custom system prompt.
             stream (bool): Whether to stream the response.
+            as_generator (bool): Return a generator yielding text deltas as they arrive, then a metadata chunk.
 
         Returns:
             Dict[str, Any]: Response containing corrected text and metadata.
         """
 
-        return self.grammar_correction("document", document_path, system_prompt, stream)
+        return self.grammar_correction("document", document_path, system_prompt, stream, as_generator)
 
     def correct_s3_document(
         self,
         s3_path: str,
         system_prompt: Optional[str] = None,
-        stream: bool = False
+        stream: bool = False,
+        as_generator: bool = False
     ) -> Dict[str, Any]:
         """
         Correct grammar and spelling in a local document file.
@@ -130,11 +142,34 @@ class GrammarCorrection:
             s3_path (str): Path to the document file.
             system_prompt (Optional[str]): Optional custom system prompt.
             stream (bool): Whether to stream the response.
+            as_generator (bool): Return a generator yielding text deltas as they arrive, then a metadata chunk.
 
         Returns:
             Dict[str, Any]: Response containing corrected text and metadata.
         """
 
-        return self.grammar_correction("s3_document", s3_path, system_prompt, stream)
+        return self.grammar_correction("s3_document", s3_path, system_prompt, stream, as_generator)
 
+    def grammar_correction_batch(
+        self,
+        contents: List[Union[str, bytes]],
+        content_type: str = "text",
+        system_prompt: Optional[str] = None,
+        max_concurrency: int = 8
+    ) -> Dict[str, Any]:
+        """
+        Correct grammar and spelling in a batch of texts or documents, sent concurrently.
+
+        Args:
+            contents (List[Union[str, bytes]]): The texts, document paths or S3 paths to correct.
+            content_type (str): Type of every item ('text', 'document', 's3_document').
+            system_prompt (Optional[str]): Optional custom system prompt.
+            max_concurrency (int): Maximum number of concurrent correction calls.
+
+        Returns:
+            Dict[str, Any]: The corrected responses under "results" (in input order), with the
+                combined token usage and cost of the batch.
+        """
+        prompt_lists = [self._create_prompt_list(content_type, content, system_prompt) for content in contents]
+        return self.bedrockchat.invoke_many_parsed(prompt_lists, max_concurrency=max_concurrency)
     
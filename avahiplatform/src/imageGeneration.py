@@ -1,3 +1,5 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
 from avahiplatform.helpers import BedrockImageGeneration
 
@@ -6,35 +8,90 @@ class ImageGeneration(BedrockImageGeneration):
     def __init__(self, boto_helper, default_model_id):
             """
             Initialize the ImageGeneration class
-            
+
             Args:
                 boto_helper: Helper object for AWS interactions
             """
             self.boto_helper = boto_helper
             self.model_id = default_model_id
 
-    def generate_image(self, prompt):
+            # One initialized BedrockImageGeneration per model id, reused across calls
+            self._generators = {}
+            self._generators_lock = threading.Lock()
+
+    def _get_generator(self, model_id=None):
+        """
+        Return the warm BedrockImageGeneration for a model, creating it on first use.
+
+        Args:
+            model_id (str): The model to generate with. Defaults to the configured model.
+
+        Returns:
+            BedrockImageGeneration: The shared generator for that model.
+        """
+        model_id = model_id or self.model_id
+        generator = self._generators.get(model_id)
+        if generator is None:
+            with self._generators_lock:
+                generator = self._generators.get(model_id)
+                if generator is None:
+                    generator = BedrockImageGeneration(
+                        model_id=model_id,
+                        boto_helper=self.boto_helper
+                    )
+                    self._generators[model_id] = generator
+        return generator
+
+    def generate_image(self, prompt, model_id=None, **kwargs):
         """
         Generate an image using AWS Bedrock
-        
+
         Args:
             prompt (str): The prompt text for image generation
-            
+            model_id (str): Optional model to use instead of the configured one
+            **kwargs: Additional model parameters (seed, negative_prompt, ...)
+
         Returns:
             tuple: (PIL.Image.Image, dict) - The generated image and its details
         """
-        # Initialize the BedrockImageGeneration with the specific model
-        bedrock_gen = BedrockImageGeneration(
-            model_id=self.model_id,
-            boto_helper=self.boto_helper
-        )
-        
+        bedrock_gen = self._get_generator(model_id)
+
         try:
             # Invoke the model to generate the image
-            image, details = bedrock_gen.invoke(prompt=prompt)
-            print(details)
+            image, details = bedrock_gen.invoke(prompt=prompt, **kwargs)
+            logger.info(details)
             return image, details
-            
+
         except Exception as e:
             logger.error(f"Error generating image: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    def generate_images(self, prompts, max_concurrency=4, model_id=None, **kwargs):
+        """
+        Generate one image per prompt, running up to max_concurrency requests at a time
+        over the shared, already-initialized generator.
+
+        Args:
+            prompts (list): The prompt texts for image generation
+            max_concurrency (int): Maximum number of in-flight requests
+            model_id (str): Optional model to use instead of the configured one
+            **kwargs: Additional model parameters applied to every prompt
+
+        Returns:
+            list: One entry per prompt, in input order. Each entry is an
+                  (image, details) tuple, or (None, {"error": str}) if that prompt failed.
+        """
+        if not isinstance(prompts, list):
+            raise ValueError('prompts must be a list')
+
+        # Initialize the generator once, before fanning out
+        self._get_generator(model_id)
+
+        def generate(prompt):
+            try:
+                return self.generate_image(prompt, model_id=model_id, **kwargs)
+            except Exception as e:
+                return None, {"error": str(e)}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(prompts) or 1))) as executor:
+            return list(executor.map(generate, prompts))
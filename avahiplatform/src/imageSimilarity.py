@@ -9,21 +9,27 @@ from avahiplatform.helpers import BedrockEmbeddings, S3Helper, Utils
 
 class BedrockImageSimilarity(BedrockEmbeddings):
 
-    def __init__(self, boto_helper, s3_helper: S3Helper, default_model_id):
+    def __init__(self, boto_helper, s3_helper: S3Helper, default_model_id, image_optimizer=None):
             """
             Initialize the ImageGeneration class
             
             Args:
                 boto_helper: Helper object for AWS interactions
+                image_optimizer: Optional ImageOptimizer applied to images before they are embedded
             """
             self.boto_helper = boto_helper
             self.model_id = default_model_id
             self.s3_helper = s3_helper
+            self.image_optimizer = image_optimizer
             self.bedrock_embeddings = BedrockEmbeddings(model_id=self.model_id,
             boto_helper=self.boto_helper)
 
 
     def _image_preprocessing(self, input_image):
+        """
+        Reads an image (bytes, PIL Image, file path or S3 path), optimizes it if an
+        image_optimizer is set, and returns (base64 image, bytes saved by the optimizer).
+        """
 
         if isinstance(input_image, bytes):
             image_data = input_image
@@ -40,9 +46,19 @@ class BedrockImageSimilarity(BedrockEmbeddings):
         else:
             raise ValueError("Unsupported image format: must be a bytes string, a file path or a PIL Image object.")
 
+        bytes_saved = 0
+        if self.image_optimizer is not None:
+            image_data, _, bytes_saved = self.image_optimizer.optimize(image_data)
+
         encoded_image = base64.b64encode(image_data).decode('utf-8')
 
-        return encoded_image
+        return encoded_image, bytes_saved
+
+    def _build_result(self, key, value, image_bytes_saved):
+        # As in the chat responses, the bytes saved are only reported when an optimizer is set
+        if self.image_optimizer is None:
+            return value
+        return {key: value, "image_bytes_saved": image_bytes_saved}
 
     def image_to_image_similarity(self, image, other_image, output_embedding_length=256, model_name=None):
         """
@@ -56,10 +72,11 @@ class BedrockImageSimilarity(BedrockEmbeddings):
 
         Returns:
             A tuple containing the cosine similarity between the images and the total cost.
+            With an image_optimizer, {"similarity": ..., "image_bytes_saved": ...} instead.
         """
         try:
             # Preprocess the input image
-            image = self._image_preprocessing(image)
+            image, image_bytes_saved = self._image_preprocessing(image)
 
             # Generate embedding for the first image
             embedding_result = self.bedrock_embeddings.generate_embeddings(
@@ -69,7 +86,8 @@ class BedrockImageSimilarity(BedrockEmbeddings):
             image_embedding = np.array(embedding_result['embeddings'])
 
             # Preprocess the other image
-            other_image = self._image_preprocessing(other_image)
+            other_image, bytes_saved = self._image_preprocessing(other_image)
+            image_bytes_saved += bytes_saved
 
             # Generate embedding for the other image
             other_image_embedding_result = self.bedrock_embeddings.generate_embeddings(
@@ -83,7 +101,7 @@ class BedrockImageSimilarity(BedrockEmbeddings):
 
             logger.info(f"Pipeline invocation successfull")
 
-            return similarity
+            return self._build_result("similarity", similarity, image_bytes_saved)
 
         except Exception as e:
             user_friendly_error = Utils.get_user_friendly_error(e)
@@ -103,10 +121,11 @@ class BedrockImageSimilarity(BedrockEmbeddings):
 
         Returns:
             A tuple containing the cosine similarities between the input image and each image in the folder, and the total cost.
+            With an image_optimizer, {"similarities": ..., "image_bytes_saved": ...} instead.
         """
         try:
             # Preprocess the input image
-            image = self._image_preprocessing(image)
+            image, image_bytes_saved = self._image_preprocessing(image)
 
             # Generate embedding for the first image
             embedding_result = self.bedrock_embeddings.generate_embeddings(
@@ -129,7 +148,8 @@ class BedrockImageSimilarity(BedrockEmbeddings):
             # Process each image in the folder and compute its embedding
             keys = []
             for idx, file_path in enumerate(files_path):
-                other_image = self._image_preprocessing(file_path)
+                other_image, bytes_saved = self._image_preprocessing(file_path)
+                image_bytes_saved += bytes_saved
                 # Generate embedding for the first image
                 embedding_result = self.bedrock_embeddings.generate_embeddings(
                     image=other_image,
@@ -146,7 +166,7 @@ class BedrockImageSimilarity(BedrockEmbeddings):
 
             logger.info(f"Pipeline invocation successfull")
 
-            return top_k_similarities_by_path
+            return self._build_result("similarities", top_k_similarities_by_path, image_bytes_saved)
 
         except Exception as e:
             user_friendly_error = Utils.get_user_friendly_error(e)
@@ -168,10 +188,11 @@ class BedrockImageSimilarity(BedrockEmbeddings):
             A tuple containing:
                 - Cosine similarities between the input image and each PIL image in the list.
                 - The total cost of computing the embeddings.
+            With an image_optimizer, {"similarities": ..., "image_bytes_saved": ...} instead.
         """
         try:
             # Preprocess the input image
-            image = self._image_preprocessing(image)
+            image, image_bytes_saved = self._image_preprocessing(image)
 
             # Generate embedding for the first image
             embedding_result = self.bedrock_embeddings.generate_embeddings(
@@ -188,7 +209,8 @@ class BedrockImageSimilarity(BedrockEmbeddings):
             keys = []
             for idx, pil_image in enumerate(pil_image_list):
                 # Preprocess the PIL image (assuming similar preprocessing function works for PIL objects)
-                other_image = self._image_preprocessing(pil_image)
+                other_image, bytes_saved = self._image_preprocessing(pil_image)
+                image_bytes_saved += bytes_saved
                 # Generate embedding for the first image
                 embedding_result = self.bedrock_embeddings.generate_embeddings(
                     image=other_image,
@@ -205,7 +227,7 @@ class BedrockImageSimilarity(BedrockEmbeddings):
 
             logger.info(f"Pipeline invocation successful.")
 
-            return top_k_similarities_by_path
+            return self._build_result("similarities", top_k_similarities_by_path, image_bytes_saved)
 
         except Exception as e:
             # Handle any errors and log a user-friendly error message
@@ -226,10 +248,11 @@ class BedrockImageSimilarity(BedrockEmbeddings):
 
         Returns:
             A tuple containing the cosine similarities between the input image and each image in the folder, and the total cost.
+            With an image_optimizer, {"similarities": ..., "image_bytes_saved": ...} instead.
         """
         try:
             # Preprocess the input image
-            image = self._image_preprocessing(image)
+            image, image_bytes_saved = self._image_preprocessing(image)
 
             # Generate embedding for the first image
             embedding_result = self.bedrock_embeddings.generate_embeddings(
@@ -249,7 +272,8 @@ class BedrockImageSimilarity(BedrockEmbeddings):
             # Process each image/object in the folder and compute its embedding
             keys = []
             for idx, (name, image) in enumerate(image_objects.items()):
-                other_image = self._image_preprocessing(image)
+                other_image, bytes_saved = self._image_preprocessing(image)
+                image_bytes_saved += bytes_saved
                 # Generate embedding for the first image
                 embedding_result = self.bedrock_embeddings.generate_embeddings(
                     image=other_image,
@@ -267,7 +291,7 @@ class BedrockImageSimilarity(BedrockEmbeddings):
 
             logger.info(f"Pipeline invocation successful.")
 
-            return top_k_similarities_by_path
+            return self._build_result("similarities", top_k_similarities_by_path, image_bytes_saved)
 
         except Exception as e:
             # Handle any errors and log a user-friendly error message
@@ -0,0 +1,219 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from loguru import logger
+from typing import Optional, Dict, Any, List, Tuple
+from avahiplatform.helpers.chats.bedrock_chat import BedrockChat
+from avahiplatform.helpers.connectors.utils import Utils
+from .summarizer import BedrockSummarizer
+
+
+def default_store_path() -> str:
+    """
+    Returns the default SQLite file of IncrementalSummaryStore, in the per-user cache
+    directory ($XDG_CACHE_HOME or ~/.cache, under avahiplatform/).
+    """
+    return Utils.default_cache_path("incremental_summaries.sqlite3")
+
+
+class IncrementalSummaryStore:
+    """
+    Persists the state of incrementally summarized documents in a local SQLite file.
+
+    A document's state is a list of segments, one per summarization call: the character
+    range of the text it covered, the SHA-256 of that text and the rolling summary of the
+    document up to the end of the segment.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Opens (or creates) the store.
+
+        Args:
+            path: Path of the SQLite database file. Defaults to default_store_path()
+        """
+        path = path or default_store_path()
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS segments ("
+                "document_id TEXT NOT NULL, idx INTEGER NOT NULL, start INTEGER NOT NULL, end INTEGER NOT NULL, "
+                "hash TEXT NOT NULL, summary TEXT NOT NULL, created_at REAL NOT NULL, "
+                "PRIMARY KEY (document_id, idx))"
+            )
+
+    def load(self, document_id: str) -> List[Tuple[int, int, str, str]]:
+        """
+        Returns the (start, end, hash, summary) segments of a document, in order.
+        """
+        with self._lock:
+            return self._connection.execute(
+                "SELECT start, end, hash, summary FROM segments WHERE document_id = ? ORDER BY idx", (document_id,)
+            ).fetchall()
+
+    def truncate(self, document_id: str, keep: int) -> None:
+        """
+        Deletes the segments of a document after the first keep ones.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM segments WHERE document_id = ? AND idx >= ?", (document_id, keep))
+
+    def append(self, document_id: str, idx: int, start: int, end: int, content_hash: str, summary: str) -> None:
+        """
+        Stores a new segment of a document.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO segments (document_id, idx, start, end, hash, summary, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (document_id, idx, start, end, content_hash, summary, time.time())
+            )
+
+    def delete(self, document_id: Optional[str] = None) -> None:
+        """
+        Forgets a document, or every document if document_id is None.
+        """
+        with self._lock, self._connection:
+            if document_id is None:
+                self._connection.execute("DELETE FROM segments")
+            else:
+                self._connection.execute("DELETE FROM segments WHERE document_id = ?", (document_id,))
+
+
+class IncrementalSummarizer:
+    def __init__(self,
+                 bedrockchat: BedrockChat,
+                 store: Optional[IncrementalSummaryStore] = None,
+                 chunk_tokens: int = 8000,
+                 max_concurrency: int = 8):
+        """
+        Initialize the IncrementalSummarizer, which keeps summaries of append-only documents
+        (logs, transcripts) up to date by only summarizing the text appended since the last call.
+
+        Args:
+            bedrockchat: BedrockChat instance for making API calls
+            store: Where document state is persisted. Defaults to a SQLite file in the user's cache directory
+            chunk_tokens: Maximum estimated tokens of the new text summarized per request
+            max_concurrency: Maximum number of concurrent requests when a large delta is split
+        """
+        self.bedrockchat = bedrockchat
+        self.summarizer = BedrockSummarizer(bedrockchat)
+        self.store = store or IncrementalSummaryStore()
+        self.chunk_tokens = chunk_tokens
+        self.max_concurrency = max_concurrency
+
+        self.update_prompt = (
+            "You maintain a running summary of a growing document. Update the current summary with the "
+            "new content appended to the document. Keep the key points and main ideas of the whole "
+            "document, integrate the new information, and return only the updated summary."
+        )
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def summarize(self, document_id: str, text: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Returns an up-to-date summary of a document, summarizing only the text appended since
+        the previous call for the same document_id.
+
+        The previously summarized text is checked segment by segment against its stored hashes;
+        if it was modified rather than appended to, summarization resumes from the last
+        unchanged segment.
+
+        Args:
+            document_id: Stable identifier of the document (e.g. its path)
+            text: The full current text of the document
+            system_prompt: Optional custom system prompt for summarizing new text
+
+        Returns:
+            dict: The summary with the same fields as BedrockChat.invoke (tokens and costs of this
+                  call only), plus "new_chars", the length of the text summarized in this call, and
+                  "resumed_from", the offset summarization resumed from.
+        """
+        start_t = time.perf_counter()
+        chat = self.bedrockchat
+
+        segments = self.store.load(document_id)
+        keep = 0
+        for segment_start, segment_end, content_hash, _ in segments:
+            if segment_end > len(text) or self._hash(text[segment_start:segment_end]) != content_hash:
+                break
+            keep += 1
+        if keep < len(segments):
+            logger.info(f"Document {document_id} changed after offset {segments[keep][0]}, "
+                        f"resuming its summary from segment {keep}")
+            self.store.truncate(document_id, keep)
+
+        previous_summary = segments[keep - 1][3] if keep else None
+        offset = segments[keep - 1][1] if keep else 0
+        new_text = text[offset:]
+
+        stats = {
+            "inputTokens": 0,
+            "outputTokens": 0,
+            "input_token_cost": 0.0,
+            "output_token_cost": 0.0,
+            "total_cost": 0.0,
+            "stages": [],
+        }
+        if not new_text.strip():
+            summary = previous_summary
+        else:
+            chunks = chat.token_estimator.split_text(chat.model_id, new_text, self.chunk_tokens)
+            if previous_summary is not None and len(chunks) == 1:
+                # A small delta: update the summary in a single request
+                response = chat.invoke([
+                    {"system": self.update_prompt},
+                    {"text": f"Current summary:\n{previous_summary}\n\nNew content:\n{new_text}"}
+                ])
+                for key in ("inputTokens", "outputTokens", "input_token_cost", "output_token_cost", "total_cost"):
+                    stats[key] += response.get(key) or 0
+                summary = response["response_text"]
+            else:
+                map_prompt = system_prompt or self.summarizer.default_prompts["text"]
+                summaries = self.summarizer._run_stage(
+                    "map", 0, [[{"system": map_prompt}, {"text": chunk}] for chunk in chunks], self.max_concurrency, stats
+                )
+                if previous_summary is not None:
+                    summaries.insert(0, previous_summary)
+                summary = self.summarizer._reduce_summaries(summaries, self.chunk_tokens, self.max_concurrency, stats)
+
+            self.store.append(document_id, keep, offset, len(text), self._hash(new_text), summary)
+
+        return {
+            "response_text": summary,
+            "inputTokens": stats["inputTokens"],
+            "outputTokens": stats["outputTokens"],
+            "time_to_first_token": None,
+            "time_to_last_token": time.perf_counter() - start_t,
+            "time_per_output_token": None,
+            "input_token_cost": stats["input_token_cost"],
+            "output_token_cost": stats["output_token_cost"],
+            "total_cost": stats["total_cost"],
+            "new_chars": len(new_text),
+            "resumed_from": offset,
+            "model_id": chat.model_id,
+            "provider": chat.get_provider(),
+        }
+
+    def summarize_file(self, file_path: str, system_prompt: Optional[str] = None, encoding: str = "utf-8") -> Dict[str, Any]:
+        """
+        Summarizes a growing local text file, using its absolute path as the document id.
+        """
+        with open(file_path, "r", encoding=encoding, errors="replace") as f:
+            text = f.read()
+        return self.summarize(os.path.abspath(file_path), text, system_prompt)
+
+    def reset(self, document_id: Optional[str] = None) -> None:
+        """
+        Forgets the state of a document (or of every document), so it is summarized from scratch.
+        """
+        self.store.delete(document_id)
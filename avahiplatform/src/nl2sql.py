@@ -1,3 +1,5 @@
+import hashlib
+import time
 from loguru import logger
 import sqlalchemy
 from sqlalchemy import create_engine, text
@@ -6,14 +8,17 @@ from typing import Optional, Dict, Any
 
 
 class BedrockNL2SQL:
-    def __init__(self, bedrockchat: BedrockChat):
+    def __init__(self, bedrockchat: BedrockChat, semantic_cache=None):
         """
         Initialize the BedrockSQLHandler with a BedrockChat instance.
         
         Args:
             bedrockchat: BedrockChat instance for making API calls
+            semantic_cache: Optional SemanticResponseCache answering questions similar to earlier
+                ones about the same database without generating and running SQL again
         """
         self.bedrockchat = bedrockchat
+        self.semantic_cache = semantic_cache
 
     def _create_prompt_list(self, db_type:str, nl_query: str, table_info: str, user_prompt: Optional[str] = None) -> list:
         """
@@ -47,9 +52,49 @@ class BedrockNL2SQL:
 
         I will execute the query and provide you with the results.
         """
-        return [{"text": f"System prompt: {system_prompt} \n User: {nl_query}"}]
+        return [{"system": system_prompt}, {"text": nl_query}]
 
-    def handle_query(self, db_type: str, db_uri: str, nl_query: str, user_prompt: Optional[str] = None, stream: bool = False) -> Dict[str, Any]:
+    def _cache_namespace(self, db_uri: str, user_prompt: Optional[str]) -> str:
+        # One namespace per database (and custom prompt); the URI may hold credentials, so only its hash is kept
+        return "nl2sql:" + hashlib.sha256(f"{db_uri}|{user_prompt or ''}".encode("utf-8")).hexdigest()[:16]
+
+    def _generate_and_run_sql(self, db_type: str, db_uri: str, nl_query: str, user_prompt: Optional[str] = None, stream: bool = False):
+        """
+        Phase 1: generates a SQL query for the question and executes it.
+
+        Returns:
+            list: The result rows, or None if no valid SQL query was generated
+        """
+        # Reflect database schema
+        engine = create_engine(db_uri)
+        metadata = sqlalchemy.MetaData()
+        metadata.reflect(bind=engine)
+        table_info = self._get_table_info(metadata)
+        # Phase 1: Generate SQL query
+        prompts = self._create_prompt_list(db_type, nl_query, table_info, user_prompt)
+        response = self.bedrockchat.invoke(prompts) if not stream else self.bedrockchat.invoke_stream_parsed(prompts)
+
+        assistant_message = response["response_text"]
+        if '[SQL]' in assistant_message and '[/SQL]' in assistant_message:
+            sql_query = assistant_message.split('[SQL]')[1].split('[/SQL]')[0].strip()
+
+            # Execute the SQL query
+            return self._execute_sql_query(engine, sql_query)
+        return None
+
+    def _create_interpretation_prompt_list(self, nl_query: str, query_results) -> list:
+        """
+        Phase 2: creates the prompts asking for a human-readable interpretation of the results.
+        """
+        system_prompt_phase2 = """
+        You are a senior data analyst. Your task is to interpret SQL query results and provide a human-friendly summary.
+        Use clear, concise language and avoid robotic phrases like 'Based on the query results'.
+        """
+        user_message_phase2 = f"SQL Query Results: {query_results}\nUser Query: {nl_query}"
+        return [{"system": system_prompt_phase2}, {"text": user_message_phase2}]
+
+    def handle_query(self, db_type: str, db_uri: str, nl_query: str, user_prompt: Optional[str] = None, stream: bool = False,
+                     as_generator: bool = False) -> Dict[str, Any]:
         """
         Handles a user query by generating SQL, executing it, and providing a human-readable interpretation.
         
@@ -58,36 +103,35 @@ class BedrockNL2SQL:
             nl_query: The natural language query from the user
             user_prompt: Optional custom system prompt
             stream: Whether to stream the response
+            as_generator: Return a generator yielding the interpretation's text deltas as they
+                arrive, then a metadata chunk (the SQL is still generated and run up front)
             
         Returns:
             dict: Final response with human-friendly interpretation
         """
+        if as_generator:
+            return self._handle_query_generator(db_type, db_uri, nl_query, user_prompt)
+
         try:
-            # Reflect database schema
-            engine = create_engine(db_uri)
-            metadata = sqlalchemy.MetaData()
-            metadata.reflect(bind=engine)
-            table_info = self._get_table_info(metadata)
-            # Phase 1: Generate SQL query
-            prompts = self._create_prompt_list(db_type, nl_query, table_info, user_prompt)
-            response = self.bedrockchat.invoke(prompts) if not stream else self.bedrockchat.invoke_stream_parsed(prompts)
-            
-            assistant_message = response["response_text"]
-            if '[SQL]' in assistant_message and '[/SQL]' in assistant_message:
-                sql_query = assistant_message.split('[SQL]')[1].split('[/SQL]')[0].strip()
-                
-                # Execute the SQL query
-                query_results = self._execute_sql_query(engine, sql_query)
-                
+            start_t = time.perf_counter()
+            cache_namespace = None
+            if self.semantic_cache is not None:
+                cache_namespace = self._cache_namespace(db_uri, user_prompt)
+                cached, similarity, embedding = self.semantic_cache.lookup(cache_namespace, nl_query)
+                if cached is not None:
+                    response = self.bedrockchat._cached_response(cached, time.perf_counter() - start_t)
+                    response["similarity"] = similarity
+                    return response
+
+            query_results = self._generate_and_run_sql(db_type, db_uri, nl_query, user_prompt, stream)
+            if query_results is not None:
                 # Phase 2: Generate human-readable interpretation
-                system_prompt_phase2 = """
-                You are a senior data analyst. Your task is to interpret SQL query results and provide a human-friendly summary.
-                Use clear, concise language and avoid robotic phrases like 'Based on the query results'.
-                """
-                user_message_phase2 = f"SQL Query Results: {query_results}\nUser Query: {nl_query}"
-                prompts_phase2 = [{"text": f"System prompt: {system_prompt_phase2} \n User: {user_message_phase2}"}]
-                
+                prompts_phase2 = self._create_interpretation_prompt_list(nl_query, query_results)
                 final_response = self.bedrockchat.invoke(prompts_phase2) if not stream else self.bedrockchat.invoke_stream_parsed(prompts_phase2)
+
+                if cache_namespace is not None:
+                    self.semantic_cache.store(cache_namespace, nl_query, final_response, embedding)
+                    final_response = {**final_response, "cache_hit": False, "saved_cost": 0.0}
                 return final_response
             
             else:
@@ -97,6 +141,44 @@ class BedrockNL2SQL:
             logger.error(f"Error in handling query: {str(e)}")
             raise
 
+    def _handle_query_generator(self, db_type: str, db_uri: str, nl_query: str, user_prompt: Optional[str] = None):
+        """
+        Generator mode of handle_query: yields {"text": ...} deltas of the interpretation and a
+        final {"metadata": {...}} chunk, or a single {"error": ...} chunk if no valid SQL was generated.
+        """
+        try:
+            start_t = time.perf_counter()
+            cache_namespace = None
+            if self.semantic_cache is not None:
+                cache_namespace = self._cache_namespace(db_uri, user_prompt)
+                cached, similarity, embedding = self.semantic_cache.lookup(cache_namespace, nl_query)
+                if cached is not None:
+                    response = self.bedrockchat._cached_response(cached, time.perf_counter() - start_t)
+                    yield {"text": response.pop("response_text")}
+                    yield {"metadata": {**response, "similarity": similarity}}
+                    return
+
+            query_results = self._generate_and_run_sql(db_type, db_uri, nl_query, user_prompt)
+            if query_results is None:
+                yield {"error": "Failed to generate a valid SQL query"}
+                return
+
+            # Phase 2: stream the human-readable interpretation
+            prompts_phase2 = self._create_interpretation_prompt_list(nl_query, query_results)
+            text_parts = []
+            for chunk in self.bedrockchat.invoke_stream(prompts_phase2):
+                if "text" in chunk:
+                    text_parts.append(chunk["text"])
+                elif "metadata" in chunk and cache_namespace is not None:
+                    final_response = {"response_text": "".join(text_parts), **chunk["metadata"]}
+                    self.semantic_cache.store(cache_namespace, nl_query, final_response, embedding)
+                    chunk = {"metadata": {**chunk["metadata"], "cache_hit": False, "saved_cost": 0.0}}
+                yield chunk
+
+        except Exception as e:
+            logger.error(f"Error in handling query: {str(e)}")
+            raise
+
     def _get_table_info(self, metadata):
         table_info = []
         for table_name, table in metadata.tables.items():
@@ -110,7 +192,7 @@ class BedrockNL2SQL:
             return [row for row in result]
 
     def get_answer_from_db(self, db_type, nl_query, username=None, password=None, host=None,
-                           port=None, dbname=None, db_path=None, user_prompt=None, stream=False):
+                           port=None, dbname=None, db_path=None, user_prompt=None, stream=False, as_generator=False):
 
         if db_type == "sqlite":
             if not db_path:
@@ -129,5 +211,6 @@ class BedrockNL2SQL:
             logger.error(f"{db_type} cannot be connected")
             raise ValueError(f"{db_type} cannot be connected")
 
-        return self.handle_query(nl_query=nl_query, db_type=db_type, db_uri=db_uri, user_prompt=user_prompt, stream=stream)
+        return self.handle_query(nl_query=nl_query, db_type=db_type, db_uri=db_uri, user_prompt=user_prompt, stream=stream,
+                                 as_generator=as_generator)
 
@@ -18,7 +18,8 @@ class ProductDescriptionGeneration:
         event_name: str, 
         customer_segmentation: str, 
         user_prompt: Optional[str] = None,
-        stream: bool = False
+        stream: bool = False,
+        as_generator: bool = False
     ) -> Tuple[str, float, float, float]:
         """
         Generates a product description based on provided parameters.
@@ -29,6 +30,7 @@ class ProductDescriptionGeneration:
             customer_segmentation (str): The customer segmentation.
             user_prompt (Optional[str]): Additional prompt provided by the user.
             stream (bool): Whether to use streaming for the response.
+            as_generator (bool): Return a generator yielding text deltas as they arrive, then a metadata chunk.
 
         Returns:
             Tuple[str, float, float, float]: A tuple containing the product description, input token cost,
@@ -43,6 +45,8 @@ class ProductDescriptionGeneration:
         prompt = self._construct_prompt(product_sku, event_name, customer_segmentation, user_prompt)
 
         try:
+            if as_generator:
+                return self.bedrock_chat.invoke_stream(prompts=[{"text": prompt}])
             if stream:
                 response = self.bedrock_chat.invoke_stream_parsed(
                     prompts=[{"text": prompt}]
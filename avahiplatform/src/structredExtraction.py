@@ -1,5 +1,5 @@
 from loguru import logger
-from typing import Optional, Union, Dict, Any
+from typing import Optional, Union, Dict, Any, List
 from avahiplatform.helpers.chats.bedrock_chat import BedrockChat
 
 
@@ -46,12 +46,15 @@ class BedrockStructuredExtraction:
 
         if content_type == "text":
             prompts = [
-                {"text": f"System prompt: {system_prompt} \n User: {content}"}
+                {"system": system_prompt},
+                {"text": content}
             ]
         else:
+            # Converse requires a text block next to a document
             prompts = [
-                {"text": system_prompt},
-                {content_type: content}
+                {"system": system_prompt},
+                {content_type: content},
+                {"text": "Extract the entities from this document."}
             ]
         return prompts
 
@@ -59,7 +62,8 @@ class BedrockStructuredExtraction:
                content_type: str,
                content: Union[str, bytes],
                system_prompt: Optional[str] = None,
-               stream: bool = False) -> Dict[str, Any]:
+               stream: bool = False,
+               as_generator: bool = False) -> Dict[str, Any]:
         """
         Extract entities from content using the Bedrock model.
         
@@ -68,6 +72,7 @@ class BedrockStructuredExtraction:
             content: The content to extract entities from (can be text, file path, or S3 path)
             system_prompt: Optional custom system prompt
             stream: Whether to stream the response
+            as_generator: Return a generator yielding text deltas as they arrive, then a metadata chunk
             
         Returns:
             dict: Response containing extracted entities and metadata
@@ -75,6 +80,8 @@ class BedrockStructuredExtraction:
         try:
             prompts = self._create_prompt_list(content_type, content, system_prompt)
             
+            if as_generator:
+                return self.bedrockchat.invoke_stream(prompts)
             if stream:
                 return self.bedrockchat.invoke_stream_parsed(prompts)
             else:
@@ -87,16 +94,18 @@ class BedrockStructuredExtraction:
     def extract_text(self, 
                       text: str, 
                       system_prompt: Optional[str] = None,
-                      stream: bool = False) -> Dict[str, Any]:
+                      stream: bool = False,
+                      as_generator: bool = False) -> Dict[str, Any]:
         """
         Extract entities from text content.
         """
-        return self.extract("text", text, system_prompt, stream)
+        return self.extract("text", text, system_prompt, stream, as_generator)
 
     def extract_document(self, 
                          document_path: str,
                          system_prompt: Optional[str] = None,
-                         stream: bool = False) -> Dict[str, Any]:
+                         stream: bool = False,
+                         as_generator: bool = False) -> Dict[str, Any]:
         """
         Extract entities from a local document file.
         
@@ -104,16 +113,18 @@ class BedrockStructuredExtraction:
             document_path: Path to the document file
             system_prompt: Optional custom system prompt
             stream: Whether to stream the response
+            as_generator: Return a generator yielding text deltas as they arrive, then a metadata chunk
             
         Returns:
             dict: Response containing extracted entities and metadata
         """
-        return self.extract("document", document_path, system_prompt, stream)
+        return self.extract("document", document_path, system_prompt, stream, as_generator)
 
     def extract_s3_document(self, 
                             s3_path: str,
                             system_prompt: Optional[str] = None,
-                            stream: bool = False) -> Dict[str, Any]:
+                            stream: bool = False,
+                            as_generator: bool = False) -> Dict[str, Any]:
         """
         Extract entities from a document stored in S3.
         
@@ -121,8 +132,30 @@ class BedrockStructuredExtraction:
             s3_path: S3 path to the document file
             system_prompt: Optional custom system prompt
             stream: Whether to stream the response
+            as_generator: Return a generator yielding text deltas as they arrive, then a metadata chunk
             
         Returns:
             dict: Response containing extracted entities and metadata
         """
-        return self.extract("s3_document", s3_path, system_prompt, stream)
+        return self.extract("s3_document", s3_path, system_prompt, stream, as_generator)
+
+
+    def extract_batch(self,
+                      contents: List[Union[str, bytes]],
+                      content_type: str = "text",
+                      system_prompt: Optional[str] = None,
+                      max_concurrency: int = 8) -> Dict[str, Any]:
+        """
+        Extract entities from several documents of the same type concurrently.
+
+        Args:
+            contents: The documents to extract entities from (texts, file paths, or S3 paths)
+            content_type: Type of the documents ('text', 'document', 's3_document')
+            system_prompt: Optional custom system prompt
+            max_concurrency: Maximum number of concurrent requests
+
+        Returns:
+            dict: Extracted entities under "results", in input order, with the combined token usage and cost
+        """
+        prompt_lists = [self._create_prompt_list(content_type, content, system_prompt) for content in contents]
+        return self.bedrockchat.invoke_many_parsed(prompt_lists, max_concurrency=max_concurrency)
@@ -1,6 +1,11 @@
+import os
+import time
+from io import BytesIO
 from loguru import logger
-from typing import Optional, Union, Dict, Any
+from typing import Optional, Union, Dict, Any, List
 from avahiplatform.helpers.chats.bedrock_chat import BedrockChat
+from avahiplatform.helpers.chats.token_estimator import ContextWindowExceededError
+from avahiplatform.helpers.connectors.utils import Utils
 
 
 class BedrockSummarizer:
@@ -22,6 +27,11 @@ class BedrockSummarizer:
             "image": "Please describe this image in detail and provide a comprehensive analysis of its content, including any notable elements, themes, or patterns:",
             "video": "Please analyze this video content and provide a detailed summary of its key scenes, main message, and notable elements:"
         }
+        self.reduce_prompt = (
+            "The following are summaries of consecutive parts of one document, in order. "
+            "Combine them into a single coherent summary of the whole document, keeping the key points, "
+            "main arguments and important conclusions, and removing repetition:"
+        )
 
     def _create_prompt_list(self, content_type: str, content: Union[str, bytes], system_prompt: Optional[str] = None) -> list:
         """
@@ -40,12 +50,16 @@ class BedrockSummarizer:
         
         if content_type == "text":
             prompts = [
-                {"text": f"System prompt: {system_prompt} \n User: {content}"}
+                {"system": system_prompt},
+                {"text": content}
             ]
         else:
+            # Converse requires a text block next to documents, so a short request accompanies the media
+            media_name = "document" if content_type == "s3_document" else content_type
             prompts = [
-                {"text": system_prompt},
-                {content_type: content}
+                {"system": system_prompt},
+                {content_type: content},
+                {"text": f"Summarize this {media_name}."}
             ]
         return prompts
 
@@ -53,7 +67,11 @@ class BedrockSummarizer:
                  content_type: str,
                  content: Union[str, bytes],
                  system_prompt: Optional[str] = None,
-                 stream: bool = False) -> Dict[str, Any]:
+                 stream: bool = False,
+                 as_generator: bool = False,
+                 map_reduce: bool = False,
+                 chunk_tokens: int = 8000,
+                 max_concurrency: int = 8) -> Dict[str, Any]:
         """
         Summarize content using the Bedrock model.
         
@@ -62,17 +80,40 @@ class BedrockSummarizer:
             content: The content to summarize (can be text, file path, or S3 path)
             system_prompt: Optional custom system prompt
             stream: Whether to stream the response
+            as_generator: Return a generator yielding text deltas as they arrive, then a metadata chunk
+            map_reduce: Summarize the extracted text chunk by chunk (see summarize_map_reduce).
+                Text too long for the context window is always summarized this way.
+                Not available with stream or as_generator.
+            chunk_tokens: Maximum estimated tokens per chunk in map-reduce mode
+            max_concurrency: Maximum concurrent requests in map-reduce mode
             
         Returns:
             dict: Response containing summary and metadata
+
+        Raises:
+            ValueError: If map_reduce is combined with stream or as_generator.
         """
+        if map_reduce and (stream or as_generator):
+            raise ValueError("map_reduce cannot be combined with stream or as_generator; "
+                             "the summary is only available once every chunk has been summarized.")
         try:
+            if map_reduce:
+                return self.summarize_map_reduce(content_type, content, system_prompt, chunk_tokens, max_concurrency)
+
             prompts = self._create_prompt_list(content_type, content, system_prompt)
             
-            if stream:
-                return self.bedrockchat.invoke_stream_parsed(prompts)
-            else:
-                return self.bedrockchat.invoke(prompts)
+            if as_generator:
+                return self.bedrockchat.invoke_stream(prompts)
+            try:
+                if stream:
+                    return self.bedrockchat.invoke_stream_parsed(prompts)
+                else:
+                    return self.bedrockchat.invoke(prompts)
+            except ContextWindowExceededError as e:
+                if content_type != "text":
+                    raise
+                logger.warning(f"{str(e)} Falling back to map-reduce summarization.")
+                return self.summarize_map_reduce(content_type, content, system_prompt, chunk_tokens, max_concurrency)
                 
         except Exception as e:
             logger.error(f"Error in summarization: {str(e)}")
@@ -81,44 +122,233 @@ class BedrockSummarizer:
     def summarize_text(self, 
                       text: str, 
                       system_prompt: Optional[str] = None,
-                      stream: bool = False) -> Dict[str, Any]:
+                      stream: bool = False,
+                      as_generator: bool = False,
+                      map_reduce: bool = False,
+                      chunk_tokens: int = 8000,
+                      max_concurrency: int = 8) -> Dict[str, Any]:
         """
         Summarize text content.
         """
-        return self.summarize("text", text, system_prompt, stream)
+        return self.summarize("text", text, system_prompt, stream, as_generator,
+                              map_reduce, chunk_tokens, max_concurrency)
 
     def summarize_document(self, 
                          document_path: str,
                          system_prompt: Optional[str] = None,
-                         stream: bool = False) -> Dict[str, Any]:
+                         stream: bool = False,
+                         as_generator: bool = False,
+                         map_reduce: bool = False,
+                         chunk_tokens: int = 8000,
+                         max_concurrency: int = 8) -> Dict[str, Any]:
         """
-        Summarize a document file.
+        Summarize a document file. With map_reduce, large documents are summarized chunk by chunk.
         """
-        return self.summarize("document", document_path, system_prompt, stream)
+        return self.summarize("document", document_path, system_prompt, stream, as_generator,
+                              map_reduce, chunk_tokens, max_concurrency)
 
     def summarize_image(self, 
                        image_path: str,
                        system_prompt: Optional[str] = None,
-                       stream: bool = False) -> Dict[str, Any]:
+                       stream: bool = False,
+                       as_generator: bool = False) -> Dict[str, Any]:
         """
         Analyze and summarize an image.
         """
-        return self.summarize("image", image_path, system_prompt, stream)
+        return self.summarize("image", image_path, system_prompt, stream, as_generator)
 
     def summarize_video(self, 
                        video_path: str,
                        system_prompt: Optional[str] = None,
-                       stream: bool = False) -> Dict[str, Any]:
+                       stream: bool = False,
+                       as_generator: bool = False) -> Dict[str, Any]:
         """
         Analyze and summarize a video.
         """
-        return self.summarize("video", video_path, system_prompt, stream)
+        return self.summarize("video", video_path, system_prompt, stream, as_generator)
 
     def summarize_s3_document(self, 
                             s3_path: str,
                             system_prompt: Optional[str] = None,
-                            stream: bool = False) -> Dict[str, Any]:
+                            stream: bool = False,
+                            as_generator: bool = False,
+                            map_reduce: bool = False,
+                            chunk_tokens: int = 8000,
+                            max_concurrency: int = 8) -> Dict[str, Any]:
+        """
+        Summarize a document stored in S3. With map_reduce, large documents are summarized chunk by chunk.
+        """
+        return self.summarize("s3_document", s3_path, system_prompt, stream, as_generator,
+                              map_reduce, chunk_tokens, max_concurrency)
+
+
+    def summarize_batch(self,
+                        contents: List[Union[str, bytes]],
+                        content_type: str = "text",
+                        system_prompt: Optional[str] = None,
+                        max_concurrency: int = 8) -> Dict[str, Any]:
+        """
+        Summarize several pieces of content of the same type concurrently.
+
+        Args:
+            contents: The contents to summarize (texts, file paths, or S3 paths)
+            content_type: Type of every item ('text', 'document', 'image', 'video', 's3_document')
+            system_prompt: Optional custom system prompt
+            max_concurrency: Maximum number of concurrent requests
+
+        Returns:
+            dict: Summaries under "results", in input order, with the combined token usage and cost
+        """
+        prompt_lists = [self._create_prompt_list(content_type, content, system_prompt) for content in contents]
+        return self.bedrockchat.invoke_many_parsed(prompt_lists, max_concurrency=max_concurrency)
+
+    def _extract_text(self, content_type: str, content: Union[str, bytes]) -> str:
+        """
+        Extracts the text of a text, local document (PDF, DOCX or plain text) or S3 document.
+        """
+        if content_type == "text":
+            return content
+        if content_type == "s3_document":
+            return self.bedrockchat.s3_helper.read_s3_file(content)
+        if content_type != "document":
+            raise ValueError(f"Map-reduce summarization does not support '{content_type}' content.")
+
+        if isinstance(content, str):
+            extension = os.path.splitext(content)[1].lower()
+            if extension == ".pdf":
+                return Utils.read_pdf(content)
+            if extension == ".docx":
+                return Utils.read_docx(content)
+            with open(content, "rb") as f:
+                content = f.read()
+        if content.startswith(b"%PDF"):
+            return Utils.read_pdf_from_stream(BytesIO(content))
+        if content.startswith(b"PK"):
+            return Utils.read_docx(BytesIO(content))
+        return content.decode("utf-8", errors="replace")
+
+    def _run_stage(self, stage: str, level: int, prompt_lists: List[list], max_concurrency: int, stats: Dict[str, Any]) -> List[str]:
         """
-        Summarize a document stored in S3.
+        Runs one map or reduce stage concurrently and adds its timing, tokens and cost to stats.
         """
-        return self.summarize("s3_document", s3_path, system_prompt, stream)
+        response = self.bedrockchat.invoke_many_parsed(prompt_lists, max_concurrency=max_concurrency)
+        failed = [item for item in response["results"] if item["error"] is not None]
+        if failed:
+            raise RuntimeError(f"{len(failed)} of {len(prompt_lists)} {stage} requests failed, "
+                               f"first error: {failed[0]['error']}")
+
+        stats["stages"].append({
+            "stage": stage,
+            "level": level,
+            "requests": response["requests"],
+            "wall_time": response["wall_time"],
+            "inputTokens": response["inputTokens"],
+            "outputTokens": response["outputTokens"],
+            "total_cost": response["total_cost"],
+        })
+        for key in ("inputTokens", "outputTokens", "input_token_cost", "output_token_cost", "total_cost"):
+            stats[key] += response[key]
+        return [item["result"]["response_text"] for item in response["results"]]
+
+    def _reduce_summaries(self, summaries: List[str], chunk_tokens: int, max_concurrency: int, stats: Dict[str, Any]) -> str:
+        """
+        Combines consecutive summaries in groups of at most chunk_tokens, level by level, until one remains.
+        """
+        chat = self.bedrockchat
+        estimator = chat.token_estimator
+        level = 0
+        while len(summaries) > 1:
+            level += 1
+            # Group consecutive summaries into requests of at most chunk_tokens
+            groups = [[]]
+            group_tokens = 0
+            for summary in summaries:
+                tokens = estimator.estimate_text(chat.model_id, summary)
+                if groups[-1] and group_tokens + tokens > chunk_tokens:
+                    groups.append([])
+                    group_tokens = 0
+                groups[-1].append(summary)
+                group_tokens += tokens
+            if len(groups) == len(summaries):
+                # Summaries do not shrink enough to be grouped; combine them pairwise
+                groups = [summaries[index:index + 2] for index in range(0, len(summaries), 2)]
+
+            prompt_lists = [
+                [{"system": self.reduce_prompt},
+                 {"text": "\n\n".join(f"Summary of part {index + 1}:\n{summary}" for index, summary in enumerate(group))}]
+                for group in groups
+            ]
+            summaries = self._run_stage("reduce", level, prompt_lists, max_concurrency, stats)
+        return summaries[0]
+
+    def summarize_map_reduce(self,
+                             content_type: str,
+                             content: Union[str, bytes],
+                             system_prompt: Optional[str] = None,
+                             chunk_tokens: int = 8000,
+                             max_concurrency: int = 8,
+                             overlap_tokens: int = 200) -> Dict[str, Any]:
+        """
+        Summarize content larger than the context window (or faster than in one request) by
+        map-reduce: the extracted text is split into token-bounded chunks, the chunks are
+        summarized concurrently, and the summaries are combined in groups, level by level,
+        until a single summary remains. Wall-clock time grows with the number of levels
+        rather than with the document length.
+
+        Args:
+            content_type: Type of content ('text', 'document', 's3_document')
+            content: The text, document path or bytes, or S3 path
+            system_prompt: Optional custom system prompt for the chunk summaries
+            chunk_tokens: Maximum estimated tokens per chunk (and per group of summaries to combine)
+            max_concurrency: Maximum number of concurrent Bedrock requests
+            overlap_tokens: Estimated tokens repeated from the end of the previous chunk
+
+        Returns:
+            dict: The summary with the same fields as BedrockChat.invoke (tokens and costs summed over
+                  all requests, time_to_last_token the total wall time), plus "chunks" and "stages",
+                  the per-stage requests, wall time, tokens and cost.
+        """
+        start_t = time.perf_counter()
+        chat = self.bedrockchat
+        estimator = chat.token_estimator
+        if chat.context_window:
+            # Leave room for the prompt and the response
+            chunk_tokens = min(chunk_tokens, chat.context_window - chat.max_tokens - 1000)
+
+        text = self._extract_text(content_type, content)
+        chunks = estimator.split_text(chat.model_id, text, chunk_tokens, overlap_tokens)
+        if not chunks:
+            raise ValueError("No text to summarize.")
+
+        stats = {
+            "inputTokens": 0,
+            "outputTokens": 0,
+            "input_token_cost": 0.0,
+            "output_token_cost": 0.0,
+            "total_cost": 0.0,
+            "stages": [],
+        }
+        map_prompt = system_prompt or self.default_prompts["document" if content_type != "text" else "text"]
+        prompt_lists = [
+            [{"system": map_prompt}, {"text": f"Part {index + 1} of {len(chunks)}:\n\n{chunk}"}]
+            for index, chunk in enumerate(chunks)
+        ]
+        summaries = self._run_stage("map", 0, prompt_lists, max_concurrency, stats)
+
+        summary = self._reduce_summaries(summaries, chunk_tokens, max_concurrency, stats)
+
+        return {
+            "response_text": summary,
+            "inputTokens": stats["inputTokens"],
+            "outputTokens": stats["outputTokens"],
+            "time_to_first_token": None,
+            "time_to_last_token": time.perf_counter() - start_t,
+            "time_per_output_token": None,
+            "input_token_cost": stats["input_token_cost"],
+            "output_token_cost": stats["output_token_cost"],
+            "total_cost": stats["total_cost"],
+            "chunks": len(chunks),
+            "stages": stats["stages"],
+            "model_id": chat.model_id,
+            "provider": chat.get_provider(),
+        }